@@ -0,0 +1,35 @@
+// Lets Node run the TypeScript benchmarks with the project's own compiler
+// (the `typescript` devDependency), so `npm run bench` works offline:
+//
+//   node -r ./benchmarks/register.js benchmarks/run.ts
+//
+// Each .ts file is transpiled to CommonJS on require (no type checking; use
+// `npm run type-check` for that) and `@/` imports resolve to src/ like tsconfig.json.
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+const ts = require('typescript')
+
+const SRC_DIR = path.join(__dirname, '..', 'src')
+
+const compilerOptions = {
+  module: ts.ModuleKind.CommonJS,
+  target: ts.ScriptTarget.ES2020,
+  esModuleInterop: true,
+  jsx: ts.JsxEmit.ReactJSX
+}
+
+const resolveFilename = Module._resolveFilename
+Module._resolveFilename = function (request, ...rest) {
+  const resolved = request.startsWith('@/') ? path.join(SRC_DIR, request.slice(2)) : request
+  return resolveFilename.call(this, resolved, ...rest)
+}
+
+for (const extension of ['.ts', '.tsx']) {
+  Module._extensions[extension] = (module, filename) => {
+    const source = fs.readFileSync(filename, 'utf8')
+    const { outputText } = ts.transpileModule(source, { compilerOptions, fileName: filename })
+    module._compile(outputText, filename)
+  }
+}
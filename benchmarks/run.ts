@@ -0,0 +1,335 @@
+/**
+ * Hot Path Benchmark Runner
+ * Seeds the local Firestore emulator with synthetic cities at increasing
+ * scale, drives the real service functions and records latency, throughput
+ * and Firestore read/write counts (via src/lib/firestore-profiler.ts).
+ *
+ * Start the emulator first (offline, demo project):
+ *   npm run bench:emulator
+ * Then:
+ *   npm run bench -- --scales=0.5,1,4 --iterations=10
+ *
+ * Options:
+ *   --scales=0.5,1,4        Dataset multipliers (1 = BASE_DATASET)
+ *   --cities=3              Number of synthetic cities
+ *   --iterations=10         Measured iterations per case (after one warm-up)
+ *   --seed=42               PRNG seed for the dataset
+ *   --baseline=path         Baseline to compare against (default benchmarks/results/baseline.json)
+ *   --save-baseline         Also write this run as the new baseline
+ *   --tolerance=0.25        Allowed p50 latency growth before flagging a regression
+ *   --fail-on-regression    Exit with code 1 if any regression is found
+ *   --verbose               Keep the app's console.log output
+ */
+
+import { mkdirSync, readFileSync, writeFileSync, existsSync } from 'fs'
+import { join } from 'path'
+import { cpus, platform, totalmem } from 'os'
+import { execSync } from 'child_process'
+import type { RegisteredCamera } from '@/types/camera'
+
+const PROJECT_ID = process.env.BENCH_PROJECT_ID || 'demo-nwp-bench'
+const EMULATOR_HOST = process.env.FIRESTORE_EMULATOR_HOST || '127.0.0.1:8080'
+const RESULTS_DIR = join(__dirname, 'results')
+
+// Per-city counts at scale 1
+const BASE_DATASET = {
+  usersPerCity: 100,
+  camerasPerCity: 250,
+  markersPerCity: 60,
+  requestsPerCity: 40,
+  pendingVerificationRatio: 0.15
+}
+
+interface CaseResult {
+  name: string
+  iterations: number
+  minMs: number
+  p50Ms: number
+  p95Ms: number
+  maxMs: number
+  meanMs: number
+  opsPerSecond: number
+  readsPerOp: number
+  writesPerOp: number
+}
+
+interface ScaleResult {
+  scale: number
+  documentsSeeded: number
+  seedMs: number
+  counts: { users: number; cameras: number; markers: number; requests: number }
+  cases: CaseResult[]
+}
+
+interface BenchmarkReport {
+  createdAt: string
+  commit: string | null
+  environment: { node: string; platform: string; cpu: string; cpuCount: number; memoryGb: number }
+  options: { scales: number[]; cities: number; iterations: number; seed: number }
+  scales: ScaleResult[]
+}
+
+function parseArgs(argv: string[]) {
+  const args = new Map<string, string>()
+  for (const arg of argv) {
+    const [key, value] = arg.replace(/^--/, '').split('=')
+    args.set(key, value ?? 'true')
+  }
+
+  return {
+    scales: (args.get('scales') || '0.5,1,4').split(',').map(Number).filter(n => n > 0),
+    cities: Number(args.get('cities') || 3),
+    iterations: Math.max(1, Number(args.get('iterations') || 10)),
+    seed: Number(args.get('seed') || 42),
+    baseline: args.get('baseline') || join(RESULTS_DIR, 'baseline.json'),
+    saveBaseline: args.has('save-baseline'),
+    tolerance: Number(args.get('tolerance') || 0.25),
+    failOnRegression: args.has('fail-on-regression'),
+    verbose: args.has('verbose')
+  }
+}
+
+const percentile = (sorted: number[], p: number): number =>
+  sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * p) - 1)]
+
+function currentCommit(): string | null {
+  try {
+    return execSync('git rev-parse --short HEAD', { stdio: ['ignore', 'pipe', 'ignore'] }).toString().trim()
+  } catch {
+    return null
+  }
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2))
+
+  // Point the app's Firebase client at the emulator before anything imports it
+  process.env.NEXT_PUBLIC_FIREBASE_PROJECT_ID = PROJECT_ID
+  process.env.NEXT_PUBLIC_FIREBASE_API_KEY = process.env.NEXT_PUBLIC_FIREBASE_API_KEY || 'demo-api-key'
+  process.env.FIRESTORE_EMULATOR_HOST = EMULATOR_HOST
+  process.env.NEXT_PUBLIC_FIRESTORE_PROFILER = 'true'
+
+  const originalLog = console.log
+  const report = (...args: unknown[]) => originalLog(...args)
+  if (!options.verbose) {
+    // The service layer logs heavily; keep the benchmark output readable
+    console.log = () => {}
+    console.info = () => {}
+    console.debug = () => {}
+  }
+
+  const { db } = await import('@/lib/firebase')
+  const { getFirestoreProfileReport, resetFirestoreProfile } = await import('@/lib/firestore-profiler')
+  const { createFootageRequest } = await import('@/lib/footage-requests')
+  const { TemporaryMarkerService } = await import('@/lib/temporary-evidence-service')
+  const { generateHexagonalGrid } = await import('@/lib/hexagon-grid')
+  const { createDensityAreasFromCameras } = await import('@/lib/heatmap-utils')
+  const { getPendingVerifications } = await import('@/lib/admin')
+  const { autoArchiveOldRequests } = await import('@/lib/archive-service')
+  const { generateDataset, incidentLocations } = await import('./synthetic-city')
+  const { clearEmulator, seedDataset, BENCH_ADMIN_ID } = await import('./seed')
+
+  async function measure(
+    name: string,
+    iterations: number,
+    run: (iteration: number) => Promise<unknown> | unknown,
+    warmUp: boolean = true
+  ): Promise<CaseResult> {
+    if (warmUp) await run(-1)
+    resetFirestoreProfile()
+
+    const durations: number[] = []
+    const started = performance.now()
+    for (let i = 0; i < iterations; i++) {
+      const start = performance.now()
+      await run(i)
+      durations.push(performance.now() - start)
+    }
+    const elapsedMs = performance.now() - started
+    const { totals } = getFirestoreProfileReport()
+
+    durations.sort((a, b) => a - b)
+    const result: CaseResult = {
+      name,
+      iterations,
+      minMs: durations[0],
+      p50Ms: percentile(durations, 0.5),
+      p95Ms: percentile(durations, 0.95),
+      maxMs: durations[durations.length - 1],
+      meanMs: durations.reduce((sum, d) => sum + d, 0) / durations.length,
+      opsPerSecond: iterations / (elapsedMs / 1000),
+      readsPerOp: totals.reads / iterations,
+      writesPerOp: totals.writes / iterations
+    }
+
+    report(
+      `  ${name.padEnd(32)} p50 ${result.p50Ms.toFixed(1).padStart(8)}ms  p95 ${result.p95Ms.toFixed(1).padStart(8)}ms  ` +
+      `${result.opsPerSecond.toFixed(1).padStart(7)} ops/s  ${result.readsPerOp.toFixed(1).padStart(7)} reads/op  ` +
+      `${result.writesPerOp.toFixed(1).padStart(6)} writes/op`
+    )
+    return result
+  }
+
+  const benchmark: BenchmarkReport = {
+    createdAt: new Date().toISOString(),
+    commit: currentCommit(),
+    environment: {
+      node: process.version,
+      platform: platform(),
+      cpu: cpus()[0]?.model || 'unknown',
+      cpuCount: cpus().length,
+      memoryGb: Math.round(totalmem() / 1024 ** 3)
+    },
+    options: { scales: options.scales, cities: options.cities, iterations: options.iterations, seed: options.seed },
+    scales: []
+  }
+
+  for (const scale of options.scales) {
+    const dataset = generateDataset({
+      seed: options.seed,
+      cities: options.cities,
+      usersPerCity: Math.max(1, Math.round(BASE_DATASET.usersPerCity * scale)),
+      camerasPerCity: Math.max(1, Math.round(BASE_DATASET.camerasPerCity * scale)),
+      markersPerCity: Math.max(1, Math.round(BASE_DATASET.markersPerCity * scale)),
+      requestsPerCity: Math.max(1, Math.round(BASE_DATASET.requestsPerCity * scale)),
+      pendingVerificationRatio: BASE_DATASET.pendingVerificationRatio
+    })
+
+    report(`\n📊 Scale x${scale}: ${dataset.cameras.length} cameras, ${dataset.markers.length} markers, ` +
+      `${dataset.users.length} users, ${dataset.requests.length} requests`)
+
+    await clearEmulator(EMULATOR_HOST, PROJECT_ID)
+    const seedStart = performance.now()
+    const documentsSeeded = await seedDataset(db, dataset)
+    const seedMs = performance.now() - seedStart
+    report(`  seeded ${documentsSeeded} documents in ${(seedMs / 1000).toFixed(1)}s`)
+
+    // In-memory camera list in the shape the map hands to the grid/heatmap helpers
+    const mapCameras = dataset.cameras
+      .filter(camera => camera.status === 'active' && camera.shareWithCommunity && camera.verificationStatus === 'approved')
+      .map(camera => ({
+        id: camera.id,
+        userId: camera.userId,
+        userEmail: camera.userEmail,
+        name: camera.name,
+        location: camera.location,
+        displayLocation: camera.displayLocation
+      }) as RegisteredCamera)
+    const firstCity = dataset.cities[0]
+    const firstCityCameras = mapCameras.filter(camera => camera.id.startsWith('bench-camera-0-'))
+
+    const locations = incidentLocations(dataset, options.iterations + 1, options.seed + 1)
+    const requester = dataset.users[0]
+    const cases: CaseResult[] = []
+
+    cases.push(await measure('createFootageRequest', options.iterations, (i) =>
+      createFootageRequest(requester.id, requester.email, {
+        incidentType: 'theft',
+        incidentDate: new Date(Date.now() - 6 * 60 * 60 * 1000),
+        incidentTime: '14:00',
+        description: 'Benchmark incident',
+        incidentLocation: locations[i + 1],
+        searchRadius: 200,
+        priority: 'medium'
+      })
+    ))
+
+    cases.push(await measure('findMatchingMarkers', options.iterations, (i) =>
+      TemporaryMarkerService.findMatchingMarkers(locations[i + 1], 200, new Date(Date.now() - 6 * 60 * 60 * 1000))
+    ))
+
+    cases.push(await measure('generateHexagonalGrid', options.iterations, () =>
+      generateHexagonalGrid(mapCameras, firstCity.center, 5)
+    ))
+
+    cases.push(await measure('createDensityAreasFromCameras', options.iterations, () =>
+      createDensityAreasFromCameras(firstCityCameras, firstCity.center)
+    ))
+
+    cases.push(await measure('getPendingVerifications', options.iterations, () =>
+      getPendingVerifications(BENCH_ADMIN_ID, 20)
+    ))
+
+    // Archiving mutates the dataset, so it runs exactly once per scale and is
+    // only checked on reads against the baseline
+    cases.push(await measure('autoArchiveOldRequests', 1, () => autoArchiveOldRequests(), false))
+
+    benchmark.scales.push({
+      scale,
+      documentsSeeded,
+      seedMs,
+      counts: {
+        users: dataset.users.length,
+        cameras: dataset.cameras.length,
+        markers: dataset.markers.length,
+        requests: dataset.requests.length
+      },
+      cases
+    })
+  }
+
+  mkdirSync(RESULTS_DIR, { recursive: true })
+  const resultPath = join(RESULTS_DIR, `${benchmark.createdAt.replace(/[:.]/g, '-')}.json`)
+  writeFileSync(resultPath, JSON.stringify(benchmark, null, 2))
+  report(`\n💾 Results written to ${resultPath}`)
+
+  let regressions = 0
+  if (existsSync(options.baseline)) {
+    const baseline: BenchmarkReport = JSON.parse(readFileSync(options.baseline, 'utf8'))
+    regressions = compareWithBaseline(baseline, benchmark, options.tolerance, report)
+  } else {
+    report(`ℹ️ No baseline at ${options.baseline} - run with --save-baseline to create one`)
+  }
+
+  if (options.saveBaseline) {
+    writeFileSync(options.baseline, JSON.stringify(benchmark, null, 2))
+    report(`📌 Saved as baseline: ${options.baseline}`)
+  }
+
+  process.exit(options.failOnRegression && regressions > 0 ? 1 : 0)
+}
+
+/**
+ * Print per-case deltas against a baseline; returns the number of regressions
+ */
+function compareWithBaseline(
+  baseline: BenchmarkReport,
+  current: BenchmarkReport,
+  tolerance: number,
+  report: (...args: unknown[]) => void
+): number {
+  let regressions = 0
+  report(`\n📈 Compared with baseline from ${baseline.createdAt} (${baseline.commit || 'unknown commit'})`)
+
+  for (const scaleResult of current.scales) {
+    const baselineScale = baseline.scales.find(s => s.scale === scaleResult.scale)
+    if (!baselineScale) continue
+
+    for (const result of scaleResult.cases) {
+      const previous = baselineScale.cases.find(c => c.name === result.name)
+      if (!previous) continue
+
+      // A single unwarmed sample (autoArchiveOldRequests) is too noisy to judge on latency
+      const latencyComparable = result.iterations > 1 && previous.iterations > 1 && previous.p50Ms > 0
+      const latencyChange = latencyComparable ? (result.p50Ms - previous.p50Ms) / previous.p50Ms : 0
+      // Read counts are deterministic for a fixed seed, so any increase is a real change
+      const readsIncreased = result.readsPerOp > previous.readsPerOp + 0.5
+      const regressed = latencyChange > tolerance || readsIncreased
+      if (regressed) regressions++
+
+      report(
+        `  ${regressed ? '❌' : '✅'} x${scaleResult.scale} ${result.name.padEnd(32)} ` +
+        `p50 ${latencyComparable ? `${(latencyChange * 100).toFixed(0).padStart(5)}%` : '   n/a'}  ` +
+        `reads/op ${previous.readsPerOp.toFixed(1)} → ${result.readsPerOp.toFixed(1)}`
+      )
+    }
+  }
+
+  report(regressions > 0 ? `\n⚠️ ${regressions} regression(s) found` : '\n✅ No regressions')
+  return regressions
+}
+
+main().catch((error) => {
+  console.error('❌ Benchmark failed:', error)
+  process.exit(1)
+})
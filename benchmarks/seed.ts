@@ -0,0 +1,186 @@
+/**
+ * Emulator Seeding
+ * Writes a synthetic dataset into the Firestore emulator using the same
+ * document shapes the app writes (see src/lib/firestore.ts and
+ * src/lib/temporary-evidence-service.ts).
+ */
+
+import { doc, writeBatch, GeoPoint, Timestamp, type Firestore } from 'firebase/firestore'
+import { encodeGeohash } from '@/lib/geohash'
+import { TEMPORARY_EVIDENCE_COLLECTIONS } from '@/lib/temporary-evidence-service'
+import type { SyntheticDataset } from './synthetic-city'
+
+const BATCH_SIZE = 450 // Firestore caps a batch at 500 writes
+const DAY_MS = 24 * 60 * 60 * 1000
+
+export const BENCH_ADMIN_ID = 'bench-admin'
+
+type PendingWrite = { path: [string, string]; data: Record<string, unknown> }
+
+/**
+ * Wipe every document in the emulator database
+ */
+export async function clearEmulator(emulatorHost: string, projectId: string): Promise<void> {
+  const url = `http://${emulatorHost}/emulator/v1/projects/${projectId}/databases/(default)/documents`
+  const response = await fetch(url, { method: 'DELETE' })
+  if (!response.ok) {
+    throw new Error(`Failed to clear Firestore emulator (${response.status}): is it running on ${emulatorHost}?`)
+  }
+}
+
+const daysAgo = (days: number): Timestamp => Timestamp.fromMillis(Date.now() - days * DAY_MS)
+
+function buildWrites(dataset: SyntheticDataset): PendingWrite[] {
+  const writes: PendingWrite[] = []
+
+  writes.push({
+    path: ['user_roles', BENCH_ADMIN_ID],
+    data: { uid: BENCH_ADMIN_ID, email: 'admin@bench.local', role: 'admin', isActive: true }
+  })
+
+  for (const user of dataset.users) {
+    writes.push({
+      path: ['users', user.id],
+      data: {
+        uid: user.id,
+        email: user.email,
+        displayName: user.displayName,
+        role: 'user',
+        emailNotifications: false, // Keep email sends out of the measured hot paths
+        address: {
+          street: '1 Bench Street',
+          city: dataset.cities[user.cityIndex].name,
+          postcode: 'BE1 1NC',
+          coordinates: user.home
+        },
+        stats: { camerasRegistered: 0, requestsMade: 0, footageShared: 0, communityHelpScore: 0 },
+        createdAt: daysAgo(400)
+      }
+    })
+
+    writes.push({
+      path: [TEMPORARY_EVIDENCE_COLLECTIONS.notificationPreferences, user.id],
+      data: {
+        userId: user.id,
+        channels: { app: true, email: false, sms: false },
+        temporaryMarkers: { onMatch: true, onExpiry: true, onReward: true },
+        updatedAt: daysAgo(30)
+      }
+    })
+  }
+
+  for (const camera of dataset.cameras) {
+    const submittedAt = daysAgo(camera.createdDaysAgo)
+    writes.push({
+      path: ['cameras', camera.id],
+      data: {
+        id: camera.id,
+        userId: camera.userId,
+        userEmail: camera.userEmail,
+        name: camera.name,
+        type: 'security',
+        location: new GeoPoint(camera.location.lat, camera.location.lng),
+        displayLocation: new GeoPoint(camera.displayLocation.lat, camera.displayLocation.lng),
+        locationGeohash: encodeGeohash(camera.location.lat, camera.location.lng),
+        displayLocationGeohash: encodeGeohash(camera.displayLocation.lat, camera.displayLocation.lng),
+        fieldOfView: { direction: 0, angle: 110, range: 15 },
+        privacySettings: {
+          shareWithCommunity: camera.shareWithCommunity,
+          requireApproval: true,
+          maxRequestRadius: camera.maxRequestRadius,
+          autoRespond: false
+        },
+        status: camera.status,
+        verification: {
+          status: camera.verificationStatus,
+          submittedAt,
+          evidence: { userNotes: 'Synthetic benchmark camera' },
+          history: [],
+          priority: 'normal'
+        },
+        createdAt: submittedAt,
+        lastUpdated: submittedAt
+      }
+    })
+
+    if (camera.verificationStatus === 'pending') {
+      writes.push({
+        path: ['verification_queue', `queue-${camera.id}`],
+        data: {
+          cameraId: camera.id,
+          userId: camera.userId,
+          status: 'pending',
+          submittedAt,
+          priority: 'normal',
+          evidence: { userNotes: 'Synthetic benchmark camera' }
+        }
+      })
+    }
+  }
+
+  for (const marker of dataset.markers) {
+    const recordedAt = Timestamp.fromMillis(Date.now() - marker.recordedHoursAgo * 60 * 60 * 1000)
+    writes.push({
+      path: [TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers, marker.id],
+      data: {
+        ownerId: marker.ownerId,
+        ownerEmail: marker.ownerEmail,
+        location: marker.location,
+        recordedAt,
+        deviceType: marker.deviceType,
+        status: 'active',
+        expiresAt: Timestamp.fromMillis(recordedAt.toMillis() + 14 * DAY_MS),
+        createdAt: recordedAt,
+        updatedAt: recordedAt,
+        matchedRequests: [],
+        responsesSent: 0,
+        isVerified: marker.isVerified,
+        trustScore: marker.trustScore
+      }
+    })
+  }
+
+  for (const request of dataset.requests) {
+    const createdAt = daysAgo(request.createdDaysAgo)
+    writes.push({
+      path: ['footageRequests', request.id],
+      data: {
+        id: request.id,
+        requesterId: request.requesterId,
+        requesterEmail: request.requesterEmail,
+        incidentType: 'theft',
+        incidentDate: createdAt,
+        incidentTime: '14:00',
+        description: 'Synthetic benchmark incident',
+        incidentLocation: request.incidentLocation,
+        searchRadius: request.searchRadius,
+        priority: 'medium',
+        targetCameraIds: [],
+        responses: [],
+        status: request.status,
+        statusHistory: [],
+        createdAt,
+        expiresAt: Timestamp.fromMillis(createdAt.toMillis() + 7 * DAY_MS)
+      }
+    })
+  }
+
+  return writes
+}
+
+/**
+ * Seed the dataset in batches; returns the number of documents written
+ */
+export async function seedDataset(db: Firestore, dataset: SyntheticDataset): Promise<number> {
+  const writes = buildWrites(dataset)
+
+  for (let i = 0; i < writes.length; i += BATCH_SIZE) {
+    const batch = writeBatch(db)
+    for (const write of writes.slice(i, i + BATCH_SIZE)) {
+      batch.set(doc(db, ...write.path), write.data)
+    }
+    await batch.commit()
+  }
+
+  return writes.length
+}
@@ -0,0 +1,218 @@
+/**
+ * Synthetic City Generator
+ * Deterministic, spatially clustered test data for the benchmark suite.
+ *
+ * Each city has a handful of neighbourhood hotspots; cameras, temporary
+ * markers and incidents are scattered around those hotspots with a gaussian
+ * spread, which is much closer to real usage than a uniform grid.
+ */
+
+import type { Location } from '@/types'
+
+export interface DatasetConfig {
+  seed: number
+  cities: number
+  usersPerCity: number
+  camerasPerCity: number
+  markersPerCity: number
+  requestsPerCity: number
+  pendingVerificationRatio: number // Share of cameras waiting for admin approval
+}
+
+export interface SyntheticUser {
+  id: string
+  email: string
+  displayName: string
+  cityIndex: number
+  home: Location
+}
+
+export interface SyntheticCamera {
+  id: string
+  userId: string
+  userEmail: string
+  name: string
+  location: Location
+  displayLocation: Location
+  status: 'active' | 'inactive'
+  shareWithCommunity: boolean
+  verificationStatus: 'approved' | 'pending'
+  maxRequestRadius: number
+  createdDaysAgo: number
+}
+
+export interface SyntheticMarker {
+  id: string
+  ownerId: string
+  ownerEmail: string
+  location: Location
+  deviceType: 'dashcam' | 'mobile_phone' | 'action_camera' | 'other'
+  recordedHoursAgo: number
+  isVerified: boolean
+  trustScore: number
+}
+
+export interface SyntheticRequest {
+  id: string
+  requesterId: string
+  requesterEmail: string
+  incidentLocation: Location
+  status: 'pending' | 'approved' | 'fulfilled' | 'expired' | 'cancelled'
+  createdDaysAgo: number
+  searchRadius: number
+}
+
+export interface SyntheticCity {
+  name: string
+  center: Location
+  hotspots: Location[]
+}
+
+export interface SyntheticDataset {
+  config: DatasetConfig
+  cities: SyntheticCity[]
+  users: SyntheticUser[]
+  cameras: SyntheticCamera[]
+  markers: SyntheticMarker[]
+  requests: SyntheticRequest[]
+}
+
+// UK city centres used as anchors for the synthetic cities
+const CITY_ANCHORS: Array<{ name: string; center: Location }> = [
+  { name: 'Sheffield', center: { lat: 53.3811, lng: -1.4701 } },
+  { name: 'Leeds', center: { lat: 53.8008, lng: -1.5491 } },
+  { name: 'Manchester', center: { lat: 53.4808, lng: -2.2426 } },
+  { name: 'Birmingham', center: { lat: 52.4862, lng: -1.8904 } },
+  { name: 'Bristol', center: { lat: 51.4545, lng: -2.5879 } },
+  { name: 'Newcastle', center: { lat: 54.9783, lng: -1.6178 } },
+  { name: 'Nottingham', center: { lat: 52.9548, lng: -1.1581 } },
+  { name: 'Stockton-on-Tees', center: { lat: 54.5705, lng: -1.3290 } }
+]
+
+const HOTSPOTS_PER_CITY = 6
+const CITY_SPREAD_METERS = 4000 // Spread of hotspots around the city centre
+const HOTSPOT_SPREAD_METERS = 350 // Spread of points around a hotspot
+
+/**
+ * Small seeded PRNG (mulberry32) so every run generates the same dataset
+ */
+export function createRandom(seed: number): () => number {
+  let state = seed >>> 0
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0
+    let t = state
+    t = Math.imul(t ^ (t >>> 15), t | 1)
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61)
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296
+  }
+}
+
+const gaussian = (random: () => number): number => {
+  // Box-Muller transform
+  const u = Math.max(random(), Number.EPSILON)
+  const v = random()
+  return Math.sqrt(-2 * Math.log(u)) * Math.cos(2 * Math.PI * v)
+}
+
+/**
+ * Offset a location by a gaussian distance (sigma in metres)
+ */
+export function scatter(random: () => number, origin: Location, sigmaMeters: number): Location {
+  const dLat = (gaussian(random) * sigmaMeters) / 111320
+  const dLng = (gaussian(random) * sigmaMeters) / (111320 * Math.cos(origin.lat * Math.PI / 180))
+  return { lat: origin.lat + dLat, lng: origin.lng + dLng }
+}
+
+const pick = <T>(random: () => number, items: T[]): T => items[Math.floor(random() * items.length)]
+
+/**
+ * Build a full dataset for the given configuration
+ */
+export function generateDataset(config: DatasetConfig): SyntheticDataset {
+  const random = createRandom(config.seed)
+  const cities: SyntheticCity[] = []
+  const users: SyntheticUser[] = []
+  const cameras: SyntheticCamera[] = []
+  const markers: SyntheticMarker[] = []
+  const requests: SyntheticRequest[] = []
+
+  for (let c = 0; c < config.cities; c++) {
+    const anchor = CITY_ANCHORS[c % CITY_ANCHORS.length]
+    const name = c < CITY_ANCHORS.length ? anchor.name : `${anchor.name}-${Math.floor(c / CITY_ANCHORS.length)}`
+    const hotspots = Array.from({ length: HOTSPOTS_PER_CITY }, () =>
+      scatter(random, anchor.center, CITY_SPREAD_METERS)
+    )
+    cities.push({ name, center: anchor.center, hotspots })
+
+    const cityUsers: SyntheticUser[] = []
+    for (let i = 0; i < config.usersPerCity; i++) {
+      const user: SyntheticUser = {
+        id: `bench-user-${c}-${i}`,
+        email: `user-${c}-${i}@bench.local`,
+        displayName: `Bench User ${c}-${i}`,
+        cityIndex: c,
+        home: scatter(random, pick(random, hotspots), HOTSPOT_SPREAD_METERS)
+      }
+      cityUsers.push(user)
+      users.push(user)
+    }
+
+    for (let i = 0; i < config.camerasPerCity; i++) {
+      const owner = pick(random, cityUsers)
+      const location = scatter(random, owner.home, 30) // Cameras sit around the owner's home
+      cameras.push({
+        id: `bench-camera-${c}-${i}`,
+        userId: owner.id,
+        userEmail: owner.email,
+        name: `Camera ${c}-${i}`,
+        location,
+        displayLocation: scatter(random, location, 25),
+        status: random() < 0.92 ? 'active' : 'inactive',
+        shareWithCommunity: random() < 0.85,
+        verificationStatus: random() < config.pendingVerificationRatio ? 'pending' : 'approved',
+        maxRequestRadius: pick(random, [100, 200, 500]),
+        createdDaysAgo: Math.floor(random() * 365)
+      })
+    }
+
+    for (let i = 0; i < config.markersPerCity; i++) {
+      const owner = pick(random, cityUsers)
+      markers.push({
+        id: `bench-marker-${c}-${i}`,
+        ownerId: owner.id,
+        ownerEmail: owner.email,
+        location: scatter(random, pick(random, hotspots), HOTSPOT_SPREAD_METERS * 2),
+        deviceType: pick(random, ['dashcam', 'mobile_phone', 'action_camera', 'other'] as const),
+        recordedHoursAgo: Math.floor(random() * 24 * 13),
+        isVerified: random() < 0.4,
+        trustScore: Math.floor(40 + random() * 60)
+      })
+    }
+
+    for (let i = 0; i < config.requestsPerCity; i++) {
+      const requester = pick(random, cityUsers)
+      requests.push({
+        id: `bench-request-${c}-${i}`,
+        requesterId: requester.id,
+        requesterEmail: requester.email,
+        incidentLocation: scatter(random, pick(random, hotspots), HOTSPOT_SPREAD_METERS),
+        status: pick(random, ['pending', 'pending', 'approved', 'fulfilled', 'expired', 'cancelled'] as const),
+        createdDaysAgo: Math.floor(random() * 60),
+        searchRadius: pick(random, [50, 100, 200])
+      })
+    }
+  }
+
+  return { config, cities, users, cameras, markers, requests }
+}
+
+/**
+ * Random incident locations near the dataset's hotspots, for driving queries
+ */
+export function incidentLocations(dataset: SyntheticDataset, count: number, seed: number): Location[] {
+  const random = createRandom(seed)
+  return Array.from({ length: count }, () => {
+    const city = pick(random, dataset.cities)
+    return scatter(random, pick(random, city.hotspots), HOTSPOT_SPREAD_METERS)
+  })
+}
@@ -0,0 +1,97 @@
+// Local stand-in for SendGrid's v3 mail/send endpoint, for testing the email outbox
+//
+//   node scripts/mock-sendgrid.js [--port 3999] [--fail-rate 0.1] [--rate-limit 5]
+//
+// Then run the app with:
+//   SENDGRID_API_KEY=test SENDGRID_API_URL=http://127.0.0.1:3999/v3/mail/send
+//
+// --fail-rate   share of requests answered with a 500
+// --rate-limit  requests per second before answering 429 (like SendGrid's X-RateLimit headers)
+
+const http = require('http')
+
+const args = process.argv.slice(2)
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`)
+  return index >= 0 ? Number(args[index + 1]) : fallback
+}
+
+const PORT = option('port', 3999)
+const FAIL_RATE = option('fail-rate', 0)
+const RATE_LIMIT = option('rate-limit', 0)
+const MAX_PERSONALIZATIONS = 1000
+
+const totals = { requests: 0, recipients: 0, rejected: 0, rateLimited: 0, failed: 0 }
+let windowStart = Date.now()
+let windowCount = 0
+
+function reply(res, status, body, headers = {}) {
+  res.writeHead(status, { 'Content-Type': 'application/json', ...headers })
+  res.end(body ? JSON.stringify(body) : undefined)
+}
+
+const server = http.createServer((req, res) => {
+  if (req.method !== 'POST' || req.url !== '/v3/mail/send') {
+    return reply(res, 404, { errors: [{ message: 'Not found' }] })
+  }
+
+  let raw = ''
+  req.on('data', (chunk) => { raw += chunk })
+  req.on('end', () => {
+    totals.requests++
+
+    if (!/^Bearer .+/.test(req.headers.authorization || '')) {
+      totals.rejected++
+      return reply(res, 401, { errors: [{ message: 'Missing API key' }] })
+    }
+
+    if (RATE_LIMIT > 0) {
+      if (Date.now() - windowStart >= 1000) {
+        windowStart = Date.now()
+        windowCount = 0
+      }
+      if (++windowCount > RATE_LIMIT) {
+        totals.rateLimited++
+        const reset = Math.ceil((windowStart + 1000) / 1000)
+        return reply(res, 429, { errors: [{ message: 'Too many requests' }] }, {
+          'X-RateLimit-Limit': String(RATE_LIMIT),
+          'X-RateLimit-Remaining': '0',
+          'X-RateLimit-Reset': String(reset)
+        })
+      }
+    }
+
+    if (Math.random() < FAIL_RATE) {
+      totals.failed++
+      return reply(res, 500, { errors: [{ message: 'Injected failure' }] })
+    }
+
+    let payload
+    try {
+      payload = JSON.parse(raw)
+    } catch (error) {
+      totals.rejected++
+      return reply(res, 400, { errors: [{ message: 'Invalid JSON' }] })
+    }
+
+    const personalizations = payload.personalizations || []
+    const invalid = personalizations.find((p) => !p.to || !p.to.every((to) => /^[^@\s]+@[^@\s]+$/.test(to.email)))
+    if (personalizations.length === 0 || personalizations.length > MAX_PERSONALIZATIONS || invalid) {
+      totals.rejected++
+      return reply(res, 400, { errors: [{ message: 'Invalid personalizations', field: 'personalizations' }] })
+    }
+
+    totals.recipients += personalizations.length
+    console.log(`📨 ${personalizations.length} recipients: ${payload.subject}`)
+    reply(res, 202)
+  })
+})
+
+server.listen(PORT, '127.0.0.1', () => {
+  console.log(`📮 Mock SendGrid listening on http://127.0.0.1:${PORT}/v3/mail/send`)
+})
+
+process.on('SIGINT', () => {
+  console.log('\n📊 Totals:', totals)
+  process.exit(0)
+})
@@ -1,165 +1,253 @@
 import { NextRequest, NextResponse } from 'next/server'
+import { deferEmails, sendEmails } from '@/lib/email/delivery-worker'
+import { isEmailType, type EmailData, type EmailType } from '@/lib/email/templates'
+import { getDocumentAsUser } from '@/lib/firestore-rest'
+import { verifyRequestUser, type VerifiedUser } from '@/lib/verify-id-token'
 
 /**
  * Email API Route - Server-Side Only
  * POST /api/email/send
+ *
+ * Requires `Authorization: Bearer <Firebase ID token>`. Accepts a single
+ * email `{ type, to, data }` or a batch `{ messages: [...] }` of up to
+ * MAX_MESSAGES_PER_CALL; welcome emails may only go to the caller.
+ *
+ * Footage request notifications are sent as one fan-out:
+ * `{ fanOutRequestId, messages }` with up to MAX_MESSAGES_PER_FAN_OUT
+ * messages. The route reads the footage request as the caller, checks they
+ * created it recently and that every recipient is one of its camera owners,
+ * and counts the whole fan-out as one send against the hourly allowance.
+ *
+ * Emails go through the outbox and are sent in batches before the response,
+ * since a serverless function may be frozen as soon as it has replied.
+ * Emails over the hourly allowance stay in the outbox until the next window
+ * (`deferred` in the response, status 202) instead of being dropped.
+ * `success` is only true when SendGrid accepted every message.
  */
 
+export const runtime = 'nodejs' // The outbox needs the filesystem
+
 interface EmailRequest {
-  type: 'welcome' | 'footage-request' | 'footage-match' | 'footage-shared' | 'camera-approved' | 'camera-rejected' | 'request-expired'
+  type: EmailType
   to: string
-  data: any
+  data: EmailData
 }
 
-export async function POST(request: NextRequest) {
-  try {
-    const body: EmailRequest = await request.json()
-    
-    // Dynamic import SendGrid only on server
-    const sgMail = (await import('@sendgrid/mail')).default
-    const SENDGRID_API_KEY = process.env.SENDGRID_API_KEY || ''
-    const FROM_EMAIL = process.env.SENDGRID_FROM_EMAIL || 'noreply@neighbourhoodwatchplus.com'
-    
-    if (!SENDGRID_API_KEY) {
-      console.log(`📧 [EMAIL LOG] Would send ${body.type} email to ${body.to}`)
-      return NextResponse.json({ success: false, message: 'API key not configured' })
-    }
-    
-    sgMail.setApiKey(SENDGRID_API_KEY)
-    
-    // Generate email based on type
-    let subject = ''
-    let html = ''
-    
-    switch (body.type) {
-      case 'welcome':
-        subject = 'Welcome to Neighbourhood Watch+! 🏘️'
-        html = generateWelcomeEmail(body.data.userName)
-        break
-      
-      case 'footage-request':
-        subject = `🔔 New Footage Request: ${body.data.incidentType}`
-        html = generateFootageRequestEmail(body.data)
-        break
-        
-      case 'footage-match':
-        subject = '✨ Your Footage Matched an Incident'
-        html = generateFootageMatchEmail(body.data)
-        break
-        
-      case 'footage-shared':
-        subject = '📹 Footage Available for Your Request'
-        html = generateFootageSharedEmail(body.data)
-        break
-        
-      case 'camera-approved':
-        subject = '✅ Camera Verified and Approved'
-        html = generateCameraApprovedEmail(body.data)
-        break
-        
-      case 'camera-rejected':
-        subject = 'Camera Verification Update'
-        html = generateCameraRejectedEmail(body.data)
-        break
-        
-      case 'request-expired':
-        subject = 'Footage Request Expired'
-        html = generateRequestExpiredEmail(body.data)
-        break
-        
-      default:
-        return NextResponse.json({ success: false, message: 'Invalid email type' }, { status: 400 })
-    }
-    
-    await sgMail.send({
-      to: body.to,
-      from: { email: FROM_EMAIL, name: 'Neighbourhood Watch+' },
-      subject,
-      html
-    })
-    
-    console.log(`✅ Email sent to ${body.to}: ${subject}`)
-    return NextResponse.json({ success: true })
-    
-  } catch (error: any) {
-    console.error('❌ Email API error:', error)
-    return NextResponse.json({ 
-      success: false, 
-      message: error.message 
-    }, { status: 500 })
-  }
-}
+const MAX_MESSAGES_PER_CALL = 100
+const MAX_MESSAGES_PER_FAN_OUT = 1000 // One SendGrid request; the client splits larger fan-outs
+const MAX_SENDS_PER_USER_PER_HOUR = 500 // A fan-out counts as one send
+const HOUR_MS = 60 * 60 * 1000
+const FAN_OUT_WINDOW_MS = HOUR_MS // Notifications must follow the footage request's creation
+const FAN_OUT_TYPES: EmailType[] = ['footage-request', 'footage-match']
 
-// Email template generators (simplified versions)
-function emailTemplate(content: string): string {
-  return `
-<!DOCTYPE html>
-<html>
-<head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"></head>
-<body style="margin: 0; padding: 40px 20px; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background-color: #f3f4f6;">
-  <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; margin: 0 auto;">
-    <tr><td style="background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
-      <h1 style="color: #ffffff; margin: 0; font-size: 24px;">🏘️ Neighbourhood Watch+</h1>
-    </td></tr>
-    <tr><td style="padding: 40px 30px;">${content}</td></tr>
-    <tr><td style="background-color: #f9fafb; padding: 20px 30px; text-align: center; border-radius: 0 0 8px 8px;">
-      <p style="margin: 0; font-size: 12px; color: #6b7280;">Neighbourhood Watch+ | Privacy-First Community Security</p>
-    </td></tr>
-  </table>
-</body>
-</html>`
-}
+// One plain mailbox: no display names, lists, whitespace or control characters
+const RECIPIENT_PATTERN = /^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+$/
 
-function generateWelcomeEmail(userName: string): string {
-  return emailTemplate(`
-    <h2 style="color: #111827; margin: 0 0 20px 0;">Welcome! 👋</h2>
-    <p style="color: #374151;">Hi ${userName}, thank you for joining Neighbourhood Watch+.</p>
-  `)
+function isValidRecipient(to: unknown): to is string {
+  return typeof to === 'string' && to.length <= 254 && RECIPIENT_PATTERN.test(to)
 }
 
-function generateFootageRequestEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827; margin: 0 0 20px 0;">📹 New Footage Request</h2>
-    <p style="color: #374151;">Hi ${data.ownerName}, a community member has requested footage.</p>
-    <div style="background-color: #f9fafb; border-left: 4px solid #3b82f6; padding: 15px; margin: 20px 0;">
-      <p style="margin: 0;"><strong>Type:</strong> ${data.incidentType}</p>
-      <p style="margin: 0;"><strong>Location:</strong> ${data.incidentLocation}</p>
-    </div>
-  `)
-}
+// ========================================
+// PER-USER SEND ALLOWANCE
+// ========================================
 
-function generateFootageMatchEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827;">🎯 Your Footage Matches!</h2>
-    <p style="color: #374151;">Hi ${data.ownerName}, your footage matches a nearby incident (${data.matchDistance}m away).</p>
-  `)
+// Per-instance send counts, so one account can't turn the route into a mailer.
+// Sends past the allowance are deferred to the next window, which they count
+// against; past that the caller gets a 429.
+const sendWindows = new Map<string, { windowStart: number; count: number }>()
+
+interface SendAllowance {
+  immediate: number // How many of the sends may go out now
+  deferredUntil: number // When the rest may go out
 }
 
-function generateFootageSharedEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827;">✅ Footage Shared</h2>
-    <p style="color: #374151;">Hi ${data.requesterName}, ${data.cameraOwner} has shared footage for your ${data.incidentType} request.</p>
-  `)
+function takeSendAllowance(uid: string, count: number): SendAllowance | null {
+  const now = Date.now()
+  let entry = sendWindows.get(uid)
+  if (!entry || now - entry.windowStart >= HOUR_MS) {
+    // Sends deferred from the previous window go out in this one
+    const carried = entry && now - entry.windowStart < 2 * HOUR_MS
+      ? Math.max(0, entry.count - MAX_SENDS_PER_USER_PER_HOUR)
+      : 0
+    entry = { windowStart: now, count: carried }
+    sendWindows.set(uid, entry)
+  }
+
+  if (entry.count + count > 2 * MAX_SENDS_PER_USER_PER_HOUR) return null
+
+  const immediate = Math.max(0, Math.min(count, MAX_SENDS_PER_USER_PER_HOUR - entry.count))
+  entry.count += count
+  return { immediate, deferredUntil: entry.windowStart + HOUR_MS }
 }
 
-function generateCameraApprovedEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827;">✅ Camera Approved!</h2>
-    <p style="color: #374151;">Hi ${data.ownerName}, your camera "${data.cameraName}" has been verified and is now active.</p>
-  `)
+// ========================================
+// FOOTAGE REQUEST FAN-OUTS
+// ========================================
+
+// Fan-outs seen by this instance: when they may send, and which emails went out
+const fanOuts = new Map<string, { expiresAt: number; sendAt: number; recipients: Set<string> }>()
+
+/**
+ * Check a fan-out against the footage request it notifies; returns an error message or null
+ */
+async function verifyFanOut(
+  caller: VerifiedUser,
+  requestId: unknown,
+  messages: EmailRequest[]
+): Promise<string | null> {
+  if (typeof requestId !== 'string' || !/^[\w-]{1,128}$/.test(requestId)) {
+    return 'Invalid footage request'
+  }
+
+  // Read with the caller's own token, so Firestore rules decide what they can see
+  const footageRequest = await getDocumentAsUser(`footageRequests/${requestId}`, caller.idToken)
+  if (!footageRequest || footageRequest.requesterId !== caller.uid) {
+    return 'Footage request not found'
+  }
+
+  const createdAt = Date.parse(String(footageRequest.createdAt))
+  if (!(Date.now() - createdAt < FAN_OUT_WINDOW_MS)) {
+    return 'Footage request notifications can only be sent when the request is created'
+  }
+
+  const responses = Array.isArray(footageRequest.responses) ? footageRequest.responses : []
+  const owners = new Set(responses.map((response: any) => String(response?.cameraOwnerEmail || '').toLowerCase()))
+
+  for (const message of messages) {
+    if (!FAN_OUT_TYPES.includes(message.type) || message.data?.requestId !== requestId) {
+      return 'Only notifications for this footage request can be sent'
+    }
+    if (!owners.has(message.to.toLowerCase())) {
+      return 'Recipient is not an owner of a camera in this footage request'
+    }
+  }
+  return null
 }
 
-function generateCameraRejectedEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827;">Camera Update</h2>
-    <p style="color: #374151;">Hi ${data.ownerName}, we couldn't approve "${data.cameraName}" at this time.</p>
-    <p style="color: #991b1b;"><strong>Reason:</strong> ${data.reason}</p>
-  `)
+/**
+ * Take the allowance for a fan-out once, however many calls it is split into;
+ * returns when its messages may be sent and drops recipients already emailed
+ */
+function takeFanOutAllowance(
+  uid: string,
+  requestId: string,
+  messages: EmailRequest[]
+): { sendAt: number; messages: EmailRequest[] } | null {
+  const now = Date.now()
+  fanOuts.forEach((entry, id) => {
+    if (entry.expiresAt <= now) fanOuts.delete(id)
+  })
+
+  let entry = fanOuts.get(requestId)
+  if (!entry) {
+    const allowance = takeSendAllowance(uid, 1)
+    if (!allowance) return null
+    entry = {
+      expiresAt: now + FAN_OUT_WINDOW_MS,
+      sendAt: allowance.immediate > 0 ? now : allowance.deferredUntil,
+      recipients: new Set()
+    }
+    fanOuts.set(requestId, entry)
+  }
+
+  const recipients = entry.recipients
+  const unsent = messages.filter((message) => {
+    const key = `${message.type}:${message.to.toLowerCase()}`
+    if (recipients.has(key)) return false
+    recipients.add(key)
+    return true
+  })
+  return { sendAt: entry.sendAt, messages: unsent }
 }
 
-function generateRequestExpiredEmail(data: any): string {
-  return emailTemplate(`
-    <h2 style="color: #111827;">⏰ Request Expired</h2>
-    <p style="color: #374151;">Hi ${data.ownerName}, a ${data.incidentType} footage request has expired.</p>
-  `)
+// ========================================
+// ROUTE
+// ========================================
+
+export async function POST(request: NextRequest) {
+  try {
+    const caller = await verifyRequestUser(request)
+    if (!caller) {
+      return NextResponse.json({ success: false, message: 'Authentication required' }, { status: 401 })
+    }
+
+    const body = await request.json()
+    const messages: EmailRequest[] = Array.isArray(body.messages) ? body.messages : [body]
+    const isFanOut = body.fanOutRequestId !== undefined
+    const maxMessages = isFanOut ? MAX_MESSAGES_PER_FAN_OUT : MAX_MESSAGES_PER_CALL
+
+    if (messages.length === 0 || messages.length > maxMessages) {
+      return NextResponse.json({ success: false, message: 'Invalid number of messages' }, { status: 400 })
+    }
+
+    for (const message of messages) {
+      if (!isEmailType(message.type)) {
+        return NextResponse.json({ success: false, message: 'Invalid email type' }, { status: 400 })
+      }
+      if (!isValidRecipient(message.to)) {
+        return NextResponse.json({ success: false, message: 'Invalid recipient' }, { status: 400 })
+      }
+      if (message.type === 'welcome' && message.to.toLowerCase() !== caller.email?.toLowerCase()) {
+        return NextResponse.json({ success: false, message: 'Welcome emails can only be sent to yourself' }, { status: 403 })
+      }
+    }
+
+    let sendNow: EmailRequest[] = messages
+    let sendLater: EmailRequest[] = []
+    let deferredUntil = 0
+
+    if (isFanOut) {
+      const fanOutError = await verifyFanOut(caller, body.fanOutRequestId, messages)
+      if (fanOutError) {
+        return NextResponse.json({ success: false, message: fanOutError }, { status: 403 })
+      }
+
+      const fanOut = takeFanOutAllowance(caller.uid, body.fanOutRequestId, messages)
+      if (!fanOut) {
+        return NextResponse.json({ success: false, message: 'Email rate limit exceeded' }, { status: 429 })
+      }
+      const isDue = fanOut.sendAt <= Date.now()
+      sendNow = isDue ? fanOut.messages : []
+      sendLater = isDue ? [] : fanOut.messages
+      deferredUntil = fanOut.sendAt
+    } else {
+      const allowance = takeSendAllowance(caller.uid, messages.length)
+      if (!allowance) {
+        return NextResponse.json({ success: false, message: 'Email rate limit exceeded' }, { status: 429 })
+      }
+      sendNow = messages.slice(0, allowance.immediate)
+      sendLater = messages.slice(allowance.immediate)
+      deferredUntil = allowance.deferredUntil
+    }
+
+    const toOutbox = (list: EmailRequest[]) => list.map((message) => ({
+      type: message.type,
+      to: message.to,
+      data: message.data || {}
+    }))
+
+    const status = await sendEmails(toOutbox(sendNow))
+    const deferred = sendLater.length > 0 ? await deferEmails(toOutbox(sendLater), deferredUntil) : 0
+
+    if (!status || deferred === null) {
+      return NextResponse.json({ success: false, message: 'API key not configured' })
+    }
+
+    const delivered = status.sent === sendNow.length && deferred === 0
+    console.log(`📬 Sent ${status.sent}/${sendNow.length} emails (${status.pending} pending, ${status.failed} failed, ${deferred} deferred)`)
+    return NextResponse.json({
+      success: delivered,
+      sent: status.sent,
+      pending: status.pending,
+      failed: status.failed,
+      deferred
+    }, { status: delivered ? 200 : deferred > 0 && status.failed === 0 ? 202 : 502 })
+
+  } catch (error: any) {
+    console.error('❌ Email API error:', error)
+    return NextResponse.json({
+      success: false,
+      message: error.message
+    }, { status: 500 })
+  }
 }
@@ -4,6 +4,7 @@ import { Inter } from 'next/font/google'
 import { cn } from '@/lib/utils'
 import { AuthProvider } from '@/contexts/auth-context'
 import Footer from '@/components/layout/footer'
+import DebugInfo from '@/components/debug-info'
 
 const inter = Inter({ subsets: ['latin'] })
 
@@ -50,6 +51,8 @@ export default function RootLayout({
             </main>
             <Footer />
           </div>
+          {/* Env + Firestore profiler panel - opt in with NEXT_PUBLIC_DEBUG_PANEL=true */}
+          {process.env.NEXT_PUBLIC_DEBUG_PANEL === 'true' && <DebugInfo />}
         </AuthProvider>
       </body>
     </html>
@@ -14,6 +14,8 @@ import RequestManagement from '@/components/requests/request-management'
 import { Button } from '@/components/ui/button'
 import { cn } from '@/lib/utils'
 import { useAuth } from '@/contexts/auth-context'
+import { communityCameraStore } from '@/lib/camera-store'
+import type { GeoBounds } from '@/lib/geohash'
 import type { Location, IncidentFormData, MapMarker, CameraDensityArea } from '@/types'
 import type { RequestPriority } from '@/types/requests'
 import type { RegisteredCamera } from '@/types/camera'
@@ -27,9 +29,9 @@ export default function HomePage() {
   const [densityAreas, setDensityAreas] = useState<CameraDensityArea[]>([])
   const [heatmapRegenerationKey, setHeatmapRegenerationKey] = useState(0)
 
-  const [userLocation, setUserLocation] = useState<Location | null>(null)
   const [registeredCameras, setRegisteredCameras] = useState<RegisteredCamera[]>([])
   const [communityHeatmapCameras, setCommunityHeatmapCameras] = useState<RegisteredCamera[]>([])
+  const [isCoverageTruncated, setIsCoverageTruncated] = useState(false)
   const [showHexGrid, setShowHexGrid] = useState(true)
   
   // Authentication state
@@ -241,19 +243,10 @@ export default function HomePage() {
     setSelectedRadius(50) // Reset to default 50m
   }
 
-  // Load community cameras for heatmap
-  const loadCommunityHeatmapCameras = useCallback(async () => {
-    if (!userLocation) return
-    
-    try {
-      const { getCommunityHeatmapCameras } = await import('@/lib/firestore')
-      const communityCameras = await getCommunityHeatmapCameras(userLocation) // Global - no distance limit
-      setCommunityHeatmapCameras(communityCameras)
-      console.log(`🌍 Loaded ${communityCameras.length} community cameras for heatmap`)
-    } catch (error) {
-      console.error('❌ Error loading community heatmap cameras:', error)
-    }
-  }, [userLocation])
+  // Load community cameras for the visible map area (cached and kept live by the store)
+  const handleViewportChange = useCallback((bounds: GeoBounds) => {
+    communityCameraStore.setViewport(bounds)
+  }, [])
 
   // Handle density areas change with stable callback
   const handleDensityAreasChange = useCallback((areas: CameraDensityArea[]) => {
@@ -281,18 +274,13 @@ export default function HomePage() {
     // Location will be requested when user opens camera dashboard or clicks location button
   }, [])
 
-  // Load community cameras when user location is available
+  // Keep community heatmap cameras in sync with the viewport camera store
   React.useEffect(() => {
-    // Only load community cameras if we have a user location
-    // Location will be set when user opens dashboard or searches
-    if (userLocation) {
-      loadCommunityHeatmapCameras()
-    } else {
-      // Use a default UK location for community heatmap if no user location
-      const defaultLocation = { lat: 53.3811, lng: -1.4701 } // Sheffield area
-      setUserLocation(defaultLocation)
-    }
-  }, [userLocation, loadCommunityHeatmapCameras])
+    return communityCameraStore.subscribe((cameras) => {
+      setCommunityHeatmapCameras(cameras)
+      setIsCoverageTruncated(communityCameraStore.isViewportTruncated())
+    })
+  }, [])
 
   // Handle ESC key to cancel footage location selection
   React.useEffect(() => {
@@ -336,6 +324,7 @@ export default function HomePage() {
         onDensityAreasChange={handleDensityAreasChange}
         initialCenter={userProfile?.address?.coordinates}
         heatmapRegenerationKey={heatmapRegenerationKey}
+        onViewportChange={handleViewportChange}
         className="absolute inset-0"
       />
 
@@ -917,6 +906,7 @@ export default function HomePage() {
             <div className="text-xs text-blue-800 dark:text-blue-200 flex items-center gap-2">
               <div className="w-2 h-2 bg-gradient-to-r from-blue-500 to-red-500 rounded-full animate-pulse" />
               Coverage map active - {communityHeatmapCameras.length} community cameras, {densityAreas.length} areas
+              {isCoverageTruncated && ' (partial - zoom in to load every camera)'}
             </div>
           </div>
         )}
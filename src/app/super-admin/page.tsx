@@ -34,7 +34,7 @@ import {
   SelectTrigger,
   SelectValue,
 } from '@/components/ui/select'
-import { ArrowLeft, Users, Camera, Shield, Trash2, Edit, Search } from 'lucide-react'
+import { ArrowLeft, Users, Camera, Shield, Trash2, Edit, Search, Wrench } from 'lucide-react'
 import Link from 'next/link'
 import { 
   getAllUsers, 
@@ -45,6 +45,7 @@ import {
   type UserData,
   type CameraWithOwner
 } from '@/lib/admin-super'
+import { IncidentReportingService } from '@/lib/premium/premium-services'
 
 export default function SuperAdminPage() {
   const router = useRouter()
@@ -56,6 +57,8 @@ export default function SuperAdminPage() {
   const [selectedUser, setSelectedUser] = useState<UserData | null>(null)
   const [editingRole, setEditingRole] = useState<string>('')
   const [deleteTarget, setDeleteTarget] = useState<{ type: 'user' | 'camera', id: string, name: string } | null>(null)
+  const [isBackfilling, setIsBackfilling] = useState(false)
+  const [backfillResult, setBackfillResult] = useState<string | null>(null)
 
   // Check super admin access
   useEffect(() => {
@@ -118,6 +121,20 @@ export default function SuperAdminPage() {
     }
   }
 
+  // One-off migration: incidents reported before location indexing need geocells
+  const handleBackfillGeocells = async () => {
+    try {
+      setIsBackfilling(true)
+      const updated = await IncidentReportingService.backfillIncidentGeocells()
+      setBackfillResult(`Indexed ${updated} incident(s)`)
+    } catch (error) {
+      console.error('Error backfilling incident geocells:', error)
+      setBackfillResult('Backfill failed - see console')
+    } finally {
+      setIsBackfilling(false)
+    }
+  }
+
   const filteredUsers = users.filter(u => 
     u.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
     u.displayName.toLowerCase().includes(searchTerm.toLowerCase())
@@ -233,6 +250,7 @@ export default function SuperAdminPage() {
           <TabsList>
             <TabsTrigger value="users">Users ({users.length})</TabsTrigger>
             <TabsTrigger value="cameras">Cameras ({cameras.length})</TabsTrigger>
+            <TabsTrigger value="maintenance">Maintenance</TabsTrigger>
           </TabsList>
 
           {/* Users Tab */}
@@ -383,6 +401,32 @@ export default function SuperAdminPage() {
               </Card>
             ))}
           </TabsContent>
+
+          {/* Maintenance Tab */}
+          <TabsContent value="maintenance" className="space-y-4">
+            <Card>
+              <CardHeader>
+                <div className="flex items-center justify-between">
+                  <div>
+                    <CardTitle>Index Incidents by Location</CardTitle>
+                    <CardDescription>
+                      Adds geocells to community incidents reported before area queries existed.
+                      Run once after deploying; safe to re-run.
+                    </CardDescription>
+                  </div>
+                  <Button size="sm" variant="outline" onClick={handleBackfillGeocells} disabled={isBackfilling}>
+                    <Wrench className="w-4 h-4 mr-2" />
+                    {isBackfilling ? 'Running...' : 'Run Backfill'}
+                  </Button>
+                </div>
+              </CardHeader>
+              {backfillResult && (
+                <CardContent>
+                  <p className="text-sm text-gray-600 dark:text-gray-400">{backfillResult}</p>
+                </CardContent>
+              )}
+            </Card>
+          </TabsContent>
         </Tabs>
       </div>
 
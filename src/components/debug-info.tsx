@@ -1,24 +1,56 @@
 'use client'
 
-import React, { useEffect, useState } from 'react'
+import React, { useCallback, useEffect, useState } from 'react'
+import {
+  exportFirestoreProfile,
+  getFirestoreProfileReport,
+  resetFirestoreProfile,
+  type FirestoreProfileReport
+} from '@/lib/firestore-profiler'
+
+const PROFILE_REFRESH_MS = 2000
 
 export default function DebugInfo() {
   const [envVars, setEnvVars] = useState<Record<string, string>>({})
   const [isClient, setIsClient] = useState(false)
+  const [profile, setProfile] = useState<FirestoreProfileReport | null>(null)
+  const [groupByFlow, setGroupByFlow] = useState(true)
 
   useEffect(() => {
     setIsClient(true)
-    
+
     // Get all NEXT_PUBLIC_ environment variables
     const publicEnvVars: Record<string, string> = {
       'NEXT_PUBLIC_MAPTILER_API_KEY': process.env.NEXT_PUBLIC_MAPTILER_API_KEY || 'undefined',
       'NEXT_PUBLIC_FIREBASE_API_KEY': process.env.NEXT_PUBLIC_FIREBASE_API_KEY || 'undefined',
       'NODE_ENV': process.env.NODE_ENV || 'undefined'
     }
-    
+
     setEnvVars(publicEnvVars)
   }, [])
 
+  // Poll the Firestore profiler so the panel tracks reads/writes as the user navigates
+  useEffect(() => {
+    setProfile(getFirestoreProfileReport())
+    const interval = setInterval(() => setProfile(getFirestoreProfileReport()), PROFILE_REFRESH_MS)
+    return () => clearInterval(interval)
+  }, [])
+
+  const handleExportProfile = useCallback(() => {
+    const blob = new Blob([exportFirestoreProfile()], { type: 'application/json' })
+    const url = URL.createObjectURL(blob)
+    const link = document.createElement('a')
+    link.href = url
+    link.download = `firestore-profile-${new Date().toISOString().replace(/[:.]/g, '-')}.json`
+    link.click()
+    URL.revokeObjectURL(url)
+  }, [])
+
+  const handleResetProfile = useCallback(() => {
+    resetFirestoreProfile()
+    setProfile(getFirestoreProfileReport())
+  }, [])
+
   // Don't render anything until client-side hydration is complete
   if (!isClient) {
     return null
@@ -27,6 +59,7 @@ export default function DebugInfo() {
   // Check for browser APIs only on client side
   const hasGeolocation = typeof navigator !== 'undefined' && !!navigator.geolocation
   const hasMapLibre = typeof window !== 'undefined' && 'maplibregl' in window
+  const profileRows = profile ? (groupByFlow ? profile.flows : profile.operations) : []
 
   return (
     <div className="fixed bottom-4 right-4 z-[9999] bg-gray-900 text-white p-4 rounded-lg text-xs max-w-sm opacity-75 hover:opacity-100 transition-opacity">
@@ -44,6 +77,55 @@ export default function DebugInfo() {
           <div className="text-gray-400">Geolocation: {hasGeolocation ? '✅' : '❌'}</div>
           <div className="text-gray-400">MapLibre: {hasMapLibre ? '✅' : '❌'}</div>
         </div>
+        {profile && (
+          <div className="pt-2 border-t border-gray-700">
+            <div className="flex justify-between items-center mb-1">
+              <span className="font-semibold">🔥 Firestore</span>
+              <span className="text-gray-400">
+                {profile.enabled
+                  ? `${profile.totals.reads} reads · ${profile.totals.writes} writes`
+                  : 'profiler disabled'}
+              </span>
+            </div>
+            {profileRows.length > 0 && (
+              <div className="max-h-48 overflow-y-auto">
+                <table className="w-full">
+                  <thead>
+                    <tr className="text-gray-400 text-left">
+                      <th className="font-normal">{groupByFlow ? 'Flow' : 'Operation'}</th>
+                      <th className="font-normal text-right">R</th>
+                      <th className="font-normal text-right">W</th>
+                      <th className="font-normal text-right">p95</th>
+                    </tr>
+                  </thead>
+                  <tbody>
+                    {profileRows.map(operation => (
+                      <tr key={operation.operation} className={operation.errors > 0 ? 'text-red-400' : 'text-gray-300'}>
+                        <td className="truncate max-w-[10rem]" title={`${operation.calls} calls, avg ${operation.averageMs.toFixed(1)}ms`}>
+                          {operation.operation}
+                        </td>
+                        <td className="text-right">{operation.reads}</td>
+                        <td className="text-right">{operation.writes}</td>
+                        <td className="text-right">{operation.p95Ms.toFixed(0)}ms</td>
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              </div>
+            )}
+            <div className="flex gap-2 mt-2">
+              <button onClick={() => setGroupByFlow(!groupByFlow)} className="px-2 py-1 bg-gray-700 hover:bg-gray-600 rounded">
+                {groupByFlow ? 'By operation' : 'By flow'}
+              </button>
+              <button onClick={handleExportProfile} className="px-2 py-1 bg-gray-700 hover:bg-gray-600 rounded">
+                Export JSON
+              </button>
+              <button onClick={handleResetProfile} className="px-2 py-1 bg-gray-700 hover:bg-gray-600 rounded">
+                Reset
+              </button>
+            </div>
+          </div>
+        )}
       </div>
     </div>
   )
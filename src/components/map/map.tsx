@@ -10,6 +10,7 @@ import type { CameraDensityArea, HeatmapPoint } from '@/lib/heatmap-utils'
 import type { CameraPlacementData, RegisteredCamera } from '@/types/camera'
 import { generateHeatmapPoints, generateSampleDensityAreas, createDensityAreasFromCameras, createHeatmapPointsFromCameras } from '@/lib/heatmap-utils'
 import { generateHexagonalGrid, hexagonsToGeoJSON, type HexagonData } from '@/lib/hexagon-grid'
+import type { GeoBounds } from '@/lib/geohash'
 
 interface MapProps {
   onMapClick?: (coords: Location, screenPosition?: { x: number; y: number }) => void
@@ -27,6 +28,7 @@ interface MapProps {
   onDensityAreasChange?: (areas: CameraDensityArea[]) => void
   initialCenter?: Location // Initial map center - takes precedence over geolocation
   heatmapRegenerationKey?: number // Force heatmap regeneration when this changes
+  onViewportChange?: (bounds: GeoBounds) => void // Fired on load and after every pan/zoom
   className?: string
 }
 
@@ -57,12 +59,14 @@ const Map = forwardRef<MapRef, MapProps>(function Map({
   onDensityAreasChange,
   initialCenter,
   heatmapRegenerationKey = 0,
+  onViewportChange,
   className
 }, ref) {
   const mapContainer = useRef<HTMLDivElement>(null)
   const map = useRef<maplibregl.Map | null>(null)
   const prevCameraData = useRef<string>('')
   const onMapClickRef = useRef(onMapClick) // Store latest callback
+  const onViewportChangeRef = useRef(onViewportChange)
   const [isLoaded, setIsLoaded] = useState(false)
   const [userLocation, setUserLocation] = useState<Location | null>(null)
   const [locationError, setLocationError] = useState<string | null>(null)
@@ -99,6 +103,11 @@ const Map = forwardRef<MapRef, MapProps>(function Map({
     onMapClickRef.current = onMapClick
   }, [onMapClick])
 
+  // Keep onViewportChange ref up to date
+  useEffect(() => {
+    onViewportChangeRef.current = onViewportChange
+  }, [onViewportChange])
+
   // Get user's current location or use provided initial center
   useEffect(() => {
     // If initialCenter is provided (e.g., user's address), use it directly
@@ -182,11 +191,26 @@ const Map = forwardRef<MapRef, MapProps>(function Map({
       
       map.current.on('click', handleClick)
 
+      // Report the visible area so data can be loaded by viewport
+      const emitViewport = () => {
+        if (!map.current || !onViewportChangeRef.current) return
+        const bounds = map.current.getBounds()
+        onViewportChangeRef.current({
+          north: bounds.getNorth(),
+          south: bounds.getSouth(),
+          east: bounds.getEast(),
+          west: bounds.getWest()
+        })
+      }
+
+      map.current.on('moveend', emitViewport)
+
       map.current.on('load', () => {
         console.log('🎉 Map with heatmap ready!')
         setIsLoaded(true)
         setMapError(null)
         setCriticalError(null) // Clear any previous critical errors
+        emitViewport()
       })
 
       // Map initialized, heatmap data will be set by separate useEffect
@@ -1,6 +1,6 @@
 'use client'
 
-import React from 'react'
+import React, { useCallback, useEffect, useState } from 'react'
 import { 
   Shield, 
   Search, 
@@ -25,7 +25,8 @@ import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { Progress } from '@/components/ui/progress'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
-import type { UserRole } from '@/types/premium/subscription'
+import type { CommunityIncident, UserRole } from '@/types/premium/subscription'
+import { IncidentReportingService } from '@/lib/premium/premium-services'
 
 interface EvidenceRequest {
   id: string
@@ -63,6 +64,7 @@ interface PremiumDashboardProps {
       requestsRemaining: number
     }
   }
+  area?: { lat: number; lng: number; radius: number } // Patch to show incidents for (radius in metres)
   onCreateRequest?: () => void
   onViewRequest?: (requestId: string) => void
 }
@@ -102,12 +104,44 @@ export default function PremiumDashboard({
   userRole,
   organization = 'Your Organization',
   subscription,
+  area,
   onCreateRequest,
   onViewRequest
 }: PremiumDashboardProps) {
   const roleConfig = ROLE_CONFIGS[userRole as keyof typeof ROLE_CONFIGS]
   const RoleIcon = roleConfig?.icon || Shield
 
+  const [areaIncidents, setAreaIncidents] = useState<CommunityIncident[]>([])
+  const [incidentCursor, setIncidentCursor] = useState<string | null>(null)
+  const [isLoadingIncidents, setIsLoadingIncidents] = useState(false)
+
+  // Primitive deps so a new `area` object with the same values doesn't refetch
+  const areaLat = area?.lat
+  const areaLng = area?.lng
+  const areaRadius = area?.radius
+
+  const loadIncidents = useCallback(async (cursor: string | null = null) => {
+    if (areaLat === undefined || areaLng === undefined || areaRadius === undefined) return
+    setIsLoadingIncidents(true)
+    try {
+      const page = await IncidentReportingService.getIncidentsForRole(
+        userRole,
+        { lat: areaLat, lng: areaLng, radius: areaRadius },
+        { cursor }
+      )
+      setAreaIncidents(previous => cursor ? [...previous, ...page.incidents] : page.incidents)
+      setIncidentCursor(page.cursor)
+    } catch (error) {
+      console.error('❌ Error loading area incidents:', error)
+    } finally {
+      setIsLoadingIncidents(false)
+    }
+  }, [userRole, areaLat, areaLng, areaRadius])
+
+  useEffect(() => {
+    loadIncidents()
+  }, [loadIncidents])
+
   // Mock data - in real implementation, this would come from API
   const stats: DashboardStats = {
     requestsThisMonth: 47,
@@ -395,6 +429,57 @@ export default function PremiumDashboard({
                 </div>
               </CardContent>
             </Card>
+
+            {area && (
+              <Card>
+                <CardHeader>
+                  <CardTitle className="flex items-center gap-2">
+                    <MapPin className="w-5 h-5" />
+                    Incidents in Your Area
+                  </CardTitle>
+                </CardHeader>
+                <CardContent>
+                  <div className="space-y-3">
+                    {areaIncidents.map((incident) => (
+                      <div 
+                        key={incident.id}
+                        className="flex items-center justify-between p-3 border border-gray-200 dark:border-gray-700 rounded-lg"
+                      >
+                        <div>
+                          <h3 className="font-medium text-gray-900 dark:text-white">
+                            {incident.title}
+                          </h3>
+                          <p className="text-sm text-gray-500 mt-1">
+                            {incident.type.replace(/_/g, ' ')} • {incident.status.replace(/_/g, ' ')}
+                          </p>
+                        </div>
+                        <div className="flex items-center gap-3">
+                          <Badge variant="outline">{incident.severity.toUpperCase()}</Badge>
+                          <span className="text-sm text-gray-500">
+                            {incident.reportedAt.toDate().toLocaleDateString()}
+                          </span>
+                        </div>
+                      </div>
+                    ))}
+
+                    {!isLoadingIncidents && areaIncidents.length === 0 && (
+                      <p className="text-sm text-gray-500">No incidents reported in this area.</p>
+                    )}
+
+                    {incidentCursor && (
+                      <Button
+                        variant="outline"
+                        size="sm"
+                        disabled={isLoadingIncidents}
+                        onClick={() => loadIncidents(incidentCursor)}
+                      >
+                        {isLoadingIncidents ? 'Loading...' : 'Load More'}
+                      </Button>
+                    )}
+                  </div>
+                </CardContent>
+              </Card>
+            )}
           </TabsContent>
 
           {/* Analytics Tab */}
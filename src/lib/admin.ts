@@ -1,11 +1,6 @@
 import { 
   collection, 
   doc, 
-  getDoc, 
-  getDocs, 
-  setDoc,
-  updateDoc, 
-  deleteDoc,
   query, 
   where, 
   orderBy, 
@@ -14,6 +9,7 @@ import {
   Timestamp 
 } from 'firebase/firestore'
 import { db } from './firebase'
+import { profileFirestore } from './firestore-profiler'
 import type { 
   UserRole, 
   UserRoleType, 
@@ -32,11 +28,12 @@ import { updateUserTrustScore } from './verification'
 /**
  * Get user's role and permissions
  */
-async function getUserRole(userId: string): Promise<UserRole | null> {
+async function getUserRole(userId: string, flow?: string): Promise<UserRole | null> {
+  const firestoreOps = profileFirestore('getUserRole', flow)
   try {
     console.log('Getting user role from Firestore for:', userId)
     const roleRef = doc(db, 'user_roles', userId)
-    const roleDoc = await getDoc(roleRef)
+    const roleDoc = await firestoreOps.getDoc(roleRef)
     
     if (roleDoc.exists()) {
       const role = roleDoc.data() as UserRole
@@ -55,9 +52,9 @@ async function getUserRole(userId: string): Promise<UserRole | null> {
 /**
  * Check if user has specific permission
  */
-async function hasPermission(userId: string, permission: keyof UserPermissions): Promise<boolean> {
+async function hasPermission(userId: string, permission: keyof UserPermissions, flow?: string): Promise<boolean> {
   try {
-    const role = await getUserRole(userId)
+    const role = await getUserRole(userId, flow)
     
     if (!role || !role.isActive) {
       return false
@@ -151,16 +148,17 @@ async function assignUserRole(
   assignedByUserId: string,
   customPermissions?: Partial<UserPermissions>
 ): Promise<void> {
+  const firestoreOps = profileFirestore('assignUserRole')
   try {
     // Check if assigning user has permission
-    const canAssign = await hasPermission(assignedByUserId, 'canAssignModerators')
+    const canAssign = await hasPermission(assignedByUserId, 'canAssignModerators', 'assignUserRole')
     if (!canAssign) {
       throw new Error('Insufficient permissions to assign roles')
     }
     
     // Get user details
     const userRef = doc(db, 'users', userId)
-    const userDoc = await getDoc(userRef)
+    const userDoc = await firestoreOps.getDoc(userRef)
     
     if (!userDoc.exists()) {
       throw new Error('User not found')
@@ -184,10 +182,10 @@ async function assignUserRole(
     
     // Save role
     const roleRef = doc(db, 'user_roles', userId)
-    await setDoc(roleRef, userRole, { merge: true })
+    await firestoreOps.setDoc(roleRef, userRole, { merge: true })
     
     // Update user profile with role reference
-    await updateDoc(userRef, {
+    await firestoreOps.updateDoc(userRef, {
       role: userRole,
       lastActiveAt: serverTimestamp()
     })
@@ -208,17 +206,19 @@ async function approveCameraVerification(
   cameraId: string,
   adminId: string,
   adminNotes?: string,
-  publicNotes?: string
+  publicNotes?: string,
+  flow: string = 'approveCameraVerification'
 ): Promise<void> {
+  const firestoreOps = profileFirestore('approveCameraVerification', flow)
   try {
     // Check admin permissions
-    const canVerify = await hasPermission(adminId, 'canVerifyCameras')
+    const canVerify = await hasPermission(adminId, 'canVerifyCameras', flow)
     if (!canVerify) {
       throw new Error('Insufficient permissions to verify cameras')
     }
     
     const cameraRef = doc(db, 'cameras', cameraId)
-    const cameraDoc = await getDoc(cameraRef)
+    const cameraDoc = await firestoreOps.getDoc(cameraRef)
     
     if (!cameraDoc.exists()) {
       throw new Error('Camera not found')
@@ -252,33 +252,33 @@ async function approveCameraVerification(
     }
     
     // Update camera
-    await updateDoc(cameraRef, {
+    await firestoreOps.updateDoc(cameraRef, {
       verification: updatedVerification,
       operationalStatus: 'active', // Activate camera upon approval
       lastUpdated: serverTimestamp()
     })
     
     // Remove from verification queue
-    await removeFromVerificationQueue(cameraId)
+    await removeFromVerificationQueue(cameraId, flow)
     
     // Update user's trust score
     await updateUserTrustScore(camera.userId, `Camera "${camera.name}" verified`)
     
     // Send email notification to camera owner
     try {
-      const userDoc = await getDoc(doc(db, 'users', camera.userId))
+      const userDoc = await firestoreOps.getDoc(doc(db, 'users', camera.userId))
       if (userDoc.exists()) {
         const userData = userDoc.data()
         const emailEnabled = userData.emailNotifications !== false
         
         if (emailEnabled && userData.email) {
           const { sendCameraApprovedEmail } = await import('./email-service')
-          await sendCameraApprovedEmail(
+          const sent = await sendCameraApprovedEmail(
             userData.email,
             userData.displayName || 'Camera Owner',
             camera.name
           )
-          console.log(`✅ Approval email sent to ${userData.email}`)
+          if (sent) console.log(`✅ Approval email sent to ${userData.email}`)
         }
       }
     } catch (emailError) {
@@ -304,15 +304,16 @@ async function rejectCameraVerification(
   adminNotes?: string,
   publicNotes?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('rejectCameraVerification')
   try {
     // Check admin permissions
-    const canVerify = await hasPermission(adminId, 'canVerifyCameras')
+    const canVerify = await hasPermission(adminId, 'canVerifyCameras', 'rejectCameraVerification')
     if (!canVerify) {
       throw new Error('Insufficient permissions to verify cameras')
     }
     
     const cameraRef = doc(db, 'cameras', cameraId)
-    const cameraDoc = await getDoc(cameraRef)
+    const cameraDoc = await firestoreOps.getDoc(cameraRef)
     
     if (!cameraDoc.exists()) {
       throw new Error('Camera not found')
@@ -349,21 +350,21 @@ async function rejectCameraVerification(
     }
     
     // Update camera
-    await updateDoc(cameraRef, {
+    await firestoreOps.updateDoc(cameraRef, {
       verification: updatedVerification,
       operationalStatus: 'inactive', // Deactivate rejected camera
       lastUpdated: serverTimestamp()
     })
     
     // Remove from verification queue
-    await removeFromVerificationQueue(cameraId)
+    await removeFromVerificationQueue(cameraId, 'rejectCameraVerification')
     
     // Update user's trust score (penalty for rejection)
     await updateUserTrustScore(camera.userId, `Camera "${camera.name}" rejected: ${rejectionReason}`)
     
     // Send email notification to camera owner
     try {
-      const userDoc = await getDoc(doc(db, 'users', camera.userId))
+      const userDoc = await firestoreOps.getDoc(doc(db, 'users', camera.userId))
       if (userDoc.exists()) {
         const userData = userDoc.data()
         const emailEnabled = userData.emailNotifications !== false
@@ -371,13 +372,13 @@ async function rejectCameraVerification(
         if (emailEnabled && userData.email) {
           const { sendCameraRejectedEmail } = await import('./email-service')
           const reasonText = customReason || rejectionReason
-          await sendCameraRejectedEmail(
+          const sent = await sendCameraRejectedEmail(
             userData.email,
             userData.displayName || 'Camera Owner',
             camera.name,
             reasonText
           )
-          console.log(`✅ Rejection email sent to ${userData.email}`)
+          if (sent) console.log(`✅ Rejection email sent to ${userData.email}`)
         }
       }
     } catch (emailError) {
@@ -401,15 +402,16 @@ async function requestVerificationInfo(
   requestMessage: string,
   adminNotes?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('requestVerificationInfo')
   try {
     // Check admin permissions
-    const canVerify = await hasPermission(adminId, 'canVerifyCameras')
+    const canVerify = await hasPermission(adminId, 'canVerifyCameras', 'requestVerificationInfo')
     if (!canVerify) {
       throw new Error('Insufficient permissions to verify cameras')
     }
     
     const cameraRef = doc(db, 'cameras', cameraId)
-    const cameraDoc = await getDoc(cameraRef)
+    const cameraDoc = await firestoreOps.getDoc(cameraRef)
     
     if (!cameraDoc.exists()) {
       throw new Error('Camera not found')
@@ -442,7 +444,7 @@ async function requestVerificationInfo(
     }
     
     // Update camera
-    await updateDoc(cameraRef, {
+    await firestoreOps.updateDoc(cameraRef, {
       verification: updatedVerification,
       lastUpdated: serverTimestamp()
     })
@@ -471,7 +473,7 @@ async function batchApproveCameras(
   
   for (const cameraId of cameraIds) {
     try {
-      await approveCameraVerification(cameraId, adminId, adminNotes)
+      await approveCameraVerification(cameraId, adminId, adminNotes, undefined, 'batchApproveCameras')
       results.successful.push(cameraId)
     } catch (error: any) {
       results.failed.push({
@@ -489,17 +491,18 @@ async function batchApproveCameras(
 /**
  * Remove camera from verification queue after processing
  */
-async function removeFromVerificationQueue(cameraId: string): Promise<void> {
+async function removeFromVerificationQueue(cameraId: string, flow?: string): Promise<void> {
+  const firestoreOps = profileFirestore('removeFromVerificationQueue', flow)
   try {
     const queueQuery = query(
       collection(db, 'verification_queue'),
       where('cameraId', '==', cameraId)
     )
     
-    const snapshot = await getDocs(queueQuery)
+    const snapshot = await firestoreOps.getDocs(queueQuery)
     
     for (const doc of snapshot.docs) {
-      await deleteDoc(doc.ref)
+      await firestoreOps.deleteDoc(doc.ref)
     }
   } catch (error) {
     console.error('❌ Error removing from verification queue:', error)
@@ -515,15 +518,16 @@ async function updateVerificationPriority(
   priority: 'low' | 'normal' | 'high' | 'urgent',
   adminId: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('updateVerificationPriority')
   try {
-    const canVerify = await hasPermission(adminId, 'canVerifyCameras')
+    const canVerify = await hasPermission(adminId, 'canVerifyCameras', 'updateVerificationPriority')
     if (!canVerify) {
       throw new Error('Insufficient permissions')
     }
     
     // Update camera verification priority
     const cameraRef = doc(db, 'cameras', cameraId)
-    await updateDoc(cameraRef, {
+    await firestoreOps.updateDoc(cameraRef, {
       'verification.priority': priority,
       lastUpdated: serverTimestamp()
     })
@@ -534,9 +538,9 @@ async function updateVerificationPriority(
       where('cameraId', '==', cameraId)
     )
     
-    const snapshot = await getDocs(queueQuery)
+    const snapshot = await firestoreOps.getDocs(queueQuery)
     for (const doc of snapshot.docs) {
-      await updateDoc(doc.ref, { priority })
+      await firestoreOps.updateDoc(doc.ref, { priority })
     }
     
     console.log(`✅ Updated verification priority for ${cameraId}: ${priority}`)
@@ -550,6 +554,7 @@ async function updateVerificationPriority(
  * Get pending verifications for admin dashboard
  */
 async function getPendingVerifications(adminId: string, limitCount: number = 20) {
+  const firestoreOps = profileFirestore('getPendingVerifications')
   try {
     console.log('Getting pending verifications for admin:', adminId, 'limit:', limitCount)
     
@@ -561,7 +566,7 @@ async function getPendingVerifications(adminId: string, limitCount: number = 20)
       limit(limitCount * 2) // Get more items since we'll sort in JS
     )
 
-    const snapshot = await getDocs(verificationsQuery)
+    const snapshot = await firestoreOps.getDocs(verificationsQuery)
     console.log('Found verification queue documents:', snapshot.docs.length)
     
     const verifications = []
@@ -572,11 +577,11 @@ async function getPendingVerifications(adminId: string, limitCount: number = 20)
       
       // Get camera details
       const cameraRef = doc(db, 'cameras', data.cameraId)
-      const cameraDoc = await getDoc(cameraRef)
+      const cameraDoc = await firestoreOps.getDoc(cameraRef)
       
       // Get user details  
       const userRef = doc(db, 'users', data.userId)
-      const userDoc = await getDoc(userRef)
+      const userDoc = await firestoreOps.getDoc(userRef)
       
       if (cameraDoc.exists() && userDoc.exists()) {
         const camera = cameraDoc.data() as RegisteredCamera
@@ -651,10 +656,11 @@ async function getPendingVerifications(adminId: string, limitCount: number = 20)
  * Get verification statistics for admin dashboard
  */
 async function getVerificationStats(): Promise<VerificationStats> {
+  const firestoreOps = profileFirestore('getVerificationStats')
   try {
     // Get all cameras with verification data
     const camerasQuery = query(collection(db, 'cameras'))
-    const camerasSnapshot = await getDocs(camerasQuery)
+    const camerasSnapshot = await firestoreOps.getDocs(camerasQuery)
     const cameras = camerasSnapshot.docs.map(doc => doc.data() as RegisteredCamera)
     
     const stats: VerificationStats = {
@@ -723,14 +729,15 @@ async function getVerificationStats(): Promise<VerificationStats> {
  * Get all users with their roles and basic info
  */
 async function getAllUsers(limitCount: number = 100): Promise<Array<UserProfile & { userRole: UserRole | null }>> {
+  const firestoreOps = profileFirestore('getAllUsers')
   try {
     const usersQuery = query(collection(db, 'users'), limit(limitCount))
-    const usersSnapshot = await getDocs(usersQuery)
+    const usersSnapshot = await firestoreOps.getDocs(usersQuery)
     
     const users = await Promise.all(
       usersSnapshot.docs.map(async (userDoc) => {
         const userData = userDoc.data() as UserProfile
-        const userRole = await getUserRole(userDoc.id)
+        const userRole = await getUserRole(userDoc.id, 'getAllUsers')
         
         return {
           ...userData,
@@ -750,13 +757,14 @@ async function getAllUsers(limitCount: number = 100): Promise<Array<UserProfile
  * Get all admin users
  */
 async function getAllAdmins(): Promise<UserRole[]> {
+  const firestoreOps = profileFirestore('getAllAdmins')
   try {
     const rolesQuery = query(
       collection(db, 'user_roles'),
       where('role', 'in', ['admin', 'super_admin'])
     )
     
-    const snapshot = await getDocs(rolesQuery)
+    const snapshot = await firestoreOps.getDocs(rolesQuery)
     return snapshot.docs.map(doc => doc.data() as UserRole)
   } catch (error) {
     console.error('❌ Error getting admins:', error)
@@ -772,9 +780,10 @@ async function revokeUserRole(
   revokedByUserId: string,
   reason?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('revokeUserRole')
   try {
     // Check if revoking user has permission
-    const canRevoke = await hasPermission(revokedByUserId, 'canManageUsers')
+    const canRevoke = await hasPermission(revokedByUserId, 'canManageUsers', 'revokeUserRole')
     if (!canRevoke) {
       throw new Error('Insufficient permissions to revoke roles')
     }
@@ -789,15 +798,16 @@ async function revokeUserRole(
       revokedByUserId,
       'role_revoked',
       `Revoked admin role from user ${userId}`,
-      { userId, reason }
+      { userId, reason },
+      'revokeUserRole'
     )
     
     // Delete role document
-    await deleteDoc(doc(db, 'user_roles', userId))
+    await firestoreOps.deleteDoc(doc(db, 'user_roles', userId))
     
     // Update user profile
     const userRef = doc(db, 'users', userId)
-    await updateDoc(userRef, {
+    await firestoreOps.updateDoc(userRef, {
       role: null,
       lastActiveAt: serverTimestamp()
     })
@@ -818,9 +828,10 @@ async function toggleAdminStatus(
   isActive: boolean,
   reason?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('toggleAdminStatus')
   try {
     // Check permissions
-    const canToggle = await hasPermission(toggledByUserId, 'canManageUsers')
+    const canToggle = await hasPermission(toggledByUserId, 'canManageUsers', 'toggleAdminStatus')
     if (!canToggle) {
       throw new Error('Insufficient permissions to toggle admin status')
     }
@@ -835,12 +846,13 @@ async function toggleAdminStatus(
       toggledByUserId,
       isActive ? 'admin_activated' : 'admin_deactivated',
       `${isActive ? 'Activated' : 'Deactivated'} admin ${userId}`,
-      { userId, reason }
+      { userId, reason },
+      'toggleAdminStatus'
     )
     
     // Update role
     const roleRef = doc(db, 'user_roles', userId)
-    await updateDoc(roleRef, {
+    await firestoreOps.updateDoc(roleRef, {
       isActive,
       lastActiveAt: serverTimestamp()
     })
@@ -872,12 +884,14 @@ async function logAdminAction(
   adminId: string,
   action: string,
   description: string,
-  metadata?: Record<string, any>
+  metadata?: Record<string, any>,
+  flow?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('logAdminAction', flow)
   try {
     // Get admin details
     const userRef = doc(db, 'users', adminId)
-    const userDoc = await getDoc(userRef)
+    const userDoc = await firestoreOps.getDoc(userRef)
     
     if (!userDoc.exists()) {
       console.warn('Admin user not found for logging:', adminId)
@@ -897,7 +911,7 @@ async function logAdminAction(
     }
     
     // Save to admin_logs collection
-    await setDoc(doc(db, 'admin_logs', logEntry.id), logEntry)
+    await firestoreOps.setDoc(doc(db, 'admin_logs', logEntry.id), logEntry)
   } catch (error) {
     console.error('❌ Error logging admin action:', error)
     // Don't throw - logging failure shouldn't break operations
@@ -916,6 +930,7 @@ async function getAdminActivityLogs(
     limit?: number
   } = {}
 ): Promise<AdminActionLog[]> {
+  const firestoreOps = profileFirestore('getAdminActivityLogs')
   try {
     let logsQuery = query(collection(db, 'admin_logs'))
     
@@ -952,7 +967,7 @@ async function getAdminActivityLogs(
       logsQuery = query(logsQuery, limit(100)) // Default limit
     }
     
-    const snapshot = await getDocs(logsQuery)
+    const snapshot = await firestoreOps.getDocs(logsQuery)
     return snapshot.docs.map(doc => doc.data() as AdminActionLog)
   } catch (error) {
     console.error('❌ Error getting admin logs:', error)
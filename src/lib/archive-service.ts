@@ -9,17 +9,14 @@
 
 import { 
   doc, 
-  getDoc, 
-  setDoc, 
-  deleteDoc, 
   collection, 
   query, 
   where, 
-  getDocs, 
   serverTimestamp,
   Timestamp 
 } from 'firebase/firestore'
 import { db } from './firebase'
+import { profileFirestore } from './firestore-profiler'
 import type { FootageRequest } from '@/types/requests'
 
 export interface ArchivedRequest extends FootageRequest {
@@ -34,12 +31,14 @@ export interface ArchivedRequest extends FootageRequest {
  */
 export async function archiveRequest(
   requestId: string, 
-  reason: 'fulfilled' | 'expired' | 'cancelled' | 'manual'
+  reason: 'fulfilled' | 'expired' | 'cancelled' | 'manual',
+  flow?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('archiveRequest', flow)
   try {
     // Get the original request
     const requestRef = doc(db, 'footageRequests', requestId)
-    const requestSnap = await getDoc(requestRef)
+    const requestSnap = await firestoreOps.getDoc(requestRef)
     
     if (!requestSnap.exists()) {
       throw new Error(`Request ${requestId} not found`)
@@ -56,13 +55,13 @@ export async function archiveRequest(
     }
     
     // Move to archived collection
-    await setDoc(doc(db, 'archivedRequests', requestId), {
+    await firestoreOps.setDoc(doc(db, 'archivedRequests', requestId), {
       ...archivedData,
       archivedAt: serverTimestamp()
     })
     
     // Delete from active requests
-    await deleteDoc(requestRef)
+    await firestoreOps.deleteDoc(requestRef)
     
     console.log(`✅ Archived request ${requestId} (reason: ${reason})`)
     
@@ -78,10 +77,11 @@ export async function archiveRequest(
  * Useful if request was archived by mistake
  */
 export async function restoreRequest(requestId: string): Promise<void> {
+  const firestoreOps = profileFirestore('restoreRequest')
   try {
     // Get the archived request
     const archivedRef = doc(db, 'archivedRequests', requestId)
-    const archivedSnap = await getDoc(archivedRef)
+    const archivedSnap = await firestoreOps.getDoc(archivedRef)
     
     if (!archivedSnap.exists()) {
       throw new Error(`Archived request ${requestId} not found`)
@@ -93,10 +93,10 @@ export async function restoreRequest(requestId: string): Promise<void> {
     const { archivedAt, archivedReason, originalId, ...requestData } = archivedData
     
     // Restore to active requests
-    await setDoc(doc(db, 'footageRequests', requestId), requestData)
+    await firestoreOps.setDoc(doc(db, 'footageRequests', requestId), requestData)
     
     // Delete from archive
-    await deleteDoc(archivedRef)
+    await firestoreOps.deleteDoc(archivedRef)
     
     console.log(`✅ Restored request ${requestId} from archive`)
     
@@ -110,13 +110,14 @@ export async function restoreRequest(requestId: string): Promise<void> {
  * Get all archived requests for a specific user
  */
 export async function getUserArchivedRequests(userId: string): Promise<ArchivedRequest[]> {
+  const firestoreOps = profileFirestore('getUserArchivedRequests')
   try {
     const q = query(
       collection(db, 'archivedRequests'),
       where('requesterId', '==', userId)
     )
     
-    const snapshot = await getDocs(q)
+    const snapshot = await firestoreOps.getDocs(q)
     
     const archived: ArchivedRequest[] = []
     snapshot.forEach(doc => {
@@ -155,7 +156,7 @@ export async function bulkArchiveRequests(
   
   for (const requestId of requestIds) {
     try {
-      await archiveRequest(requestId, reason)
+      await archiveRequest(requestId, reason, 'bulkArchiveRequests')
       succeeded.push(requestId)
     } catch (error) {
       console.error(`Failed to archive ${requestId}:`, error)
@@ -176,8 +177,9 @@ export async function getArchiveStatistics(): Promise<{
   total: number
   byReason: Record<string, number>
 }> {
+  const firestoreOps = profileFirestore('getArchiveStatistics')
   try {
-    const snapshot = await getDocs(collection(db, 'archivedRequests'))
+    const snapshot = await firestoreOps.getDocs(collection(db, 'archivedRequests'))
     
     const stats: {
       total: number
@@ -221,12 +223,13 @@ export async function autoArchiveOldRequests(): Promise<{
   archived: number
   details: { fulfilled: number, expired: number, cancelled: number }
 }> {
+  const firestoreOps = profileFirestore('autoArchiveOldRequests')
   try {
     const now = new Date()
     const thirtyDaysAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000)
     const sevenDaysAgo = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000)
     
-    const allRequestsSnapshot = await getDocs(collection(db, 'footageRequests'))
+    const allRequestsSnapshot = await firestoreOps.getDocs(collection(db, 'footageRequests'))
     
     const toArchive: { id: string, reason: 'fulfilled' | 'expired' | 'cancelled' }[] = []
     
@@ -257,7 +260,7 @@ export async function autoArchiveOldRequests(): Promise<{
     
     for (const item of toArchive) {
       try {
-        await archiveRequest(item.id, item.reason)
+        await archiveRequest(item.id, item.reason, 'autoArchiveOldRequests')
         details[item.reason]++
       } catch (error) {
         console.error(`Failed to auto-archive ${item.id}:`, error)
@@ -319,8 +322,9 @@ export function shouldArchive(request: FootageRequest): 'fulfilled' | 'expired'
  * Use with caution - this cannot be undone
  */
 export async function permanentlyDeleteArchived(requestId: string): Promise<void> {
+  const firestoreOps = profileFirestore('permanentlyDeleteArchived')
   try {
-    await deleteDoc(doc(db, 'archivedRequests', requestId))
+    await firestoreOps.deleteDoc(doc(db, 'archivedRequests', requestId))
     console.log(`🗑️ Permanently deleted archived request ${requestId}`)
   } catch (error) {
     console.error('Error deleting archived request:', error)
@@ -0,0 +1,337 @@
+/**
+ * Community Camera Store
+ * Client-side cache of verified community cameras, loaded by visible map area.
+ *
+ * The viewport is covered with geohash cells. Each cell is a single bounded
+ * page (CELL_PAGE_SIZE) kept fresh by an onSnapshot listener, so panning only
+ * reads cells we have not seen yet and later changes arrive as incremental
+ * docChanges. A viewport cell that fills its page keeps that page and also
+ * loads the child cells its page doesn't fully cover, at most MAX_SPLIT_DEPTH
+ * levels finer than the viewport and only while the viewport stays within
+ * MAX_CACHED_CELLS. Past that the cell is left truncated (see
+ * isViewportTruncated) instead of reading every camera in view. Cameras are
+ * de-duplicated by ID across overlapping cells and the least recently viewed
+ * cells beyond MAX_CACHED_CELLS are evicted, those serving the viewport last.
+ *
+ * Requires a composite index on cameras:
+ * status, privacySettings.shareWithCommunity, verification.status, displayLocationGeohash
+ */
+
+import {
+  collection,
+  query,
+  where,
+  orderBy,
+  limit,
+  onSnapshot,
+  type Unsubscribe
+} from 'firebase/firestore'
+import { db } from '@/lib/firebase'
+import { communityCameraFromDoc } from '@/lib/firestore'
+import { PROFILER_ENABLED, recordFirestoreCall } from '@/lib/firestore-profiler'
+import {
+  geohashChildren,
+  geohashesForBounds,
+  geohashRangeEnd,
+  precisionForBounds,
+  type GeoBounds
+} from '@/lib/geohash'
+import type { RegisteredCamera } from '@/types/camera'
+
+const CELL_PAGE_SIZE = 200 // Max cameras read per cell
+const MAX_VIEWPORT_CELLS = 12 // Max cells used to cover one viewport
+const MAX_CACHED_CELLS = 48 // Hard cap on cells (and their listeners) kept
+const MAX_SPLIT_DEPTH = 1 // Levels finer than the viewport a full cell may split to
+const MIN_CELL_PRECISION = 2 // ~1250km x 625km cells when zoomed right out
+const MAX_CELL_PRECISION = 6 // ~1.2km x 0.6km cells at street level
+const NOTIFY_DEBOUNCE_MS = 150
+
+interface CameraCell {
+  prefix: string
+  cameraIds: Set<string>
+  loaded: boolean
+  boundary: string | null // Geohash of the last camera on a full page
+  truncated: boolean // Full page, and the split budget doesn't allow loading the rest
+  split: boolean // Full page, with the children it doesn't cover loaded as their own cells
+  unsubscribe: Unsubscribe
+}
+
+export interface CameraStoreStats {
+  cachedCells: number
+  cachedCameras: number
+  splitCells: number
+  truncatedCells: number
+  documentsRead: number
+}
+
+type CameraStoreListener = (cameras: RegisteredCamera[]) => void
+
+export class CommunityCameraStore {
+  private cameras = new Map<string, RegisteredCamera>()
+  private cameraCells = new Map<string, Set<string>>() // cameraId -> cell prefixes holding it
+  private cells = new Map<string, CameraCell>() // Insertion order doubles as LRU order
+  private viewportPrecision = MIN_CELL_PRECISION
+  private viewportServing = new Set<string>() // Cells supplying the visible cameras
+  private listeners = new Set<CameraStoreListener>()
+  private notifyTimer: ReturnType<typeof setTimeout> | null = null
+  private documentsRead = 0
+
+  /**
+   * Load any cells needed to cover the visible map area
+   */
+  setViewport(bounds: GeoBounds): void {
+    const precision = precisionForBounds(bounds, MAX_VIEWPORT_CELLS, MIN_CELL_PRECISION, MAX_CELL_PRECISION)
+    const prefixes = geohashesForBounds(bounds, precision)
+
+    // Zoomed out past the cell budget (continent/world view) - keep what is cached
+    if (prefixes.length > MAX_VIEWPORT_CELLS * 2) {
+      return
+    }
+
+    this.viewportPrecision = precision
+    // Seeded with the viewport prefixes so split budgets count them up front
+    this.viewportServing = new Set(prefixes)
+    prefixes.forEach(prefix => this.ensureCell(prefix))
+    this.evictCells()
+    this.scheduleNotify() // Coverage may have changed even if no camera did
+  }
+
+  /**
+   * Whether some visible cell holds only its first page of cameras
+   */
+  isViewportTruncated(): boolean {
+    return Array.from(this.viewportServing).some(prefix => this.cells.get(prefix)?.truncated)
+  }
+
+  /**
+   * Subscribe to camera changes. The listener is called immediately with the cached cameras.
+   */
+  subscribe(listener: CameraStoreListener): () => void {
+    this.listeners.add(listener)
+    listener(this.getCameras())
+    return () => {
+      this.listeners.delete(listener)
+    }
+  }
+
+  getCamera(cameraId: string): RegisteredCamera | undefined {
+    return this.cameras.get(cameraId)
+  }
+
+  getCameras(): RegisteredCamera[] {
+    return Array.from(this.cameras.values())
+  }
+
+  getCamerasInBounds(bounds: GeoBounds): RegisteredCamera[] {
+    return this.getCameras().filter(camera =>
+      camera.displayLocation.lat >= bounds.south &&
+      camera.displayLocation.lat <= bounds.north &&
+      camera.displayLocation.lng >= bounds.west &&
+      camera.displayLocation.lng <= bounds.east
+    )
+  }
+
+  getStats(): CameraStoreStats {
+    let splitCells = 0
+    let truncatedCells = 0
+    this.cells.forEach(cell => {
+      if (cell.split) splitCells++
+      if (cell.truncated) truncatedCells++
+    })
+
+    return {
+      cachedCells: this.cells.size,
+      cachedCameras: this.cameras.size,
+      splitCells,
+      truncatedCells,
+      documentsRead: this.documentsRead
+    }
+  }
+
+  /**
+   * Stop all listeners and drop cached cameras (e.g. on logout)
+   */
+  clear(): void {
+    this.cells.forEach(cell => cell.unsubscribe())
+    this.cells.clear()
+    this.cameras.clear()
+    this.cameraCells.clear()
+    this.viewportServing.clear()
+    this.notify()
+  }
+
+  private ensureCell(prefix: string): void {
+    const existing = this.cells.get(prefix)
+    if (existing) {
+      this.touchCell(existing)
+      this.viewportServing.add(prefix)
+      // Children may have been evicted, or a finer viewport may now allow the split
+      if (existing.boundary) this.splitCell(existing)
+      return
+    }
+
+    // A fully loaded ancestor cell already holds every camera in this area
+    for (let length = prefix.length - 1; length >= MIN_CELL_PRECISION; length--) {
+      const ancestor = this.cells.get(prefix.slice(0, length))
+      if (ancestor && ancestor.loaded && !ancestor.boundary) {
+        this.touchCell(ancestor)
+        this.viewportServing.add(ancestor.prefix)
+        return
+      }
+    }
+
+    const q = query(
+      collection(db, 'cameras'),
+      where('status', '==', 'active'),
+      where('privacySettings.shareWithCommunity', '==', true),
+      where('verification.status', '==', 'approved'),
+      where('displayLocationGeohash', '>=', prefix),
+      where('displayLocationGeohash', '<', geohashRangeEnd(prefix)),
+      orderBy('displayLocationGeohash'),
+      limit(CELL_PAGE_SIZE)
+    )
+
+    const cell: CameraCell = {
+      prefix,
+      cameraIds: new Set(),
+      loaded: false,
+      boundary: null,
+      truncated: false,
+      split: false,
+      unsubscribe: () => {}
+    }
+    this.cells.set(prefix, cell)
+    this.viewportServing.add(prefix)
+
+    cell.unsubscribe = onSnapshot(q, (snapshot) => {
+      const changes = snapshot.docChanges()
+      if (PROFILER_ENABLED) {
+        // Listener deliveries have no request latency - only the document count matters
+        recordFirestoreCall('communityCameraStore', 'onSnapshot', 0, { reads: changes.length })
+      }
+
+      changes.forEach((change) => {
+        this.documentsRead++
+        if (change.type === 'removed') {
+          this.detachCamera(change.doc.id, cell)
+        } else {
+          this.attachCamera(communityCameraFromDoc(change.doc), cell)
+        }
+      })
+
+      cell.loaded = true
+      if (snapshot.size >= CELL_PAGE_SIZE) {
+        cell.boundary = snapshot.docs[snapshot.docs.length - 1].get('displayLocationGeohash')
+        this.splitCell(cell)
+        this.evictCells()
+      } else {
+        cell.boundary = null
+        cell.split = false
+        cell.truncated = false
+      }
+      this.scheduleNotify()
+    }, (error) => {
+      console.error(`❌ Error listening to camera cell ${prefix}:`, error)
+      // Forget the cell so the next viewport change retries it
+      this.removeCell(cell)
+      this.scheduleNotify()
+    })
+  }
+
+  /**
+   * Load the children of a full cell that its page doesn't cover, if the
+   * budget allows; otherwise mark it truncated. The cell keeps its page:
+   * results are ordered by geohash, so children sorting before the page's
+   * last camera are already complete.
+   */
+  private splitCell(cell: CameraCell): void {
+    if (!cell.boundary) return
+    const boundaryChild = cell.boundary.slice(0, cell.prefix.length + 1)
+    const children = geohashChildren(cell.prefix).filter(child => child >= boundaryChild)
+    const addedCells = children.filter(child => !this.viewportServing.has(child)).length
+
+    const canSplit = this.viewportServing.has(cell.prefix) &&
+      cell.prefix.length < Math.min(MAX_CELL_PRECISION, this.viewportPrecision + MAX_SPLIT_DEPTH) &&
+      this.viewportServing.size + addedCells <= MAX_CACHED_CELLS
+
+    if (!canSplit) {
+      // Children loaded under an earlier budget still help until evicted, but the cell is incomplete
+      cell.split = false
+      cell.truncated = true
+      return
+    }
+
+    cell.split = true
+    cell.truncated = false
+    children.forEach(child => this.ensureCell(child))
+  }
+
+  private touchCell(cell: CameraCell): void {
+    this.cells.delete(cell.prefix)
+    this.cells.set(cell.prefix, cell)
+  }
+
+  private evictCells(): void {
+    if (this.cells.size <= MAX_CACHED_CELLS) return
+
+    // Least recently used first, sparing cells that serve the viewport until nothing else is left
+    const cells = Array.from(this.cells.values())
+    const candidates = cells
+      .filter(cell => !this.viewportServing.has(cell.prefix))
+      .concat(cells.filter(cell => this.viewportServing.has(cell.prefix)))
+
+    for (const cell of candidates) {
+      if (this.cells.size <= MAX_CACHED_CELLS) break
+      if (this.viewportServing.has(cell.prefix)) {
+        console.warn(`⚠️ Camera cell budget exceeded, dropping visible cell ${cell.prefix}`)
+        this.viewportServing.delete(cell.prefix)
+      }
+      this.removeCell(cell)
+    }
+
+    this.scheduleNotify()
+  }
+
+  private removeCell(cell: CameraCell): void {
+    cell.unsubscribe()
+    this.cells.delete(cell.prefix)
+    cell.cameraIds.forEach(cameraId => this.detachCamera(cameraId, cell))
+  }
+
+  private attachCamera(camera: RegisteredCamera, cell: CameraCell): void {
+    this.cameras.set(camera.id, camera)
+    cell.cameraIds.add(camera.id)
+
+    const holders = this.cameraCells.get(camera.id) || new Set<string>()
+    holders.add(cell.prefix)
+    this.cameraCells.set(camera.id, holders)
+  }
+
+  private detachCamera(cameraId: string, cell: CameraCell): void {
+    cell.cameraIds.delete(cameraId)
+
+    const holders = this.cameraCells.get(cameraId)
+    if (!holders) return
+    holders.delete(cell.prefix)
+
+    if (holders.size === 0) {
+      this.cameraCells.delete(cameraId)
+      this.cameras.delete(cameraId)
+    }
+  }
+
+  private scheduleNotify(): void {
+    if (this.notifyTimer) return
+    this.notifyTimer = setTimeout(() => {
+      this.notifyTimer = null
+      this.notify()
+    }, NOTIFY_DEBOUNCE_MS)
+  }
+
+  private notify(): void {
+    const cameras = this.getCameras()
+    this.listeners.forEach(listener => listener(cameras))
+  }
+}
+
+export const communityCameraStore = new CommunityCameraStore()
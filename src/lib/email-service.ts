@@ -1,48 +1,84 @@
 /**
  * Email Helper (Client-Safe)
- * Calls the email API route instead of using SendGrid directly
+ * Calls the email API route instead of using SendGrid directly; the route
+ * sends emails in batches and reports whether SendGrid accepted them all
  * Can be safely imported by both client and server code
  */
 
-interface EmailData {
-  // Welcome
-  userName?: string
-  
-  // Footage Request
-  ownerName?: string
-  incidentType?: string
-  incidentLocation?: string
-  requestedTime?: string
-  requestId?: string
-  
-  // Footage Match
-  matchDistance?: number
-  
-  // Footage Shared
-  requesterName?: string
-  cameraOwner?: string
-  
-  // Camera Approved/Rejected
-  cameraName?: string
-  reason?: string
+import { auth } from './firebase'
+import type { EmailData, EmailType } from './email/templates'
+
+export type { EmailData, EmailType }
+
+// Match MAX_MESSAGES_PER_CALL and MAX_MESSAGES_PER_FAN_OUT in /api/email/send
+const MAX_EMAILS_PER_CALL = 100
+const MAX_EMAILS_PER_FAN_OUT_CALL = 1000
+
+export interface QueuedEmail {
+  type: EmailType
+  to: string
+  data: EmailData
 }
 
-async function sendEmailViaAPI(type: string, to: string, data: EmailData): Promise<boolean> {
+export interface SendEmailBatchOptions {
+  // The footage request whose camera owners are being notified; the server
+  // checks the recipients against it and counts the batch as one send
+  fanOutRequestId?: string
+}
+
+/**
+ * Send several emails in as few API calls as possible
+ * The server batches same-type emails into shared SendGrid requests, so
+ * prefer this over awaiting one send per recipient. Requires a signed-in user.
+ * Emails over the hourly limit stay queued on the server (not counted as sent)
+ */
+export async function sendEmailBatch(
+  messages: QueuedEmail[],
+  options: SendEmailBatchOptions = {}
+): Promise<boolean> {
+  if (messages.length === 0) return true
+  const chunkSize = options.fanOutRequestId ? MAX_EMAILS_PER_FAN_OUT_CALL : MAX_EMAILS_PER_CALL
+
   try {
-    const response = await fetch('/api/email/send', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ type, to, data })
-    })
-    
-    const result = await response.json()
-    return result.success
+    const idToken = await auth.currentUser?.getIdToken()
+    if (!idToken) {
+      console.warn(`⚠️ Not signed in - ${messages.length} emails not sent`)
+      return false
+    }
+
+    const chunks: QueuedEmail[][] = []
+    for (let i = 0; i < messages.length; i += chunkSize) {
+      chunks.push(messages.slice(i, i + chunkSize))
+    }
+
+    const results = await Promise.all(chunks.map(async (chunk) => {
+      const response = await fetch('/api/email/send', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Authorization': `Bearer ${idToken}`
+        },
+        body: JSON.stringify({ messages: chunk, fanOutRequestId: options.fanOutRequestId })
+      })
+      const result = await response.json()
+      if (result.deferred > 0) {
+        console.log(`⏳ ${result.deferred} emails over the hourly limit are queued to send later`)
+      } else if (result.success !== true) {
+        console.warn(`⚠️ Email API: ${result.message || `${result.failed || 0} failed, ${result.pending || 0} pending`}`)
+      }
+      return result.success === true
+    }))
+    return results.every(Boolean)
   } catch (error) {
-    console.error(`❌ Failed to send ${type} email:`, error)
+    console.error(`❌ Failed to send ${messages.length} emails:`, error)
     return false
   }
 }
 
+async function sendEmailViaAPI(type: EmailType, to: string, data: EmailData): Promise<boolean> {
+  return sendEmailBatch([{ type, to, data }])
+}
+
 export async function sendWelcomeEmail(userEmail: string, userName: string): Promise<boolean> {
   return sendEmailViaAPI('welcome', userEmail, { userName })
 }
@@ -130,6 +166,7 @@ export async function sendRequestExpiredEmail(
 }
 
 export default {
+  sendEmailBatch,
   sendWelcomeEmail,
   sendFootageRequestEmail,
   sendFootageMatchEmail,
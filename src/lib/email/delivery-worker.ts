@@ -0,0 +1,429 @@
+/**
+ * Email Delivery Worker
+ * Drains the email outbox into batched SendGrid requests.
+ *
+ * - Same-template messages are coalesced into one mail/send request with up
+ *   to 1000 personalizations (one per recipient, values via substitutions)
+ * - Requests share a keep-alive connection pool
+ * - Concurrency backs off on 429s and recovers on success
+ * - Failed batches are retried with exponential backoff; a batch SendGrid
+ *   rejects outright is split in half until the bad address is isolated,
+ *   so one bad recipient costs about 2·log2(N) requests
+ *
+ * Serverless functions (Vercel) freeze as soon as the response is sent, so
+ * timers never fire there. Request handlers therefore use sendEmails(),
+ * which flushes before returning and reports what is still undelivered,
+ * rather than leaving delivery to the background schedule. Messages queued
+ * for later with deferEmails() go out with the first flush after they are due.
+ *
+ * Set SENDGRID_API_URL to point the worker at a mock endpoint
+ * (see scripts/mock-sendgrid.js). Server-side only.
+ */
+
+import http from 'http'
+import https from 'https'
+import os from 'os'
+import path from 'path'
+import { createHash, randomUUID } from 'crypto'
+import {
+  EmailOutbox,
+  type DeliveryStatus,
+  type NewOutboxMessage,
+  type OutboxMessage,
+  type OutboxStats
+} from './outbox'
+import { renderTemplateWithTags, substitutionsFor } from './templates'
+
+const DEFAULT_SENDGRID_API_URL = 'https://api.sendgrid.com/v3/mail/send'
+const MAX_PERSONALIZATIONS = 1000 // SendGrid limit per mail/send request
+const MAX_CONCURRENCY = 4
+const MAX_SOCKETS = 8
+const COALESCE_WINDOW_MS = 250 // Let a burst of enqueues land before flushing
+const MAX_ATTEMPTS = 6
+const MAX_IMMEDIATE_FLUSHES = 12 // Enough for sendNow() to bisect a full batch down to one recipient
+const BASE_BACKOFF_MS = 2000
+const MAX_BACKOFF_MS = 5 * 60 * 1000
+const DEFAULT_RATE_LIMIT_PAUSE_MS = 10 * 1000
+const REQUEST_TIMEOUT_MS = 30 * 1000
+
+// =============================================================================
+// TRANSPORT
+// =============================================================================
+
+export interface SendGridResponse {
+  status: number
+  headers: http.IncomingHttpHeaders
+  body: string
+}
+
+export interface SendGridTransport {
+  send(payload: object): Promise<SendGridResponse>
+}
+
+/**
+ * HTTP(S) transport with a keep-alive agent so batches reuse connections
+ */
+export function createSendGridTransport(apiKey: string, apiUrl: string = DEFAULT_SENDGRID_API_URL): SendGridTransport {
+  const url = new URL(apiUrl)
+  const client = url.protocol === 'http:' ? http : https
+  const agent = new client.Agent({ keepAlive: true, maxSockets: MAX_SOCKETS })
+
+  return {
+    send(payload) {
+      const body = JSON.stringify(payload)
+      return new Promise((resolve, reject) => {
+        const request = client.request(url, {
+          method: 'POST',
+          agent,
+          timeout: REQUEST_TIMEOUT_MS,
+          headers: {
+            'Authorization': `Bearer ${apiKey}`,
+            'Content-Type': 'application/json',
+            'Content-Length': Buffer.byteLength(body)
+          }
+        }, (response) => {
+          const chunks: Buffer[] = []
+          response.on('data', (chunk: Buffer) => chunks.push(chunk))
+          response.on('end', () => resolve({
+            status: response.statusCode || 0,
+            headers: response.headers,
+            body: Buffer.concat(chunks).toString('utf8')
+          }))
+          response.on('error', reject)
+        })
+        request.on('timeout', () => request.destroy(new Error('SendGrid request timed out')))
+        request.on('error', reject)
+        request.end(body)
+      })
+    }
+  }
+}
+
+// =============================================================================
+// BATCHING
+// =============================================================================
+
+interface EmailBatch {
+  key: string
+  messages: OutboxMessage[]
+}
+
+export interface FlushResult {
+  requests: number
+  sent: number
+  retried: number
+  failed: number
+}
+
+function batchKey(message: OutboxMessage): string {
+  if (message.group) return `group:${message.group}`
+  if (message.type !== 'raw') return `template:${message.type}`
+  // Raw messages only coalesce when their content is identical
+  const digest = createHash('sha1')
+    .update(`${message.subject}\0${message.html}\0${message.text || ''}`)
+    .digest('hex')
+  return `raw:${digest}`
+}
+
+function groupIntoBatches(messages: OutboxMessage[]): EmailBatch[] {
+  const groups = new Map<string, OutboxMessage[]>()
+  for (const message of messages) {
+    const key = batchKey(message)
+    const group = groups.get(key)
+    if (group) group.push(message)
+    else groups.set(key, [message])
+  }
+
+  const batches: EmailBatch[] = []
+  for (const [key, group] of Array.from(groups.entries())) {
+    for (let i = 0; i < group.length; i += MAX_PERSONALIZATIONS) {
+      batches.push({ key, messages: group.slice(i, i + MAX_PERSONALIZATIONS) })
+    }
+  }
+  return batches
+}
+
+function buildPayload(batch: EmailBatch, fromEmail: string): object {
+  const first = batch.messages[0]
+  const from = { email: fromEmail, name: 'Neighbourhood Watch+' }
+
+  if (first.type === 'raw') {
+    return {
+      personalizations: batch.messages.map((message) => ({ to: [{ email: message.to }] })),
+      from,
+      subject: first.subject,
+      content: [
+        { type: 'text/html', value: first.html },
+        ...(first.text ? [{ type: 'text/plain', value: first.text }] : [])
+      ]
+    }
+  }
+
+  const type = first.type
+  const template = renderTemplateWithTags(type)
+  return {
+    personalizations: batch.messages.map((message) => ({
+      to: [{ email: message.to }],
+      substitutions: substitutionsFor(type, message.data)
+    })),
+    from,
+    subject: template.subject,
+    content: [{ type: 'text/html', value: template.html }]
+  }
+}
+
+/**
+ * How long SendGrid asked us to back off, from Retry-After or X-RateLimit-Reset
+ */
+function rateLimitPauseMs(headers: http.IncomingHttpHeaders): number {
+  const retryAfter = Number(headers['retry-after'])
+  if (retryAfter > 0) return retryAfter * 1000
+
+  const reset = Number(headers['x-ratelimit-reset']) // Unix seconds
+  if (reset > 0) return Math.max(1000, reset * 1000 - Date.now())
+
+  return DEFAULT_RATE_LIMIT_PAUSE_MS
+}
+
+function backoffMs(attempts: number): number {
+  const exponential = Math.min(MAX_BACKOFF_MS, BASE_BACKOFF_MS * 2 ** attempts)
+  return exponential / 2 + Math.random() * (exponential / 2) // Jitter so retries don't line up
+}
+
+// =============================================================================
+// WORKER
+// =============================================================================
+
+export class EmailDeliveryWorker {
+  private concurrency = MAX_CONCURRENCY
+  private pausedUntil = 0
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private timerDueAt = 0
+  private flushing: Promise<FlushResult> | null = null
+
+  constructor(
+    readonly outbox: EmailOutbox,
+    private readonly transport: SendGridTransport,
+    private readonly fromEmail: string
+  ) {}
+
+  /**
+   * Queue messages for the background flush, no earlier than `notBefore`;
+   * rejects if they couldn't be persisted
+   */
+  async enqueue(messages: NewOutboxMessage[], notBefore?: number): Promise<string[]> {
+    if (messages.length === 0) return []
+    const ids = await this.outbox.enqueue(messages, notBefore)
+    this.schedule(Math.max(COALESCE_WINDOW_MS, (notBefore || 0) - Date.now()))
+    return ids
+  }
+
+  /**
+   * Queue messages and flush them before returning, for callers that can't
+   * count on the process outliving the request
+   */
+  async sendNow(messages: NewOutboxMessage[]): Promise<DeliveryStatus> {
+    const ids = await this.outbox.enqueue(messages)
+    // A flush already in progress claimed its messages before these were added
+    if (this.flushing) await this.flushing.catch(() => undefined)
+
+    let status = await this.outbox.getDeliveryStatus(ids)
+    // Halves of a rejected batch are retried straight away
+    for (let round = 0; round < MAX_IMMEDIATE_FLUSHES && status.pending > 0; round++) {
+      const nextDueAt = await this.outbox.nextDueAt()
+      if (nextDueAt === null || nextDueAt > Date.now()) break
+      await this.flush()
+      status = await this.outbox.getDeliveryStatus(ids)
+    }
+    return status
+  }
+
+  /**
+   * Flush after `delayMs`, unless a flush is already due sooner
+   */
+  schedule(delayMs: number = COALESCE_WINDOW_MS): void {
+    const dueAt = Math.max(Date.now() + delayMs, this.pausedUntil)
+    if (this.timer && this.timerDueAt <= dueAt) return
+    if (this.timer) clearTimeout(this.timer)
+
+    this.timerDueAt = dueAt
+    this.timer = setTimeout(() => {
+      this.timer = null
+      this.flush().catch((error) => console.error('❌ Email outbox flush failed:', error))
+    }, dueAt - Date.now())
+    this.timer.unref?.() // Don't keep scripts alive just for the outbox
+  }
+
+  /**
+   * Send everything that is due; concurrent callers share the same flush
+   */
+  flush(): Promise<FlushResult> {
+    if (!this.flushing) {
+      this.flushing = this.runFlush().finally(() => {
+        this.flushing = null
+      })
+    }
+    return this.flushing
+  }
+
+  getStats(): Promise<OutboxStats> {
+    return this.outbox.getStats()
+  }
+
+  private async runFlush(): Promise<FlushResult> {
+    const result: FlushResult = { requests: 0, sent: 0, retried: 0, failed: 0 }
+    const queue = groupIntoBatches(await this.outbox.claimDue())
+
+    if (queue.length > 0) {
+      const lane = async (index: number) => {
+        // Lanes above the current concurrency retire, so 429s shrink the pool
+        while (queue.length > 0 && index < this.concurrency && Date.now() >= this.pausedUntil) {
+          await this.deliver(queue.shift()!, result)
+        }
+      }
+      await Promise.all(Array.from({ length: Math.min(this.concurrency, queue.length) }, (_, i) => lane(i)))
+
+      // Anything left over was held back by a rate limit pause
+      const heldBack = queue.reduce<string[]>(
+        (ids, batch) => ids.concat(batch.messages.map((message) => message.id)),
+        []
+      )
+      if (heldBack.length > 0) {
+        await this.outbox.release(heldBack, this.pausedUntil)
+      }
+
+      console.log(`📨 Email outbox flush: ${result.sent} sent in ${result.requests} requests, ${result.retried} retrying, ${result.failed} failed`)
+    }
+
+    const nextDueAt = await this.outbox.nextDueAt()
+    if (nextDueAt !== null) this.schedule(nextDueAt - Date.now())
+
+    return result
+  }
+
+  private async deliver(batch: EmailBatch, result: FlushResult): Promise<void> {
+    const ids = batch.messages.map((message) => message.id)
+    result.requests++
+
+    let response: SendGridResponse
+    try {
+      response = await this.transport.send(buildPayload(batch, this.fromEmail))
+    } catch (error: any) {
+      await this.retryOrFail(batch, `Network error: ${error.message}`, result)
+      return
+    }
+
+    if (response.status >= 200 && response.status < 300) {
+      await this.outbox.complete(ids)
+      result.sent += ids.length
+      this.concurrency = Math.min(MAX_CONCURRENCY, this.concurrency + 1)
+      return
+    }
+
+    if (response.status === 429) {
+      const pauseMs = rateLimitPauseMs(response.headers)
+      this.pausedUntil = Math.max(this.pausedUntil, Date.now() + pauseMs)
+      this.concurrency = Math.max(1, Math.floor(this.concurrency / 2))
+      console.warn(`⏳ SendGrid rate limit hit, pausing ${Math.round(pauseMs / 1000)}s (concurrency ${this.concurrency})`)
+      await this.outbox.release(ids, this.pausedUntil)
+      result.retried += ids.length
+      return
+    }
+
+    const error = `SendGrid ${response.status}: ${response.body.slice(0, 500)}`
+
+    if (response.status >= 500) {
+      await this.retryOrFail(batch, error, result)
+    } else if (ids.length > 1) {
+      // A single invalid recipient rejects the whole request; bisect to find it
+      console.warn(`⚠️ SendGrid rejected a batch of ${ids.length}, retrying each half`)
+      const half = Math.ceil(ids.length / 2)
+      await this.outbox.release(ids.slice(0, half), Date.now(), { group: randomUUID() })
+      await this.outbox.release(ids.slice(half), Date.now(), { group: randomUUID() })
+      result.retried += ids.length
+    } else {
+      console.error(`❌ SendGrid rejected email to ${batch.messages[0].to}:`, error)
+      await this.outbox.fail(ids, error)
+      result.failed += ids.length
+    }
+  }
+
+  private async retryOrFail(batch: EmailBatch, error: string, result: FlushResult): Promise<void> {
+    const retryable = batch.messages.filter((message) => message.attempts + 1 < MAX_ATTEMPTS)
+    const exhausted = batch.messages.filter((message) => message.attempts + 1 >= MAX_ATTEMPTS)
+
+    // Messages in a batch share their history, so the first one sets the delay
+    if (retryable.length > 0) {
+      await this.outbox.retry(retryable.map((message) => message.id), backoffMs(retryable[0].attempts), error)
+      result.retried += retryable.length
+    }
+    if (exhausted.length > 0) {
+      console.error(`❌ Giving up on ${exhausted.length} emails after ${MAX_ATTEMPTS} attempts:`, error)
+      await this.outbox.fail(exhausted.map((message) => message.id), error)
+      result.failed += exhausted.length
+    }
+  }
+}
+
+// =============================================================================
+// SHARED INSTANCE
+// =============================================================================
+
+let sharedWorker: EmailDeliveryWorker | null = null
+
+/**
+ * The process-wide worker, or null when SendGrid isn't configured
+ */
+export function getEmailDeliveryWorker(): EmailDeliveryWorker | null {
+  const apiKey = process.env.SENDGRID_API_KEY
+  if (!apiKey) return null
+
+  if (!sharedWorker) {
+    // Vercel's deployment directory is read-only; only the tmp dir is writable
+    const outboxDir = process.env.EMAIL_OUTBOX_DIR ||
+      (process.env.VERCEL ? path.join(os.tmpdir(), 'email-outbox') : path.join(process.cwd(), '.email-outbox'))
+    sharedWorker = new EmailDeliveryWorker(
+      new EmailOutbox(outboxDir),
+      createSendGridTransport(apiKey, process.env.SENDGRID_API_URL || DEFAULT_SENDGRID_API_URL),
+      process.env.SENDGRID_FROM_EMAIL || 'noreply@neighbourhoodwatchplus.com'
+    )
+    // Pick up anything left over from a previous run
+    sharedWorker.schedule(0)
+  }
+  return sharedWorker
+}
+
+/**
+ * Send emails in batches and wait for the attempt to finish; returns null
+ * when email is not configured. Messages still `pending` (rate limited or
+ * retrying) stay in the outbox for a later flush.
+ */
+export async function sendEmails(messages: NewOutboxMessage[]): Promise<DeliveryStatus | null> {
+  const worker = getEmailDeliveryWorker()
+  if (!worker) {
+    for (const message of messages) {
+      console.log(`📧 [EMAIL LOG] Would send ${message.type} email to ${message.to}`)
+    }
+    return null
+  }
+
+  return worker.sendNow(messages)
+}
+
+/**
+ * Queue emails to be sent no earlier than `notBefore` (e.g. once a rate limit
+ * window has passed); returns how many were queued, or null when email is
+ * not configured
+ */
+export async function deferEmails(messages: NewOutboxMessage[], notBefore: number): Promise<number | null> {
+  const worker = getEmailDeliveryWorker()
+  if (!worker) {
+    for (const message of messages) {
+      console.log(`📧 [EMAIL LOG] Would send ${message.type} email to ${message.to} after ${new Date(notBefore).toISOString()}`)
+    }
+    return null
+  }
+
+  const ids = await worker.enqueue(messages, notBefore)
+  return ids.length
+}
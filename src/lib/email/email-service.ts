@@ -6,6 +6,8 @@
 // Email sending is only available in server-side contexts
 // This module should only be imported in API routes or server components
 
+import { sendEmails } from './delivery-worker'
+
 interface EmailOptions {
   to: string
   subject: string
@@ -14,59 +16,28 @@ interface EmailOptions {
 }
 
 /**
- * Send email via SendGrid API
- * Only works server-side (API routes, server actions)
+ * Send an email via SendGrid through the outbox worker
+ * Resolves true once SendGrid has accepted it. Only works server-side
+ * (API routes, server actions)
  */
 export async function sendEmail(options: EmailOptions): Promise<boolean> {
-  const SENDGRID_API_KEY = process.env.SENDGRID_API_KEY
-  const FROM_EMAIL = process.env.SENDGRID_FROM_EMAIL || 'notifications@neighbourhoodwatchplus.com'
-  
-  if (!SENDGRID_API_KEY) {
-    console.log(`📧 [EMAIL LOG] To: ${options.to}`)
-    console.log(`📧 [EMAIL LOG] Subject: ${options.subject}`)
-    console.log(`📧 [EMAIL LOG] SendGrid not configured - email logged only`)
-    return false
-  }
-
   try {
-    const response = await fetch('https://api.sendgrid.com/v3/mail/send', {
-      method: 'POST',
-      headers: {
-        'Authorization': `Bearer ${SENDGRID_API_KEY}`,
-        'Content-Type': 'application/json'
-      },
-      body: JSON.stringify({
-        personalizations: [{
-          to: [{ email: options.to }]
-        }],
-        from: {
-          email: FROM_EMAIL,
-          name: 'Neighbourhood Watch+'
-        },
-        subject: options.subject,
-        content: [
-          {
-            type: 'text/html',
-            value: options.html
-          },
-          ...(options.text ? [{
-            type: 'text/plain',
-            value: options.text
-          }] : [])
-        ]
-      })
-    })
+    const status = await sendEmails([{
+      type: 'raw',
+      to: options.to,
+      subject: options.subject,
+      html: options.html,
+      text: options.text
+    }])
 
-    if (response.ok) {
-      console.log(`✅ Email sent to ${options.to}: ${options.subject}`)
-      return true
-    } else {
-      const error = await response.text()
-      console.error(`❌ SendGrid error:`, error)
+    if (!status) {
+      console.log(`📧 [EMAIL LOG] Subject: ${options.subject}`)
+      console.log(`📧 [EMAIL LOG] SendGrid not configured - email logged only`)
       return false
     }
-  } catch (error: any) {
-    console.error(`❌ Failed to send email:`, error.message)
+    return status.sent === 1
+  } catch (error) {
+    console.error('❌ Failed to send email:', error)
     return false
   }
 }
@@ -0,0 +1,251 @@
+/**
+ * Email Outbox
+ * Persisted queue of outgoing emails, drained by the delivery worker.
+ *
+ * Messages are kept in a JSON file (EMAIL_OUTBOX_DIR, default `.email-outbox`)
+ * that is rewritten atomically on every change, so queued notifications
+ * survive a server restart. enqueue() fails if the file can't be written,
+ * so callers never report an email as queued when it only exists in memory.
+ * Server-side only.
+ */
+
+import { promises as fs } from 'fs'
+import path from 'path'
+import { randomUUID } from 'crypto'
+import type { EmailData, EmailType } from './templates'
+
+export type OutboxStatus = 'pending' | 'sending' | 'failed'
+
+export interface OutboxMessage {
+  id: string
+  type: EmailType | 'raw'
+  to: string
+  data: EmailData // Template values (templated messages only)
+  subject?: string // Raw messages only
+  html?: string
+  text?: string
+  status: OutboxStatus
+  attempts: number
+  nextAttemptAt: number
+  createdAt: number
+  group?: string // Only batched with its group: one half of a batch SendGrid rejected
+  lastError?: string
+}
+
+export type NewOutboxMessage = Pick<OutboxMessage, 'type' | 'to'> &
+  Partial<Pick<OutboxMessage, 'data' | 'subject' | 'html' | 'text'>>
+
+export interface OutboxStats {
+  pending: number
+  sending: number
+  failed: number
+}
+
+export interface DeliveryStatus extends OutboxStats {
+  sent: number
+}
+
+const OUTBOX_FILE = 'outbox.json'
+
+export class EmailOutbox {
+  private messages = new Map<string, OutboxMessage>()
+  private loaded: Promise<void> | null = null
+  private writeChain: Promise<void> = Promise.resolve()
+
+  constructor(private readonly directory: string) {}
+
+  private get filePath(): string {
+    return path.join(this.directory, OUTBOX_FILE)
+  }
+
+  private load(): Promise<void> {
+    if (!this.loaded) {
+      this.loaded = (async () => {
+        try {
+          const stored: OutboxMessage[] = JSON.parse(await fs.readFile(this.filePath, 'utf8'))
+          for (const message of stored) {
+            // A crash mid-send leaves messages claimed; send them again
+            if (message.status === 'sending') message.status = 'pending'
+            this.messages.set(message.id, message)
+          }
+          if (stored.length > 0) {
+            console.log(`📬 Restored ${stored.length} messages from email outbox`)
+          }
+        } catch (error: any) {
+          if (error.code !== 'ENOENT') {
+            console.error('❌ Failed to read email outbox:', error)
+          }
+        }
+      })()
+    }
+    return this.loaded
+  }
+
+  /**
+   * Write the current state to disk (serialized, tmp file + rename)
+   */
+  private persist(): Promise<void> {
+    const snapshot = JSON.stringify(Array.from(this.messages.values()))
+    const write = this.writeChain.then(async () => {
+      await fs.mkdir(this.directory, { recursive: true })
+      const tmpPath = `${this.filePath}.${process.pid}.tmp`
+      await fs.writeFile(tmpPath, snapshot, 'utf8')
+      await fs.rename(tmpPath, this.filePath)
+    })
+    // A failed write must not block the ones queued after it
+    this.writeChain = write.catch(() => undefined)
+    return write
+  }
+
+  /**
+   * Persist a state change of messages that are already safely queued; if
+   * the write fails the in-memory state is still correct, and the next
+   * successful write catches the file up
+   */
+  private async persistStateChange(): Promise<void> {
+    try {
+      await this.persist()
+    } catch (error) {
+      console.error('❌ Failed to persist email outbox:', error)
+    }
+  }
+
+  /**
+   * Queue messages for delivery no earlier than `notBefore`
+   */
+  async enqueue(newMessages: NewOutboxMessage[], notBefore?: number): Promise<string[]> {
+    await this.load()
+    const now = Date.now()
+    const ids: string[] = []
+
+    for (const message of newMessages) {
+      const id = randomUUID()
+      this.messages.set(id, {
+        id,
+        type: message.type,
+        to: message.to,
+        data: message.data || {},
+        subject: message.subject,
+        html: message.html,
+        text: message.text,
+        status: 'pending',
+        attempts: 0,
+        nextAttemptAt: Math.max(now, notBefore || 0),
+        createdAt: now
+      })
+      ids.push(id)
+    }
+
+    try {
+      await this.persist()
+    } catch (error) {
+      for (const id of ids) this.messages.delete(id)
+      console.error(`❌ Failed to persist ${ids.length} emails to the outbox:`, error)
+      throw error
+    }
+    return ids
+  }
+
+  /**
+   * Claim every pending message that is due for delivery
+   */
+  async claimDue(now: number = Date.now()): Promise<OutboxMessage[]> {
+    await this.load()
+    const claimed: OutboxMessage[] = []
+
+    for (const message of Array.from(this.messages.values())) {
+      if (message.status === 'pending' && message.nextAttemptAt <= now) {
+        message.status = 'sending'
+        claimed.push(message)
+      }
+    }
+
+    if (claimed.length > 0) await this.persistStateChange()
+    return claimed
+  }
+
+  async complete(ids: string[]): Promise<void> {
+    for (const id of ids) this.messages.delete(id)
+    await this.persistStateChange()
+  }
+
+  /**
+   * Return claimed messages to the queue without counting an attempt,
+   * optionally moving them into their own batch group
+   */
+  async release(ids: string[], nextAttemptAt: number, options: { group?: string } = {}): Promise<void> {
+    for (const id of ids) {
+      const message = this.messages.get(id)
+      if (!message) continue
+      message.status = 'pending'
+      message.nextAttemptAt = nextAttemptAt
+      if (options.group) message.group = options.group
+    }
+    await this.persistStateChange()
+  }
+
+  /**
+   * Put messages back in the queue after a failed attempt
+   */
+  async retry(ids: string[], delayMs: number, error: string): Promise<void> {
+    const nextAttemptAt = Date.now() + delayMs
+    for (const id of ids) {
+      const message = this.messages.get(id)
+      if (!message) continue
+      message.status = 'pending'
+      message.attempts += 1
+      message.nextAttemptAt = nextAttemptAt
+      message.lastError = error
+    }
+    await this.persistStateChange()
+  }
+
+  /**
+   * Give up on messages; they stay in the outbox for inspection
+   */
+  async fail(ids: string[], error: string): Promise<void> {
+    for (const id of ids) {
+      const message = this.messages.get(id)
+      if (!message) continue
+      message.status = 'failed'
+      message.attempts += 1
+      message.lastError = error
+    }
+    await this.persistStateChange()
+  }
+
+  /**
+   * Earliest time a pending message becomes due, or null when idle
+   */
+  async nextDueAt(): Promise<number | null> {
+    await this.load()
+    let earliest: number | null = null
+    for (const message of Array.from(this.messages.values())) {
+      if (message.status === 'pending' && (earliest === null || message.nextAttemptAt < earliest)) {
+        earliest = message.nextAttemptAt
+      }
+    }
+    return earliest
+  }
+
+  /**
+   * Where the given messages stand; delivered messages have left the outbox
+   */
+  async getDeliveryStatus(ids: string[]): Promise<DeliveryStatus> {
+    await this.load()
+    const status: DeliveryStatus = { sent: 0, pending: 0, sending: 0, failed: 0 }
+    for (const id of ids) {
+      const message = this.messages.get(id)
+      if (message) status[message.status]++
+      else status.sent++
+    }
+    return status
+  }
+
+  async getStats(): Promise<OutboxStats> {
+    await this.load()
+    const stats: OutboxStats = { pending: 0, sending: 0, failed: 0 }
+    for (const message of Array.from(this.messages.values())) stats[message.status]++
+    return stats
+  }
+}
@@ -0,0 +1,174 @@
+/**
+ * Email Templates
+ * Notification templates used by the email outbox worker.
+ *
+ * Templates are rendered once per batch with SendGrid substitution tags in
+ * place of per-recipient values (e.g. `-ownerName-`), so every recipient of
+ * the same template can share one request with one personalization each.
+ */
+
+export type EmailType =
+  | 'welcome'
+  | 'footage-request'
+  | 'footage-match'
+  | 'footage-shared'
+  | 'camera-approved'
+  | 'camera-rejected'
+  | 'request-expired'
+
+export type EmailData = Record<string, string | number | undefined>
+
+interface EmailTemplateDefinition {
+  fields: string[] // Per-recipient values referenced by the template
+  subject: (data: Record<string, string>) => string
+  html: (data: Record<string, string>) => string
+}
+
+export interface RenderedTemplate {
+  subject: string
+  html: string
+}
+
+// =============================================================================
+// TEMPLATE LAYOUT
+// =============================================================================
+
+function emailTemplate(content: string): string {
+  return `
+<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"></head>
+<body style="margin: 0; padding: 40px 20px; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background-color: #f3f4f6;">
+  <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; margin: 0 auto;">
+    <tr><td style="background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%); padding: 30px; text-align: center; border-radius: 8px 8px 0 0;">
+      <h1 style="color: #ffffff; margin: 0; font-size: 24px;">🏘️ Neighbourhood Watch+</h1>
+    </td></tr>
+    <tr><td style="padding: 40px 30px;">${content}</td></tr>
+    <tr><td style="background-color: #f9fafb; padding: 20px 30px; text-align: center; border-radius: 0 0 8px 8px;">
+      <p style="margin: 0; font-size: 12px; color: #6b7280;">Neighbourhood Watch+ | Privacy-First Community Security</p>
+    </td></tr>
+  </table>
+</body>
+</html>`
+}
+
+// =============================================================================
+// TEMPLATES
+// =============================================================================
+
+export const EMAIL_TEMPLATES: Record<EmailType, EmailTemplateDefinition> = {
+  'welcome': {
+    fields: ['userName'],
+    subject: () => 'Welcome to Neighbourhood Watch+! 🏘️',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827; margin: 0 0 20px 0;">Welcome! 👋</h2>
+    <p style="color: #374151;">Hi ${data.userName}, thank you for joining Neighbourhood Watch+.</p>
+  `)
+  },
+
+  'footage-request': {
+    fields: ['ownerName', 'incidentType', 'incidentLocation'],
+    subject: (data) => `🔔 New Footage Request: ${data.incidentType}`,
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827; margin: 0 0 20px 0;">📹 New Footage Request</h2>
+    <p style="color: #374151;">Hi ${data.ownerName}, a community member has requested footage.</p>
+    <div style="background-color: #f9fafb; border-left: 4px solid #3b82f6; padding: 15px; margin: 20px 0;">
+      <p style="margin: 0;"><strong>Type:</strong> ${data.incidentType}</p>
+      <p style="margin: 0;"><strong>Location:</strong> ${data.incidentLocation}</p>
+    </div>
+  `)
+  },
+
+  'footage-match': {
+    fields: ['ownerName', 'matchDistance'],
+    subject: () => '✨ Your Footage Matched an Incident',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827;">🎯 Your Footage Matches!</h2>
+    <p style="color: #374151;">Hi ${data.ownerName}, your footage matches a nearby incident (${data.matchDistance}m away).</p>
+  `)
+  },
+
+  'footage-shared': {
+    fields: ['requesterName', 'cameraOwner', 'incidentType'],
+    subject: () => '📹 Footage Available for Your Request',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827;">✅ Footage Shared</h2>
+    <p style="color: #374151;">Hi ${data.requesterName}, ${data.cameraOwner} has shared footage for your ${data.incidentType} request.</p>
+  `)
+  },
+
+  'camera-approved': {
+    fields: ['ownerName', 'cameraName'],
+    subject: () => '✅ Camera Verified and Approved',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827;">✅ Camera Approved!</h2>
+    <p style="color: #374151;">Hi ${data.ownerName}, your camera "${data.cameraName}" has been verified and is now active.</p>
+  `)
+  },
+
+  'camera-rejected': {
+    fields: ['ownerName', 'cameraName', 'reason'],
+    subject: () => 'Camera Verification Update',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827;">Camera Update</h2>
+    <p style="color: #374151;">Hi ${data.ownerName}, we couldn't approve "${data.cameraName}" at this time.</p>
+    <p style="color: #991b1b;"><strong>Reason:</strong> ${data.reason}</p>
+  `)
+  },
+
+  'request-expired': {
+    fields: ['ownerName', 'incidentType'],
+    subject: () => 'Footage Request Expired',
+    html: (data) => emailTemplate(`
+    <h2 style="color: #111827;">⏰ Request Expired</h2>
+    <p style="color: #374151;">Hi ${data.ownerName}, a ${data.incidentType} footage request has expired.</p>
+  `)
+  }
+}
+
+export function isEmailType(type: unknown): type is EmailType {
+  return typeof type === 'string' && Object.prototype.hasOwnProperty.call(EMAIL_TEMPLATES, type)
+}
+
+// =============================================================================
+// SUBSTITUTIONS
+// =============================================================================
+
+// Subject lines are plain text, so they get their own unescaped tags
+const htmlTag = (field: string) => `-${field}-`
+const subjectTag = (field: string) => `-${field}:subject-`
+
+const escapeHtml = (value: string): string =>
+  value
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;')
+    .replace(/'/g, '&#39;')
+
+/**
+ * Render a template with substitution tags in place of recipient values
+ */
+export function renderTemplateWithTags(type: EmailType): RenderedTemplate {
+  const template = EMAIL_TEMPLATES[type]
+  const htmlTags: Record<string, string> = {}
+  const subjectTags: Record<string, string> = {}
+  for (const field of template.fields) {
+    htmlTags[field] = htmlTag(field)
+    subjectTags[field] = subjectTag(field)
+  }
+  return { subject: template.subject(subjectTags), html: template.html(htmlTags) }
+}
+
+/**
+ * Substitution values for one recipient of a tagged template
+ */
+export function substitutionsFor(type: EmailType, data: EmailData): Record<string, string> {
+  const substitutions: Record<string, string> = {}
+  for (const field of EMAIL_TEMPLATES[type].fields) {
+    const value = data[field] === undefined ? '' : String(data[field])
+    substitutions[htmlTag(field)] = escapeHtml(value)
+    substitutions[subjectTag(field)] = value
+  }
+  return substitutions
+}
@@ -36,6 +36,11 @@ if (process.env.NEXT_PUBLIC_USE_FIREBASE_EMULATOR === 'true' && typeof window !=
     // Silently ignore if already connected
     console.debug('Firebase Emulators already connected or connection failed')
   }
+} else if (typeof window === 'undefined' && process.env.FIRESTORE_EMULATOR_HOST) {
+  // Node scripts (benchmarks/) only need Firestore, e.g. FIRESTORE_EMULATOR_HOST=127.0.0.1:8080
+  const [host, port] = process.env.FIRESTORE_EMULATOR_HOST.split(':')
+  connectFirestoreEmulator(db, host, Number(port))
+  console.log('🔧 Connected to Firestore Emulator:', process.env.FIRESTORE_EMULATOR_HOST)
 } else {
   console.log('🔥 Connected to Firebase Production')
 }
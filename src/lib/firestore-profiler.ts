@@ -0,0 +1,270 @@
+/**
+ * Firestore Access Profiler
+ * Tags Firestore reads/writes with the operation that issued them and
+ * aggregates latency histograms and document counts per operation.
+ *
+ * Usage inside a service function:
+ *   const firestoreOps = profileFirestore('createFootageRequest')
+ *   const snapshot = await firestoreOps.getDocs(q)
+ *
+ * Every call is counted under its own operation and under a flow: the user
+ * flow that caused it. Shared helpers (getUserCameras, updateUserStats, ...)
+ * take an optional `flow` argument and pass it on, so they show up in the
+ * bill of each flow that calls them:
+ *   const firestoreOps = profileFirestore('getUserCameras', flow)
+ * The flow is passed explicitly rather than tracked globally, because
+ * unrelated flows run concurrently in the browser. Calls made without a
+ * flow count as their own.
+ *
+ * Enabled outside production, or in production with NEXT_PUBLIC_FIRESTORE_PROFILER=true.
+ * When disabled profileFirestore returns the plain Firestore functions.
+ */
+
+import {
+  getDocs as firestoreGetDocs,
+  getDoc as firestoreGetDoc,
+  updateDoc as firestoreUpdateDoc,
+  setDoc as firestoreSetDoc,
+  addDoc as firestoreAddDoc,
+  deleteDoc as firestoreDeleteDoc,
+  type CollectionReference,
+  type DocumentData,
+  type DocumentReference,
+  type DocumentSnapshot,
+  type Query,
+  type QuerySnapshot,
+  type SetOptions,
+  type UpdateData,
+  type WithFieldValue,
+  type WriteBatch
+} from 'firebase/firestore'
+
+export const PROFILER_ENABLED = process.env.NODE_ENV !== 'production' ||
+  process.env.NEXT_PUBLIC_FIRESTORE_PROFILER === 'true'
+
+// Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+export const LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500] as const
+
+export type FirestoreMethod =
+  | 'getDocs'
+  | 'getDoc'
+  | 'updateDoc'
+  | 'setDoc'
+  | 'addDoc'
+  | 'deleteDoc'
+  | 'commitBatch'
+  | 'onSnapshot'
+
+export interface OperationProfile {
+  operation: string
+  calls: number
+  reads: number // Documents read
+  writes: number // Documents written
+  errors: number
+  totalMs: number
+  maxMs: number
+  histogram: number[] // Call counts per LATENCY_BUCKETS_MS bucket (+1 overflow bucket)
+  methods: Partial<Record<FirestoreMethod, number>>
+}
+
+export interface FirestoreProfileReport {
+  generatedAt: string
+  startedAt: string
+  enabled: boolean
+  bucketsMs: readonly number[]
+  totals: {
+    calls: number
+    reads: number
+    writes: number
+    errors: number
+  }
+  operations: OperationSummary[] // By the function that made the call
+  flows: OperationSummary[] // By the top-level flow the call was made for
+}
+
+export type OperationSummary = OperationProfile & { averageMs: number; p50Ms: number; p95Ms: number }
+
+export interface ProfiledFirestore {
+  getDocs: <T = DocumentData>(query: Query<T>) => Promise<QuerySnapshot<T>>
+  getDoc: <T = DocumentData>(reference: DocumentReference<T>) => Promise<DocumentSnapshot<T>>
+  updateDoc: (reference: DocumentReference<any>, data: UpdateData<DocumentData>) => Promise<void>
+  setDoc: (reference: DocumentReference<any>, data: WithFieldValue<DocumentData>, options?: SetOptions) => Promise<void>
+  addDoc: (reference: CollectionReference<any>, data: WithFieldValue<DocumentData>) => Promise<DocumentReference<any>>
+  deleteDoc: (reference: DocumentReference<any>) => Promise<void>
+  commitBatch: (batch: WriteBatch, writes: number) => Promise<void> // writes = operations in the batch
+}
+
+const unprofiledFirestore: ProfiledFirestore = {
+  getDocs: firestoreGetDocs,
+  getDoc: firestoreGetDoc,
+  updateDoc: firestoreUpdateDoc,
+  setDoc: (reference, data, options) => options
+    ? firestoreSetDoc(reference, data, options)
+    : firestoreSetDoc(reference, data),
+  addDoc: firestoreAddDoc,
+  deleteDoc: firestoreDeleteDoc,
+  commitBatch: (batch) => batch.commit()
+}
+
+const profiles = new Map<string, OperationProfile>()
+const flowProfiles = new Map<string, OperationProfile>()
+let startedAt = new Date()
+
+const now = (): number =>
+  typeof performance !== 'undefined' ? performance.now() : Date.now()
+
+const getProfile = (profileMap: Map<string, OperationProfile>, operation: string): OperationProfile => {
+  let profile = profileMap.get(operation)
+  if (!profile) {
+    profile = {
+      operation,
+      calls: 0,
+      reads: 0,
+      writes: 0,
+      errors: 0,
+      totalMs: 0,
+      maxMs: 0,
+      histogram: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0),
+      methods: {}
+    }
+    profileMap.set(operation, profile)
+  }
+  return profile
+}
+
+const bucketIndex = (durationMs: number): number => {
+  const index = LATENCY_BUCKETS_MS.findIndex(bound => durationMs <= bound)
+  return index === -1 ? LATENCY_BUCKETS_MS.length : index
+}
+
+const addCall = (
+  profile: OperationProfile,
+  method: FirestoreMethod,
+  durationMs: number,
+  counts: { reads?: number; writes?: number; error?: boolean }
+): void => {
+  profile.calls++
+  profile.reads += counts.reads || 0
+  profile.writes += counts.writes || 0
+  if (counts.error) profile.errors++
+  profile.totalMs += durationMs
+  profile.maxMs = Math.max(profile.maxMs, durationMs)
+  profile.histogram[bucketIndex(durationMs)]++
+  profile.methods[method] = (profile.methods[method] || 0) + 1
+}
+
+/**
+ * Record a single Firestore call against an operation and the flow it belongs to
+ */
+export function recordFirestoreCall(
+  operation: string,
+  method: FirestoreMethod,
+  durationMs: number,
+  counts: { reads?: number; writes?: number; error?: boolean },
+  flow: string = operation
+): void {
+  addCall(getProfile(profiles, operation), method, durationMs, counts)
+  addCall(getProfile(flowProfiles, flow), method, durationMs, counts)
+}
+
+async function track<T>(
+  operation: string,
+  flow: string,
+  method: FirestoreMethod,
+  call: () => Promise<T>,
+  countReads: (result: T) => number,
+  writes: number
+): Promise<T> {
+  const start = now()
+  try {
+    const result = await call()
+    recordFirestoreCall(operation, method, now() - start, { reads: countReads(result), writes }, flow)
+    return result
+  } catch (error) {
+    recordFirestoreCall(operation, method, now() - start, { error: true }, flow)
+    throw error
+  }
+}
+
+/**
+ * Get Firestore accessors that attribute every call to the given operation,
+ * and to `flow` when it runs on behalf of another function
+ */
+export function profileFirestore(operation: string, flow: string = operation): ProfiledFirestore {
+  if (!PROFILER_ENABLED) {
+    return unprofiledFirestore
+  }
+
+  return {
+    // Empty query results are still billed as one read
+    getDocs: (q) => track(operation, flow, 'getDocs', () => firestoreGetDocs(q), snapshot => Math.max(1, snapshot.size), 0),
+    getDoc: (reference) => track(operation, flow, 'getDoc', () => firestoreGetDoc(reference), () => 1, 0),
+    updateDoc: (reference, data) => track(operation, flow, 'updateDoc', () => firestoreUpdateDoc(reference, data), () => 0, 1),
+    setDoc: (reference, data, options) => track(operation, flow, 'setDoc', () => unprofiledFirestore.setDoc(reference, data, options), () => 0, 1),
+    addDoc: (reference, data) => track(operation, flow, 'addDoc', () => firestoreAddDoc(reference, data), () => 0, 1),
+    deleteDoc: (reference) => track(operation, flow, 'deleteDoc', () => firestoreDeleteDoc(reference), () => 0, 1),
+    commitBatch: (batch, writes) => track(operation, flow, 'commitBatch', () => batch.commit(), () => 0, writes)
+  }
+}
+
+// Approximate a percentile from the histogram (upper bound of the matching bucket)
+const percentileFromHistogram = (profile: OperationProfile, percentile: number): number => {
+  if (profile.calls === 0) return 0
+  const target = Math.ceil(profile.calls * percentile)
+  let seen = 0
+  for (let i = 0; i < profile.histogram.length; i++) {
+    seen += profile.histogram[i]
+    if (seen >= target) {
+      return i < LATENCY_BUCKETS_MS.length ? LATENCY_BUCKETS_MS[i] : profile.maxMs
+    }
+  }
+  return profile.maxMs
+}
+
+// Most expensive (reads + writes) first
+const summarize = (profileMap: Map<string, OperationProfile>): OperationSummary[] =>
+  Array.from(profileMap.values())
+    .map(profile => ({
+      ...profile,
+      histogram: [...profile.histogram],
+      methods: { ...profile.methods },
+      averageMs: profile.calls > 0 ? profile.totalMs / profile.calls : 0,
+      p50Ms: percentileFromHistogram(profile, 0.5),
+      p95Ms: percentileFromHistogram(profile, 0.95)
+    }))
+    .sort((a, b) => (b.reads + b.writes) - (a.reads + a.writes))
+
+/**
+ * Snapshot of all operation and flow profiles
+ */
+export function getFirestoreProfileReport(): FirestoreProfileReport {
+  const operations = summarize(profiles)
+
+  return {
+    generatedAt: new Date().toISOString(),
+    startedAt: startedAt.toISOString(),
+    enabled: PROFILER_ENABLED,
+    bucketsMs: LATENCY_BUCKETS_MS,
+    totals: operations.reduce((totals, profile) => ({
+      calls: totals.calls + profile.calls,
+      reads: totals.reads + profile.reads,
+      writes: totals.writes + profile.writes,
+      errors: totals.errors + profile.errors
+    }), { calls: 0, reads: 0, writes: 0, errors: 0 }),
+    operations,
+    flows: summarize(flowProfiles)
+  }
+}
+
+/**
+ * JSON report for download/sharing
+ */
+export function exportFirestoreProfile(): string {
+  return JSON.stringify(getFirestoreProfileReport(), null, 2)
+}
+
+export function resetFirestoreProfile(): void {
+  profiles.clear()
+  flowProfiles.clear()
+  startedAt = new Date()
+}
@@ -0,0 +1,58 @@
+/**
+ * Firestore REST Reads (Server-Side)
+ * Reads a document on behalf of a signed-in user by forwarding their ID
+ * token, so security rules apply exactly as they do in the browser and API
+ * routes need no service account. Uses FIRESTORE_EMULATOR_HOST when set.
+ */
+
+type RestValue = Record<string, any>
+
+function decodeValue(value: RestValue): unknown {
+  if ('stringValue' in value) return value.stringValue
+  if ('integerValue' in value) return Number(value.integerValue)
+  if ('doubleValue' in value) return value.doubleValue
+  if ('booleanValue' in value) return value.booleanValue
+  if ('timestampValue' in value) return value.timestampValue // ISO string
+  if ('nullValue' in value) return null
+  if ('arrayValue' in value) return (value.arrayValue.values || []).map(decodeValue)
+  if ('mapValue' in value) return decodeFields(value.mapValue.fields || {})
+  return undefined
+}
+
+function decodeFields(fields: Record<string, RestValue>): Record<string, unknown> {
+  const data: Record<string, unknown> = {}
+  for (const [key, value] of Object.entries(fields)) data[key] = decodeValue(value)
+  return data
+}
+
+/**
+ * A document's data as the user sees it, or null if it is missing or the rules deny access
+ */
+export async function getDocumentAsUser(
+  documentPath: string,
+  idToken: string
+): Promise<Record<string, unknown> | null> {
+  const projectId = process.env.NEXT_PUBLIC_FIREBASE_PROJECT_ID
+  if (!projectId) {
+    console.error('❌ NEXT_PUBLIC_FIREBASE_PROJECT_ID not set - cannot read Firestore')
+    return null
+  }
+
+  const emulatorHost = process.env.FIRESTORE_EMULATOR_HOST
+  const baseUrl = emulatorHost ? `http://${emulatorHost}` : 'https://firestore.googleapis.com'
+  const path = documentPath.split('/').map(encodeURIComponent).join('/')
+
+  try {
+    const response = await fetch(`${baseUrl}/v1/projects/${projectId}/databases/(default)/documents/${path}`, {
+      headers: { 'Authorization': `Bearer ${idToken}` },
+      cache: 'no-store'
+    })
+    if (!response.ok) return null
+
+    const document = await response.json()
+    return decodeFields(document.fields || {})
+  } catch (error) {
+    console.error(`❌ Failed to read ${documentPath}:`, error)
+    return null
+  }
+}
@@ -1,11 +1,5 @@
 import { 
   doc, 
-  setDoc, 
-  getDoc, 
-  getDocs,
-  addDoc,
-  updateDoc,
-  deleteDoc,
   collection, 
   query, 
   where, 
@@ -13,9 +7,12 @@ import {
   limit,
   serverTimestamp,
   GeoPoint,
-  Timestamp
+  Timestamp,
+  type DocumentSnapshot
 } from 'firebase/firestore'
 import { db } from '@/lib/firebase'
+import { profileFirestore } from '@/lib/firestore-profiler'
+import { encodeGeohash as generateGeohash } from '@/lib/geohash'
 import type { RegisteredCamera, UserProfile } from '@/types/camera'
 import type { Location, IncidentFormData, FootageRequest } from '@/types'
 
@@ -24,9 +21,10 @@ import type { Location, IncidentFormData, FootageRequest } from '@/types'
 // ==========================================
 
 export const getUserProfile = async (uid: string): Promise<UserProfile | null> => {
+  const firestoreOps = profileFirestore('getUserProfile')
   try {
     const userRef = doc(db, 'users', uid)
-    const userSnap = await getDoc(userRef)
+    const userSnap = await firestoreOps.getDoc(userRef)
     
     if (userSnap.exists()) {
       return userSnap.data() as UserProfile
@@ -39,9 +37,10 @@ export const getUserProfile = async (uid: string): Promise<UserProfile | null> =
 }
 
 export const updateUserProfile = async (uid: string, data: Partial<UserProfile>): Promise<void> => {
+  const firestoreOps = profileFirestore('updateUserProfile')
   try {
     const userRef = doc(db, 'users', uid)
-    await updateDoc(userRef, {
+    await firestoreOps.updateDoc(userRef, {
       ...data,
       lastActiveAt: serverTimestamp()
     })
@@ -57,6 +56,7 @@ export const updateUserProfile = async (uid: string, data: Partial<UserProfile>)
 // ==========================================
 
 export const saveCamera = async (camera: RegisteredCamera): Promise<string> => {
+  const firestoreOps = profileFirestore('saveCamera')
   try {
     // Convert location to GeoPoint for Firestore
     const cameraData = {
@@ -90,12 +90,13 @@ export const saveCamera = async (camera: RegisteredCamera): Promise<string> => {
     }
 
     const cameraRef = doc(db, 'cameras', camera.id)
-    await setDoc(cameraRef, cameraData)
+    await firestoreOps.setDoc(cameraRef, cameraData)
+    invalidateUserCamerasCache(camera.userId)
     
     // Add to verification queue for admin efficiency
     if (camera.verification?.status === 'pending') {
       try {
-        await addDoc(collection(db, 'verification_queue'), {
+        await firestoreOps.addDoc(collection(db, 'verification_queue'), {
           cameraId: camera.id,
           userId: camera.userId,
           status: 'pending',
@@ -110,7 +111,7 @@ export const saveCamera = async (camera: RegisteredCamera): Promise<string> => {
     }
 
     // Update user stats
-    await updateUserStats(camera.userId, { camerasRegistered: 1 })
+    await updateUserStats(camera.userId, { camerasRegistered: 1 }, 'saveCamera')
     
     // Update trust score after camera submission
     try {
@@ -129,7 +130,42 @@ export const saveCamera = async (camera: RegisteredCamera): Promise<string> => {
   }
 }
 
-export const getUserCameras = async (userId: string): Promise<RegisteredCamera[]> => {
+// Short-lived per-user camera cache. getUserCameras is hit repeatedly by
+// dashboards, getRequestsForCameraOwner and fuzzy location regeneration.
+const USER_CAMERAS_CACHE_TTL_MS = 60 * 1000
+const USER_CAMERAS_CACHE_MAX_ENTRIES = 20
+const userCamerasCache = new Map<string, { cameras: RegisteredCamera[]; fetchedAt: number }>()
+
+export const invalidateUserCamerasCache = (userId?: string): void => {
+  if (userId) {
+    userCamerasCache.delete(userId)
+  } else {
+    userCamerasCache.clear()
+  }
+}
+
+// Drop any cached camera list containing this camera (updates only know the camera ID)
+const invalidateCachedCamera = (cameraId: string): void => {
+  userCamerasCache.forEach((entry, userId) => {
+    if (entry.cameras.some(camera => camera.id === cameraId)) {
+      userCamerasCache.delete(userId)
+    }
+  })
+}
+
+export const getUserCameras = async (
+  userId: string,
+  options: { fresh?: boolean; flow?: string } = {}
+): Promise<RegisteredCamera[]> => {
+  const firestoreOps = profileFirestore('getUserCameras', options.flow)
+  const cached = userCamerasCache.get(userId)
+  if (!options.fresh && cached && Date.now() - cached.fetchedAt < USER_CAMERAS_CACHE_TTL_MS) {
+    // Re-insert to keep the map ordered by most recent use
+    userCamerasCache.delete(userId)
+    userCamerasCache.set(userId, cached)
+    return cached.cameras
+  }
+
   try {
     const camerasRef = collection(db, 'cameras')
     // Use existing index: status, userId, createdAt
@@ -140,7 +176,7 @@ export const getUserCameras = async (userId: string): Promise<RegisteredCamera[]
       orderBy('createdAt', 'desc')
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     const cameras: RegisteredCamera[] = []
 
     querySnapshot.forEach((doc) => {
@@ -177,6 +213,13 @@ export const getUserCameras = async (userId: string): Promise<RegisteredCamera[]
       } as RegisteredCamera)
     })
 
+    userCamerasCache.set(userId, { cameras, fetchedAt: Date.now() })
+    if (userCamerasCache.size > USER_CAMERAS_CACHE_MAX_ENTRIES) {
+      // Evict the least recently used entry
+      const oldestUserId = userCamerasCache.keys().next().value
+      if (oldestUserId !== undefined) userCamerasCache.delete(oldestUserId)
+    }
+
     return cameras
   } catch (error) {
     console.error('❌ Error fetching user cameras:', error)
@@ -185,6 +228,7 @@ export const getUserCameras = async (userId: string): Promise<RegisteredCamera[]
 }
 
 export const getNearbyCameras = async (location: Location, radiusKm: number = 1): Promise<RegisteredCamera[]> => {
+  const firestoreOps = profileFirestore('getNearbyCameras')
   try {
     // For now, get all active cameras and filter by distance
     // TODO: Implement proper geospatial queries with geohash
@@ -195,7 +239,7 @@ export const getNearbyCameras = async (location: Location, radiusKm: number = 1)
       where('privacySettings.shareWithCommunity', '==', true)
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     const cameras: RegisteredCamera[] = []
 
     querySnapshot.forEach((doc) => {
@@ -231,6 +275,7 @@ export const getNearbyCameras = async (location: Location, radiusKm: number = 1)
 }
 
 export const updateCamera = async (cameraId: string, updates: Partial<RegisteredCamera>): Promise<void> => {
+  const firestoreOps = profileFirestore('updateCamera')
   try {
     const cameraRef = doc(db, 'cameras', cameraId)
     const updateData: any = {
@@ -248,7 +293,8 @@ export const updateCamera = async (cameraId: string, updates: Partial<Registered
       updateData.displayLocationGeohash = generateGeohash(updates.displayLocation.lat, updates.displayLocation.lng)
     }
 
-    await updateDoc(cameraRef, updateData)
+    await firestoreOps.updateDoc(cameraRef, updateData)
+    invalidateCachedCamera(cameraId)
     console.log('✅ Camera updated successfully:', cameraId)
   } catch (error) {
     console.error('❌ Error updating camera:', error)
@@ -257,17 +303,19 @@ export const updateCamera = async (cameraId: string, updates: Partial<Registered
 }
 
 export const deleteCamera = async (cameraId: string, userId: string): Promise<void> => {
+  const firestoreOps = profileFirestore('deleteCamera')
   try {
     const cameraRef = doc(db, 'cameras', cameraId)
     
     // Soft delete by updating status
-    await updateDoc(cameraRef, {
+    await firestoreOps.updateDoc(cameraRef, {
       status: 'deleted',
       lastUpdated: serverTimestamp()
     })
+    invalidateUserCamerasCache(userId)
 
     // Update user stats
-    await updateUserStats(userId, { camerasRegistered: -1 })
+    await updateUserStats(userId, { camerasRegistered: -1 }, 'deleteCamera')
 
     console.log('✅ Camera deleted successfully:', cameraId)
   } catch (error) {
@@ -285,6 +333,7 @@ export const deleteCamera = async (cameraId: string, userId: string): Promise<vo
  * This fixes the predictable pattern issue by recalculating displayLocation
  */
 export const regenerateCameraFuzzyLocations = async (userId: string): Promise<void> => {
+  const firestoreOps = profileFirestore('regenerateCameraFuzzyLocations')
   try {
     console.log('🔄 Regenerating fuzzy locations with new cryptographic randomization...')
     
@@ -292,7 +341,7 @@ export const regenerateCameraFuzzyLocations = async (userId: string): Promise<vo
     const { fuzzyLocation } = await import('./camera-utils')
     
     // Get all user cameras
-    const userCameras = await getUserCameras(userId)
+    const userCameras = await getUserCameras(userId, { flow: 'regenerateCameraFuzzyLocations' })
     
     if (userCameras.length === 0) {
       console.log('ℹ️ No cameras found for user')
@@ -304,7 +353,7 @@ export const regenerateCameraFuzzyLocations = async (userId: string): Promise<vo
       const newDisplayLocation = fuzzyLocation(camera.location, 25)
       
       const cameraRef = doc(db, 'cameras', camera.id)
-      await updateDoc(cameraRef, {
+      await firestoreOps.updateDoc(cameraRef, {
         displayLocation: new GeoPoint(newDisplayLocation.lat, newDisplayLocation.lng),
         displayLocationGeohash: generateGeohash(newDisplayLocation.lat, newDisplayLocation.lng),
         lastUpdated: serverTimestamp(),
@@ -317,6 +366,7 @@ export const regenerateCameraFuzzyLocations = async (userId: string): Promise<vo
     })
     
     await Promise.all(updatePromises)
+    invalidateUserCamerasCache(userId)
     
     console.log(`🔐 Successfully regenerated fuzzy locations for ${userCameras.length} cameras with cryptographic randomization`)
   } catch (error) {
@@ -330,6 +380,7 @@ export const regenerateCameraFuzzyLocations = async (userId: string): Promise<vo
  * WARNING: This is a heavy operation that should be run carefully
  */
 export const regenerateAllCameraFuzzyLocations = async (): Promise<void> => {
+  const firestoreOps = profileFirestore('regenerateAllCameraFuzzyLocations')
   try {
     console.log('🔄 ADMIN: Regenerating fuzzy locations for ALL cameras...')
     
@@ -341,7 +392,7 @@ export const regenerateAllCameraFuzzyLocations = async (): Promise<void> => {
       where('status', 'in', ['active', 'inactive', 'maintenance'])
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     let updatedCount = 0
     
     // Process in batches to avoid overwhelming Firestore
@@ -364,7 +415,7 @@ export const regenerateAllCameraFuzzyLocations = async (): Promise<void> => {
         const newDisplayLocation = fuzzyLocation(originalLocation, 25)
         
         const cameraRef = doc(db, 'cameras', id)
-        await updateDoc(cameraRef, {
+        await firestoreOps.updateDoc(cameraRef, {
           displayLocation: new GeoPoint(newDisplayLocation.lat, newDisplayLocation.lng),
           displayLocationGeohash: generateGeohash(newDisplayLocation.lat, newDisplayLocation.lng),
           lastUpdated: serverTimestamp(),
@@ -384,6 +435,7 @@ export const regenerateAllCameraFuzzyLocations = async (): Promise<void> => {
       }
     }
     
+    invalidateUserCamerasCache()
     console.log(`🔐 ADMIN: Successfully regenerated fuzzy locations for ${updatedCount} cameras`)
   } catch (error) {
     console.error('❌ Error regenerating all fuzzy locations:', error)
@@ -401,6 +453,7 @@ export const submitIncidentReport = async (
   location: Location,
   incidentData: IncidentFormData
 ): Promise<string> => {
+  const firestoreOps = profileFirestore('submitIncidentReport')
   try {
     const requestData = {
       requesterId: userId,
@@ -427,10 +480,10 @@ export const submitIncidentReport = async (
     }
 
     const requestsRef = collection(db, 'requests')
-    const docRef = await addDoc(requestsRef, requestData)
+    const docRef = await firestoreOps.addDoc(requestsRef, requestData)
 
     // Update user stats
-    await updateUserStats(userId, { requestsMade: 1 })
+    await updateUserStats(userId, { requestsMade: 1 }, 'submitIncidentReport')
 
     // TODO: Trigger Cloud Function to notify nearby camera owners
     console.log('✅ Incident report submitted:', docRef.id)
@@ -442,6 +495,7 @@ export const submitIncidentReport = async (
 }
 
 export const getUserRequests = async (userId: string): Promise<FootageRequest[]> => {
+  const firestoreOps = profileFirestore('getUserRequests')
   try {
     const requestsRef = collection(db, 'requests')
     const q = query(
@@ -451,7 +505,7 @@ export const getUserRequests = async (userId: string): Promise<FootageRequest[]>
       limit(50)
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     const requests: FootageRequest[] = []
 
     querySnapshot.forEach((doc) => {
@@ -483,9 +537,10 @@ export const getUserRequests = async (userId: string): Promise<FootageRequest[]>
 }
 
 export const getRequestsForCameraOwner = async (userId: string): Promise<FootageRequest[]> => {
+  const firestoreOps = profileFirestore('getRequestsForCameraOwner')
   try {
     // Get user's cameras first
-    const userCameras = await getUserCameras(userId)
+    const userCameras = await getUserCameras(userId, { flow: 'getRequestsForCameraOwner' })
     
     if (userCameras.length === 0) {
       return []
@@ -501,7 +556,7 @@ export const getRequestsForCameraOwner = async (userId: string): Promise<Footage
       limit(100)
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     const relevantRequests: FootageRequest[] = []
 
     querySnapshot.forEach((doc) => {
@@ -542,8 +597,31 @@ export const getRequestsForCameraOwner = async (userId: string): Promise<Footage
   }
 }
 
+// Convert a community camera document into a map-ready camera (fuzzy display location)
+export const communityCameraFromDoc = (doc: DocumentSnapshot): RegisteredCamera => {
+  const data = doc.data() || {}
+  const cameraLocation = {
+    lat: data.displayLocation?.latitude || data.location?.latitude,
+    lng: data.displayLocation?.longitude || data.location?.longitude
+  }
+
+  return {
+    ...data,
+    id: doc.id,
+    location: {
+      lat: data.location?.latitude || cameraLocation.lat,
+      lng: data.location?.longitude || cameraLocation.lng
+    },
+    displayLocation: cameraLocation,
+    createdAt: data.createdAt?.toDate() || new Date(),
+    lastUpdated: data.lastUpdated?.toDate() || new Date()
+  } as RegisteredCamera
+}
+
 // GLOBAL CAMERA VISIBILITY - NO DISTANCE LIMITS
+// Map views should use communityCameraStore (camera-store.ts), which loads by viewport
 export const getCommunityCamerasForMap = async (userLocation: Location): Promise<RegisteredCamera[]> => {
+  const firestoreOps = profileFirestore('getCommunityCamerasForMap')
   try {
     console.log('🌍 GLOBAL HEATMAP: Loading all verified cameras worldwide...')
     
@@ -555,28 +633,12 @@ export const getCommunityCamerasForMap = async (userLocation: Location): Promise
       where('verification.status', '==', 'approved') // Only show verified cameras
     )
     
-    const querySnapshot = await getDocs(q)
+    const querySnapshot = await firestoreOps.getDocs(q)
     const cameras: RegisteredCamera[] = []
 
     querySnapshot.forEach((doc) => {
-      const data = doc.data()
-      const cameraLocation = {
-        lat: data.displayLocation?.latitude || data.location?.latitude,
-        lng: data.displayLocation?.longitude || data.location?.longitude
-      }
-      
       // NO DISTANCE FILTERING - Include ALL verified cameras globally
-      cameras.push({
-        ...data,
-        id: doc.id,
-        location: {
-          lat: data.location?.latitude || cameraLocation.lat,
-          lng: data.location?.longitude || cameraLocation.lng
-        },
-        displayLocation: cameraLocation,
-        createdAt: data.createdAt?.toDate() || new Date(),
-        lastUpdated: data.lastUpdated?.toDate() || new Date()
-      } as RegisteredCamera)
+      cameras.push(communityCameraFromDoc(doc))
     })
 
     console.log(`🌍 GLOBAL HEATMAP: Loaded ${cameras.length} verified cameras (visible from anywhere in the world)`)
@@ -593,10 +655,15 @@ export const getCommunityHeatmapCameras = getCommunityCamerasForMap
 // UTILITY FUNCTIONS
 // ==========================================
 
-const updateUserStats = async (userId: string, statUpdates: Partial<UserProfile['stats']>): Promise<void> => {
+const updateUserStats = async (
+  userId: string,
+  statUpdates: Partial<UserProfile['stats']>,
+  flow?: string
+): Promise<void> => {
+  const firestoreOps = profileFirestore('updateUserStats', flow)
   try {
     const userRef = doc(db, 'users', userId)
-    const userSnap = await getDoc(userRef)
+    const userSnap = await firestoreOps.getDoc(userRef)
     
     if (userSnap.exists()) {
       const userData = userSnap.data() as UserProfile
@@ -614,7 +681,7 @@ const updateUserStats = async (userId: string, statUpdates: Partial<UserProfile[
         communityHelpScore: Math.max(0, (currentStats.communityHelpScore || 0) + (statUpdates?.communityHelpScore || 0))
       }
 
-      await updateDoc(userRef, {
+      await firestoreOps.updateDoc(userRef, {
         stats: updatedStats,
         lastActiveAt: serverTimestamp()
       })
@@ -643,46 +710,3 @@ const calculateDistance = (point1: Location, point2: Location): number => {
 const toRad = (degrees: number): number => {
   return degrees * (Math.PI/180)
 }
-
-// Simple geohash generation (basic implementation)
-const generateGeohash = (lat: number, lng: number, precision: number = 8): string => {
-  // This is a simplified geohash - in production, use a proper geohash library
-  const base32 = '0123456789bcdefghjkmnpqrstuvwxyz'
-  let geohash = ''
-  let latRange = [-90, 90]
-  let lngRange = [-180, 180]
-  let isEven = true
-  let bit = 0
-  let ch = 0
-
-  while (geohash.length < precision) {
-    if (isEven) {
-      const mid = (lngRange[0] + lngRange[1]) / 2
-      if (lng >= mid) {
-        ch |= (1 << (4 - bit))
-        lngRange[0] = mid
-      } else {
-        lngRange[1] = mid
-      }
-    } else {
-      const mid = (latRange[0] + latRange[1]) / 2
-      if (lat >= mid) {
-        ch |= (1 << (4 - bit))
-        latRange[0] = mid
-      } else {
-        latRange[1] = mid
-      }
-    }
-
-    isEven = !isEven
-    if (bit < 4) {
-      bit++
-    } else {
-      geohash += base32[ch]
-      bit = 0
-      ch = 0
-    }
-  }
-
-  return geohash
-}
@@ -1,23 +1,22 @@
 import { 
   collection, 
   doc, 
-  setDoc, 
-  getDoc,
-  getDocs,
   query,
   where,
   orderBy,
   limit,
-  updateDoc,
   serverTimestamp,
   Timestamp,
   arrayUnion
 } from 'firebase/firestore'
 import { db } from './firebase'
+import { profileFirestore } from './firestore-profiler'
+import { logger, DEBUG_LOGGING } from './logger'
 import type { FootageRequest, CameraResponse, CreateFootageRequestInput, RequestNotification } from '@/types/requests'
 import type { RegisteredCamera } from '@/types/camera'
 import type { Location } from '@/types'
 import { getDistance } from './camera-utils'
+import type { QueuedEmail } from './email-service'
 
 /**
  * Cancel a footage request
@@ -27,9 +26,10 @@ export async function cancelFootageRequest(
   userId: string,
   reason: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('cancelFootageRequest')
   try {
     const requestRef = doc(db, 'footageRequests', requestId)
-    const requestDoc = await getDoc(requestRef)
+    const requestDoc = await firestoreOps.getDoc(requestRef)
     
     if (!requestDoc.exists()) {
       throw new Error('Request not found')
@@ -43,7 +43,7 @@ export async function cancelFootageRequest(
     }
     
     // Update request status
-    await updateDoc(requestRef, {
+    await firestoreOps.updateDoc(requestRef, {
       status: 'cancelled',
       updatedAt: serverTimestamp(),
       cancelledAt: serverTimestamp(),
@@ -72,13 +72,15 @@ export async function createFootageRequest(
   userEmail: string,
   input: CreateFootageRequestInput
 ): Promise<FootageRequest> {
+  const firestoreOps = profileFirestore('createFootageRequest')
   try {
     console.log('📹 Creating footage request...', input)
     
     // Find BOTH permanent cameras AND temporary markers within the search radius
     const nearbyCameras = await findCamerasWithinRadius(
       input.incidentLocation,
-      input.searchRadius
+      input.searchRadius,
+      'createFootageRequest'
     )
     
     // Find temporary markers that match this incident
@@ -86,7 +88,8 @@ export async function createFootageRequest(
     const matchingMarkers = await TemporaryMarkerService.findMatchingMarkers(
       input.incidentLocation,
       input.searchRadius,
-      new Date(input.incidentDate)
+      new Date(input.incidentDate),
+      'createFootageRequest'
     )
     
     console.log(`🎯 Found ${nearbyCameras.length} permanent cameras + ${matchingMarkers.length} temporary markers within ${input.searchRadius}m radius`)
@@ -136,14 +139,14 @@ export async function createFootageRequest(
     }
     
     // Save to Firestore
-    await setDoc(doc(db, 'footageRequests', requestId), {
+    await firestoreOps.setDoc(doc(db, 'footageRequests', requestId), {
       ...footageRequest,
       createdAt: serverTimestamp(),
       expiresAt: Timestamp.fromDate(expiresAt)
     })
     
     // Create notifications for camera owners AND temporary marker owners
-    await createNotificationsForRequest(footageRequest, nearbyCameras, matchingMarkers)
+    await createNotificationsForRequest(footageRequest, nearbyCameras, matchingMarkers, 'createFootageRequest')
     
     console.log('✅ Footage request created successfully:', requestId)
     return footageRequest
@@ -159,8 +162,10 @@ export async function createFootageRequest(
  */
 async function findCamerasWithinRadius(
   location: Location,
-  radiusInMeters: number
+  radiusInMeters: number,
+  flow?: string
 ): Promise<RegisteredCamera[]> {
+  const firestoreOps = profileFirestore('findCamerasWithinRadius', flow)
   try {
     console.log('🔍 Searching for cameras within radius...', { location, radiusInMeters })
     
@@ -172,7 +177,7 @@ async function findCamerasWithinRadius(
       where('verification.status', '==', 'approved') // ONLY target verified cameras
     )
     
-    const snapshot = await getDocs(camerasQuery)
+    const snapshot = await firestoreOps.getDocs(camerasQuery)
     console.log(`📹 Found ${snapshot.size} total verified cameras`)
     
     const nearbyCameras: RegisteredCamera[] = []
@@ -196,12 +201,15 @@ async function findCamerasWithinRadius(
         lastUpdated: data.lastUpdated?.toDate() || new Date()
       } as RegisteredCamera
       
-      console.log('🎥 Checking camera:', {
-        id: camera.id,
-        name: camera.name,
-        realLocation: camera.location,
-        owner: camera.userId
-      })
+      // Per-camera logging is compiled out of production builds
+      if (DEBUG_LOGGING) {
+        logger.debug('🎥 Checking camera:', {
+          id: camera.id,
+          name: camera.name,
+          realLocation: camera.location,
+          owner: camera.userId
+        })
+      }
       
       // Calculate distance using REAL location (not fuzzy) for accurate targeting
       const distance = getDistance(
@@ -211,14 +219,12 @@ async function findCamerasWithinRadius(
         camera.location.lng     // Use REAL location
       )
       
-      console.log(`📏 Distance to camera ${camera.name}: ${Math.round(distance)}m`)
-      
       // Only include cameras within the EXACT radius (no buffer for targeting)
       if (distance <= radiusInMeters) {
-        console.log(`✅ Camera ${camera.name} is within range (${Math.round(distance)}m <= ${radiusInMeters}m)`)
+        if (DEBUG_LOGGING) logger.debug(`✅ Camera ${camera.name} is within range (${Math.round(distance)}m <= ${radiusInMeters}m)`)
         nearbyCameras.push(camera)
-      } else {
-        console.log(`❌ Camera ${camera.name} is too far (${Math.round(distance)}m > ${radiusInMeters}m)`)
+      } else if (DEBUG_LOGGING) {
+        logger.debug(`❌ Camera ${camera.name} is too far (${Math.round(distance)}m > ${radiusInMeters}m)`)
       }
     })
     
@@ -226,16 +232,18 @@ async function findCamerasWithinRadius(
     
     // Log summary of found cameras
     if (nearbyCameras.length > 0) {
-      console.log('📋 Cameras that will receive this request:')
-      nearbyCameras.forEach((camera, index) => {
-        const distance = Math.round(getDistance(
-          location.lat,
-          location.lng,
-          camera.location.lat,
-          camera.location.lng
-        ))
-        console.log(`   ${index + 1}. ${camera.name} (${distance}m away) - Owner: ${camera.userEmail}`)
-      })
+      if (DEBUG_LOGGING) {
+        logger.debug('📋 Cameras that will receive this request:')
+        nearbyCameras.forEach((camera, index) => {
+          const distance = Math.round(getDistance(
+            location.lat,
+            location.lng,
+            camera.location.lat,
+            camera.location.lng
+          ))
+          logger.debug(`   ${index + 1}. ${camera.name} (${distance}m away) - Owner: ${camera.userEmail}`)
+        })
+      }
     } else {
       console.log('⚠️ No cameras found within search radius. User may need to increase radius.')
     }
@@ -254,10 +262,13 @@ async function findCamerasWithinRadius(
 async function createNotificationsForRequest(
   request: FootageRequest,
   cameras: RegisteredCamera[],
-  temporaryMarkers: any[] = []
+  temporaryMarkers: any[] = [],
+  flow?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('createNotificationsForRequest', flow)
   try {
     const notifications: RequestNotification[] = []
+    const emails: QueuedEmail[] = [] // Queued together once every recipient is known
     
     // Get unique camera owners
     const cameraOwnerIds = Array.from(new Set(cameras.map(c => c.userId)))
@@ -322,70 +333,70 @@ async function createNotificationsForRequest(
       
       // Also send SMS/App notification if preferences are set
       const { NotificationPreferenceService } = await import('./temporary-evidence-service')
-      const prefs = await NotificationPreferenceService.getNotificationPreferences(ownerId)
+      const prefs = await NotificationPreferenceService.getNotificationPreferences(ownerId, flow)
       if (prefs) {
         if (prefs.channels.sms && ownerMarkers[0].marker.ownerPhone) {
           console.log(`📱 Would send SMS to ${ownerMarkers[0].marker.ownerPhone}`)
           // TODO: Integrate real SMS service (Twilio, AWS SNS, etc.)
         }
         if (prefs.channels.email) {
-          // Send email notification
-          try {
-            const { sendFootageMatchEmail } = await import('./email-service')
-            const matchDistance = Math.round(ownerMarkers[0].distance || 0)
-            await sendFootageMatchEmail(
-              ownerMarkers[0].marker.ownerEmail,
-              ownerMarkers[0].marker.ownerName || 'Neighbour',
-              request.incidentType,
-              matchDistance,
-              request.id
-            )
-            console.log(`✅ Email sent to ${ownerMarkers[0].marker.ownerEmail}`)
-          } catch (emailError) {
-            console.error(`❌ Failed to send email:`, emailError)
-          }
+          emails.push({
+            type: 'footage-match',
+            to: ownerMarkers[0].marker.ownerEmail,
+            data: {
+              ownerName: ownerMarkers[0].marker.ownerName || 'Neighbour',
+              incidentType: request.incidentType,
+              matchDistance: Math.round(ownerMarkers[0].distance || 0),
+              requestId: request.id
+            }
+          })
         }
       }
     }
     
-    // Send email notifications to camera owners
-    for (const notification of notifications) {
-      if (notification.type === 'new-request' && notification.email) {
-        try {
-          // Check if user has email notifications enabled
-          const userDoc = await getDoc(doc(db, 'users', notification.userId))
-          const emailEnabled = userDoc.exists() && userDoc.data().emailNotifications !== false
-          
-          if (emailEnabled) {
-            const { sendFootageRequestEmail } = await import('./email-service')
-            const incidentDateStr = request.incidentDate instanceof Date 
-              ? request.incidentDate.toLocaleString()
-              : request.incidentDate.toDate().toLocaleString()
-            
-            // Format location as string
-            const locationStr = typeof request.incidentLocation === 'string' 
-              ? request.incidentLocation
-              : `${request.incidentLocation.lat.toFixed(4)}, ${request.incidentLocation.lng.toFixed(4)}`
-              
-            await sendFootageRequestEmail(
-              notification.email,
-              userDoc.data().displayName || 'Camera Owner',
-              request.incidentType,
-              locationStr,
-              incidentDateStr,
-              request.id
-            )
-            console.log(`✅ Email sent to camera owner ${notification.email}`)
-          }
-        } catch (emailError) {
-          console.error(`❌ Failed to send email to ${notification.email}:`, emailError)
+    // Email owners who have email notifications enabled
+    const incidentDateTimeStr = request.incidentDate instanceof Date 
+      ? request.incidentDate.toLocaleString()
+      : request.incidentDate.toDate().toLocaleString()
+    
+    // Format location as string
+    const locationStr = typeof request.incidentLocation === 'string' 
+      ? request.incidentLocation
+      : `${request.incidentLocation.lat.toFixed(4)}, ${request.incidentLocation.lng.toFixed(4)}`
+    
+    const emailNotifications = notifications.filter(n => n.type === 'new-request' && n.email)
+    await Promise.all(emailNotifications.map(async (notification) => {
+      try {
+        const userDoc = await firestoreOps.getDoc(doc(db, 'users', notification.userId))
+        if (userDoc.exists() && userDoc.data().emailNotifications !== false) {
+          emails.push({
+            type: 'footage-request',
+            to: notification.email,
+            data: {
+              ownerName: userDoc.data().displayName || 'Camera Owner',
+              incidentType: request.incidentType,
+              incidentLocation: locationStr,
+              requestedTime: incidentDateTimeStr,
+              requestId: request.id
+            }
+          })
         }
+      } catch (error) {
+        console.error(`❌ Failed to check email preferences for ${notification.userId}:`, error)
+      }
+    }))
+    
+    // One fan-out for every recipient; the outbox worker batches delivery
+    if (emails.length > 0) {
+      const { sendEmailBatch } = await import('./email-service')
+      if (await sendEmailBatch(emails, { fanOutRequestId: request.id })) {
+        console.log(`📧 Sent ${emails.length} notification emails`)
       }
     }
     
     // Save notifications to Firestore
     const batch = notifications.map(notif => 
-      setDoc(doc(db, 'notifications', notif.id), {
+      firestoreOps.setDoc(doc(db, 'notifications', notif.id), {
         ...notif,
         createdAt: serverTimestamp()
       })
@@ -403,6 +414,7 @@ async function createNotificationsForRequest(
  * Get footage requests for a camera owner
  */
 export async function getRequestsForOwner(userId: string): Promise<FootageRequest[]> {
+  const firestoreOps = profileFirestore('getRequestsForOwner')
   try {
     // First get all cameras owned by this user
     const camerasQuery = query(
@@ -410,7 +422,7 @@ export async function getRequestsForOwner(userId: string): Promise<FootageReques
       where('userId', '==', userId)
     )
     
-    const camerasSnapshot = await getDocs(camerasQuery)
+    const camerasSnapshot = await firestoreOps.getDocs(camerasQuery)
     const cameraIds = camerasSnapshot.docs.map(doc => doc.id)
     
     if (cameraIds.length === 0) {
@@ -425,7 +437,7 @@ export async function getRequestsForOwner(userId: string): Promise<FootageReques
       limit(50)
     )
     
-    const requestsSnapshot = await getDocs(requestsQuery)
+    const requestsSnapshot = await firestoreOps.getDocs(requestsQuery)
     const requests: FootageRequest[] = []
     
     requestsSnapshot.forEach(doc => {
@@ -447,6 +459,7 @@ export async function getRequestsForOwner(userId: string): Promise<FootageReques
  * Get footage requests made by a user
  */
 export async function getRequestsByUser(userId: string): Promise<FootageRequest[]> {
+  const firestoreOps = profileFirestore('getRequestsByUser')
   try {
     const requestsQuery = query(
       collection(db, 'footageRequests'),
@@ -455,7 +468,7 @@ export async function getRequestsByUser(userId: string): Promise<FootageRequest[
       limit(50)
     )
     
-    const snapshot = await getDocs(requestsQuery)
+    const snapshot = await firestoreOps.getDocs(requestsQuery)
     const requests: FootageRequest[] = []
     
     snapshot.forEach(doc => {
@@ -482,9 +495,10 @@ export async function updateCameraResponse(
   status: 'approved' | 'denied' | 'no-footage',
   reason?: string
 ): Promise<void> {
+  const firestoreOps = profileFirestore('updateCameraResponse')
   try {
     const requestRef = doc(db, 'footageRequests', requestId)
-    const requestDoc = await getDoc(requestRef)
+    const requestDoc = await firestoreOps.getDoc(requestRef)
     
     if (!requestDoc.exists()) {
       throw new Error('Request not found')
@@ -520,7 +534,7 @@ export async function updateCameraResponse(
       : 'pending'
     
     // Update the request
-    await updateDoc(requestRef, {
+    await firestoreOps.updateDoc(requestRef, {
       responses: updatedResponses,
       status: newStatus,
       updatedAt: serverTimestamp(),
@@ -545,8 +559,9 @@ export async function updateCameraResponse(
  * Get a single footage request by ID
  */
 export async function getFootageRequest(requestId: string): Promise<FootageRequest | null> {
+  const firestoreOps = profileFirestore('getFootageRequest')
   try {
-    const requestDoc = await getDoc(doc(db, 'footageRequests', requestId))
+    const requestDoc = await firestoreOps.getDoc(doc(db, 'footageRequests', requestId))
     
     if (!requestDoc.exists()) {
       return null
@@ -570,6 +585,7 @@ export async function getUserNotifications(
   userId: string,
   unreadOnly: boolean = false
 ): Promise<RequestNotification[]> {
+  const firestoreOps = profileFirestore('getUserNotifications')
   try {
     let notificationsQuery = query(
       collection(db, 'notifications'),
@@ -589,7 +605,7 @@ export async function getUserNotifications(
       limit(20)
     )
     
-    const snapshot = await getDocs(notificationsQuery)
+    const snapshot = await firestoreOps.getDocs(notificationsQuery)
     const notifications: RequestNotification[] = []
     
     snapshot.forEach(doc => {
@@ -611,8 +627,9 @@ export async function getUserNotifications(
  * Mark notification as read
  */
 export async function markNotificationRead(notificationId: string): Promise<void> {
+  const firestoreOps = profileFirestore('markNotificationRead')
   try {
-    await updateDoc(doc(db, 'notifications', notificationId), {
+    await firestoreOps.updateDoc(doc(db, 'notifications', notificationId), {
       read: true,
       readAt: serverTimestamp()
     })
@@ -625,6 +642,7 @@ export async function markNotificationRead(notificationId: string): Promise<void
  * Check for expired requests and update their status
  */
 export async function checkExpiredRequests(): Promise<void> {
+  const firestoreOps = profileFirestore('checkExpiredRequests')
   try {
     const now = new Date()
     const expiredQuery = query(
@@ -633,10 +651,10 @@ export async function checkExpiredRequests(): Promise<void> {
       where('expiresAt', '<=', Timestamp.fromDate(now))
     )
     
-    const snapshot = await getDocs(expiredQuery)
+    const snapshot = await firestoreOps.getDocs(expiredQuery)
     
     const updates = snapshot.docs.map(doc => 
-      updateDoc(doc.ref, {
+      firestoreOps.updateDoc(doc.ref, {
         status: 'expired',
         updatedAt: serverTimestamp(),
         statusHistory: arrayUnion({
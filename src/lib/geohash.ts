@@ -0,0 +1,180 @@
+/**
+ * Geohash Utilities
+ * Encoding plus bounding-box covers for prefix range queries in Firestore
+ */
+
+import type { Location } from '@/types'
+
+const BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+export interface GeoBounds {
+  north: number
+  south: number
+  east: number
+  west: number
+}
+
+/**
+ * Encode a coordinate as a geohash string
+ */
+export function encodeGeohash(lat: number, lng: number, precision: number = 8): string {
+  let geohash = ''
+  const latRange = [-90, 90]
+  const lngRange = [-180, 180]
+  let isEven = true
+  let bit = 0
+  let ch = 0
+
+  while (geohash.length < precision) {
+    if (isEven) {
+      const mid = (lngRange[0] + lngRange[1]) / 2
+      if (lng >= mid) {
+        ch |= (1 << (4 - bit))
+        lngRange[0] = mid
+      } else {
+        lngRange[1] = mid
+      }
+    } else {
+      const mid = (latRange[0] + latRange[1]) / 2
+      if (lat >= mid) {
+        ch |= (1 << (4 - bit))
+        latRange[0] = mid
+      } else {
+        latRange[1] = mid
+      }
+    }
+
+    isEven = !isEven
+    if (bit < 4) {
+      bit++
+    } else {
+      geohash += BASE32[ch]
+      bit = 0
+      ch = 0
+    }
+  }
+
+  return geohash
+}
+
+/**
+ * Decode a geohash into the bounding box it covers
+ */
+export function decodeGeohashBounds(geohash: string): GeoBounds {
+  const latRange = [-90, 90]
+  const lngRange = [-180, 180]
+  let isEven = true
+
+  for (const char of geohash) {
+    const value = BASE32.indexOf(char)
+    if (value === -1) {
+      throw new Error(`Invalid geohash character: ${char}`)
+    }
+
+    for (let bit = 4; bit >= 0; bit--) {
+      const bitSet = (value >> bit) & 1
+      const range = isEven ? lngRange : latRange
+      const mid = (range[0] + range[1]) / 2
+      if (bitSet) {
+        range[0] = mid
+      } else {
+        range[1] = mid
+      }
+      isEven = !isEven
+    }
+  }
+
+  return {
+    south: latRange[0],
+    north: latRange[1],
+    west: lngRange[0],
+    east: lngRange[1]
+  }
+}
+
+/**
+ * Width/height in degrees of a single geohash cell at the given precision
+ */
+export function geohashCellSize(precision: number): { latDegrees: number; lngDegrees: number } {
+  const bits = precision * 5
+  const lngBits = Math.ceil(bits / 2)
+  const latBits = Math.floor(bits / 2)
+  return {
+    latDegrees: 180 / Math.pow(2, latBits),
+    lngDegrees: 360 / Math.pow(2, lngBits)
+  }
+}
+
+/**
+ * List the geohash cells at a precision that together cover a bounding box
+ */
+export function geohashesForBounds(bounds: GeoBounds, precision: number): string[] {
+  const { latDegrees, lngDegrees } = geohashCellSize(precision)
+  const south = Math.max(-90, bounds.south)
+  const north = Math.min(90, bounds.north)
+  const west = Math.max(-180, bounds.west)
+  const east = Math.min(180, bounds.east)
+
+  const cells = new Set<string>()
+  // Step by half a cell so we never skip a cell on floating point edges
+  for (let lat = south; lat <= north + latDegrees / 2; lat += latDegrees / 2) {
+    for (let lng = west; lng <= east + lngDegrees / 2; lng += lngDegrees / 2) {
+      cells.add(encodeGeohash(Math.min(lat, north), Math.min(lng, east), precision))
+    }
+  }
+
+  return Array.from(cells)
+}
+
+/**
+ * Pick the finest geohash precision whose cover of the bounds stays within maxCells
+ */
+export function precisionForBounds(
+  bounds: GeoBounds,
+  maxCells: number,
+  minPrecision: number = 2,
+  maxPrecision: number = 7
+): number {
+  for (let precision = maxPrecision; precision > minPrecision; precision--) {
+    const { latDegrees, lngDegrees } = geohashCellSize(precision)
+    // Fewest cells any alignment could need; skips listing covers that are far too big
+    const minRows = Math.max(1, Math.ceil((bounds.north - bounds.south) / latDegrees))
+    const minCols = Math.max(1, Math.ceil((bounds.east - bounds.west) / lngDegrees))
+    if (minRows * minCols > maxCells) continue
+
+    // The real cover depends on where the bounds fall on the grid
+    if (geohashesForBounds(bounds, precision).length <= maxCells) {
+      return precision
+    }
+  }
+  return minPrecision
+}
+
+/**
+ * Cells covering a circle - used for radius searches against geohash prefixes
+ */
+export function geohashesForRadius(center: Location, radiusKm: number, maxCells: number = 9): string[] {
+  const latDelta = radiusKm / 111
+  const lngDelta = radiusKm / (111 * Math.max(0.01, Math.cos(center.lat * Math.PI / 180)))
+  const bounds: GeoBounds = {
+    north: center.lat + latDelta,
+    south: center.lat - latDelta,
+    east: center.lng + lngDelta,
+    west: center.lng - lngDelta
+  }
+  return geohashesForBounds(bounds, precisionForBounds(bounds, maxCells))
+}
+
+/**
+ * The 32 cells one precision finer than a geohash prefix
+ */
+export function geohashChildren(prefix: string): string[] {
+  return BASE32.split('').map(ch => prefix + ch)
+}
+
+/**
+ * Exclusive upper bound for a Firestore prefix range query on a geohash field
+ */
+export function geohashRangeEnd(prefix: string): string {
+  return prefix + '\uf8ff'
+}
@@ -0,0 +1,38 @@
+/**
+ * Leveled Logger
+ * debug/info output is stripped from production builds.
+ *
+ * Next.js inlines process.env.NODE_ENV at build time, so `if (DEBUG_LOGGING)`
+ * guards are removed entirely by the minifier. Use the guard in hot loops so
+ * log arguments are not even built in production.
+ */
+
+type LogLevel = 'debug' | 'info' | 'warn' | 'error' | 'silent'
+
+const LOG_LEVELS: Record<LogLevel, number> = {
+  debug: 10,
+  info: 20,
+  warn: 30,
+  error: 40,
+  silent: 50
+}
+
+export const DEBUG_LOGGING = process.env.NODE_ENV !== 'production'
+
+const configuredLevel = (process.env.NEXT_PUBLIC_LOG_LEVEL as LogLevel | undefined) ||
+  (DEBUG_LOGGING ? 'debug' : 'warn')
+
+const isEnabled = (level: LogLevel): boolean => {
+  const threshold = LOG_LEVELS[configuredLevel] ?? LOG_LEVELS.debug
+  return LOG_LEVELS[level] >= threshold
+}
+
+const noop = (..._args: unknown[]): void => {}
+
+// Bound console methods keep the caller's file/line in browser devtools
+export const logger = {
+  debug: DEBUG_LOGGING && isEnabled('debug') ? console.log.bind(console) : noop,
+  info: DEBUG_LOGGING && isEnabled('info') ? console.info.bind(console) : noop,
+  warn: isEnabled('warn') ? console.warn.bind(console) : noop,
+  error: isEnabled('error') ? console.error.bind(console) : noop
+}
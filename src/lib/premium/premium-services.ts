@@ -11,11 +11,17 @@ import {
   where, 
   orderBy, 
   limit,
+  startAfter,
+  documentId,
   Timestamp,
   writeBatch,
-  onSnapshot
+  onSnapshot,
+  type QueryConstraint,
+  type QueryDocumentSnapshot
 } from 'firebase/firestore'
 import { db } from '@/lib/firebase'
+import { encodeGeohash, geohashesForRadius } from '@/lib/geohash'
+import { profileFirestore, type ProfiledFirestore } from '@/lib/firestore-profiler'
 import type { 
   UserSubscription, 
   CommunityIncident, 
@@ -26,6 +32,7 @@ import type {
   ChainOfCustody,
   UserRole 
 } from '@/types/premium/subscription'
+import type { Location } from '@/types'
 import type { RegisteredCamera } from '@/types/camera'
 import { EvidenceMatchingEngine, type MatchingCriteria } from './evidence-matching'
 import { ChainOfCustodyManager } from './chain-of-custody'
@@ -158,7 +165,64 @@ export class SubscriptionService {
 // INCIDENT REPORTING SERVICE
 // =============================================================================
 
+// Incidents store the geohash of their display location at every precision
+// geohashesForRadius can pick, so a radius query is an equality match on the
+// covering cells instead of a scan of the latest incidents.
+const INCIDENT_GEOCELL_MIN_PRECISION = 2
+const INCIDENT_GEOCELL_MAX_PRECISION = 7
+const INCIDENT_QUERY_MAX_CELLS = 30 // Split into groups of INCIDENT_CELLS_PER_QUERY by fetchIncidentBatch
+const INCIDENT_CELLS_PER_QUERY = 10 // 'in' values allowed alongside array-contains
+const INCIDENT_PAGE_SIZE = 50
+const INCIDENT_MAX_SCAN_ROUNDS = 4 // Bounds reads when the cell cover overshoots the radius
+const INCIDENT_CACHE_TTL_MS = 30 * 1000
+const INCIDENT_CACHE_MAX_ENTRIES = 30
+
+export interface IncidentQueryOptions {
+  pageSize?: number
+  cursor?: string | null // From a previous IncidentPage
+  fresh?: boolean // Skip the result cache
+}
+
+export interface IncidentPage {
+  incidents: CommunityIncident[]
+  cursor: string | null // Pass back for the next page; null when there are no more
+}
+
+type IncidentCursor = [Timestamp, string] // reportedAt, document id
+
+/**
+ * Geohash prefixes of a location keyed by precision (g2..g7)
+ */
+export function incidentGeocells(location: Location): Record<string, string> {
+  const geohash = encodeGeohash(location.lat, location.lng, INCIDENT_GEOCELL_MAX_PRECISION)
+  const geocells: Record<string, string> = {}
+  for (let precision = INCIDENT_GEOCELL_MIN_PRECISION; precision <= INCIDENT_GEOCELL_MAX_PRECISION; precision++) {
+    geocells[`g${precision}`] = geohash.slice(0, precision)
+  }
+  return geocells
+}
+
+const encodeIncidentCursor = ([reportedAt, id]: IncidentCursor): string =>
+  `${reportedAt.seconds}:${reportedAt.nanoseconds}:${id}`
+
+const decodeIncidentCursor = (cursor?: string | null): IncidentCursor | null => {
+  if (!cursor) return null
+  const [seconds, nanoseconds, ...id] = cursor.split(':')
+  return [new Timestamp(Number(seconds), Number(nanoseconds)), id.join(':')]
+}
+
+// Newest first, document id breaking ties (matches the query ordering)
+const compareIncidentDocs = (a: QueryDocumentSnapshot, b: QueryDocumentSnapshot): number => {
+  const aReportedAt = a.data().reportedAt as Timestamp
+  const bReportedAt = b.data().reportedAt as Timestamp
+  if (aReportedAt.seconds !== bReportedAt.seconds) return bReportedAt.seconds - aReportedAt.seconds
+  if (aReportedAt.nanoseconds !== bReportedAt.nanoseconds) return bReportedAt.nanoseconds - aReportedAt.nanoseconds
+  return b.id < a.id ? -1 : b.id > a.id ? 1 : 0
+}
+
 export class IncidentReportingService {
+  private static pageCache = new Map<string, { page: IncidentPage; fetchedAt: number }>()
+
   /**
    * Create community incident with privacy protection
    */
@@ -177,11 +241,13 @@ export class IncidentReportingService {
     const incidentData = {
       ...incident,
       displayLocation,
+      geocells: incidentGeocells(displayLocation),
       reportedAt: Timestamp.now(),
       updatedAt: Timestamp.now()
     }
     
     const docRef = await addDoc(collection(db, PREMIUM_COLLECTIONS.communityIncidents), incidentData)
+    this.clearIncidentCache()
     
     // Log the incident creation
     await this.logAuditEvent('incident_created', {
@@ -195,37 +261,154 @@ export class IncidentReportingService {
   }
 
   /**
-   * Get incidents visible to user role
+   * Get incidents visible to user role, newest first, one page at a time
+   *
+   * With a location, only the geohash cells covering the radius are queried,
+   * so busy areas elsewhere can't crowd out local incidents. Needs composite
+   * indexes on privacy.visibleTo + geocells.gN + reportedAt desc.
    */
   static async getIncidentsForRole(
     userRole: UserRole,
-    location?: { lat: number; lng: number; radius: number }
-  ): Promise<CommunityIncident[]> {
-    let q = query(
-      collection(db, PREMIUM_COLLECTIONS.communityIncidents),
-      where('privacy.visibleTo', 'array-contains', userRole),
-      orderBy('reportedAt', 'desc'),
-      limit(50)
-    )
-    
-    const snapshot = await getDocs(q)
-    const incidents = snapshot.docs.map(d => ({
-      id: d.id,
-      ...d.data()
-    })) as unknown as CommunityIncident[]
-    
-    // Filter by location if specified
-    if (location) {
-      return incidents.filter(incident => {
-        const distance = this.calculateDistance(
+    location?: { lat: number; lng: number; radius: number },
+    options: IncidentQueryOptions = {}
+  ): Promise<IncidentPage> {
+    const pageSize = options.pageSize ?? INCIDENT_PAGE_SIZE
+    const cacheKey = [
+      userRole,
+      location ? `${location.lat.toFixed(5)},${location.lng.toFixed(5)},${Math.round(location.radius)}` : 'all',
+      pageSize,
+      options.cursor || ''
+    ].join('|')
+
+    const cached = this.pageCache.get(cacheKey)
+    if (!options.fresh && cached && Date.now() - cached.fetchedAt < INCIDENT_CACHE_TTL_MS) {
+      // Re-insert to keep the map ordered by most recent use
+      this.pageCache.delete(cacheKey)
+      this.pageCache.set(cacheKey, cached)
+      return cached.page
+    }
+
+    const firestoreOps = profileFirestore('getIncidentsForRole')
+    const cells = location
+      ? geohashesForRadius({ lat: location.lat, lng: location.lng }, location.radius / 1000, INCIDENT_QUERY_MAX_CELLS)
+      : null
+
+    const incidents: CommunityIncident[] = []
+    let after = decodeIncidentCursor(options.cursor)
+    let exhausted = false
+
+    // The cell cover is a box around the radius, so some scanned incidents
+    // are filtered out below; keep scanning (within limits) to fill the page
+    for (let round = 0; round < INCIDENT_MAX_SCAN_ROUNDS && incidents.length < pageSize && !exhausted; round++) {
+      const batch = await this.fetchIncidentBatch(firestoreOps, userRole, cells, after, pageSize)
+      exhausted = batch.exhausted
+
+      for (let i = 0; i < batch.docs.length; i++) {
+        const snapshot = batch.docs[i]
+        const incident = { id: snapshot.id, ...snapshot.data() } as unknown as CommunityIncident
+        after = [incident.reportedAt, snapshot.id]
+
+        const inRadius = !location || this.calculateDistance(
           incident.displayLocation,
           { lat: location.lat, lng: location.lng }
-        )
-        return distance <= location.radius
-      })
+        ) <= location.radius
+        if (inRadius) incidents.push(incident)
+
+        if (incidents.length === pageSize) {
+          if (i < batch.docs.length - 1) exhausted = false
+          break
+        }
+      }
     }
-    
-    return incidents
+
+    const page: IncidentPage = {
+      incidents,
+      cursor: exhausted || !after ? null : encodeIncidentCursor(after)
+    }
+
+    this.pageCache.set(cacheKey, { page, fetchedAt: Date.now() })
+    if (this.pageCache.size > INCIDENT_CACHE_MAX_ENTRIES) {
+      // Evict the least recently used entry
+      const oldestKey = this.pageCache.keys().next().value
+      if (oldestKey !== undefined) this.pageCache.delete(oldestKey)
+    }
+
+    return page
+  }
+
+  /**
+   * Drop cached incident pages (e.g. after reporting a new incident)
+   */
+  static clearIncidentCache(): void {
+    this.pageCache.clear()
+  }
+
+  /**
+   * One round of the scan: up to `batchSize` incidents after the cursor,
+   * merged newest-first across the cell queries
+   */
+  private static async fetchIncidentBatch(
+    firestoreOps: ProfiledFirestore,
+    userRole: UserRole,
+    cells: string[] | null,
+    after: IncidentCursor | null,
+    batchSize: number
+  ): Promise<{ docs: QueryDocumentSnapshot[]; exhausted: boolean }> {
+    const cellGroups: Array<string[] | null> = []
+    if (cells) {
+      for (let i = 0; i < cells.length; i += INCIDENT_CELLS_PER_QUERY) {
+        cellGroups.push(cells.slice(i, i + INCIDENT_CELLS_PER_QUERY))
+      }
+    } else {
+      cellGroups.push(null)
+    }
+
+    const snapshots = await Promise.all(cellGroups.map(group => {
+      const constraints: QueryConstraint[] = [where('privacy.visibleTo', 'array-contains', userRole)]
+      if (group) {
+        // Every cell in a cover shares one precision
+        constraints.push(where(`geocells.g${group[0].length}`, 'in', group))
+      }
+      constraints.push(orderBy('reportedAt', 'desc'), orderBy(documentId(), 'desc'))
+      if (after) constraints.push(startAfter(...after))
+      constraints.push(limit(batchSize))
+
+      return firestoreOps.getDocs(query(collection(db, PREMIUM_COLLECTIONS.communityIncidents), ...constraints))
+    }))
+
+    // Each query is already sorted, and none can hide an incident newer than
+    // its last result, so the first batchSize of the merge is exact
+    const merged = snapshots
+      .reduce<QueryDocumentSnapshot[]>((docs, snapshot) => docs.concat(snapshot.docs), [])
+      .sort(compareIncidentDocs)
+
+    return {
+      docs: merged.slice(0, batchSize),
+      exhausted: merged.length <= batchSize && snapshots.every(snapshot => snapshot.size < batchSize)
+    }
+  }
+
+  /**
+   * Add geocells to incidents reported before they were indexed by location
+   */
+  static async backfillIncidentGeocells(): Promise<number> {
+    const firestoreOps = profileFirestore('backfillIncidentGeocells')
+    const snapshot = await firestoreOps.getDocs(collection(db, PREMIUM_COLLECTIONS.communityIncidents))
+    const missing = snapshot.docs.filter(d => !d.data().geocells && d.data().displayLocation)
+
+    // Firestore caps a batch at 500 writes
+    for (let i = 0; i < missing.length; i += 450) {
+      const batch = writeBatch(db)
+      const chunk = missing.slice(i, i + 450)
+      for (const incidentDoc of chunk) {
+        batch.update(incidentDoc.ref, { geocells: incidentGeocells(incidentDoc.data().displayLocation) })
+      }
+      await firestoreOps.commitBatch(batch, chunk.length)
+    }
+
+    if (missing.length > 0) this.clearIncidentCache()
+    console.log(`🗺️ Backfilled geocells on ${missing.length} incidents`)
+    return missing.length
   }
 
   private static calculateDistance(point1: { lat: number; lng: number }, point2: { lat: number; lng: number }): number {
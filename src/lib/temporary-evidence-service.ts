@@ -1,19 +1,15 @@
 import { 
   collection, 
   doc, 
-  addDoc, 
-  updateDoc, 
-  getDocs, 
-  getDoc,
   query, 
   where, 
   orderBy, 
   limit,
-  Timestamp,
-  deleteDoc
+  Timestamp
 } from 'firebase/firestore'
 import { ref, uploadBytes, getDownloadURL } from 'firebase/storage'
 import { db, storage } from '@/lib/firebase'
+import { profileFirestore } from '@/lib/firestore-profiler'
 import type { 
   TemporaryEvidenceMarker,
   TemporaryMarkerFormData,
@@ -46,6 +42,7 @@ export class TemporaryMarkerService {
     userEmail: string,
     formData: TemporaryMarkerFormData
   ): Promise<string> {
+    const firestoreOps = profileFirestore('createTemporaryMarker')
     let previewImageUrl: string | undefined
     let previewImageMetadata: any | undefined
 
@@ -94,7 +91,7 @@ export class TemporaryMarkerService {
       trustScore: previewImageUrl ? 80 : 60 // Higher score if preview provided
     }
 
-    const docRef = await addDoc(
+    const docRef = await firestoreOps.addDoc(
       collection(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers),
       markerData
     )
@@ -107,6 +104,7 @@ export class TemporaryMarkerService {
    * Get active temporary markers for a user
    */
   static async getUserTemporaryMarkers(userId: string): Promise<TemporaryEvidenceMarker[]> {
+    const firestoreOps = profileFirestore('getUserTemporaryMarkers')
     const q = query(
       collection(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers),
       where('ownerId', '==', userId),
@@ -114,7 +112,7 @@ export class TemporaryMarkerService {
       orderBy('createdAt', 'desc')
     )
 
-    const snapshot = await getDocs(q)
+    const snapshot = await firestoreOps.getDocs(q)
     return snapshot.docs.map(doc => ({
       id: doc.id,
       ...doc.data()
@@ -127,8 +125,10 @@ export class TemporaryMarkerService {
   static async findMatchingMarkers(
     location: Location,
     radius: number,
-    incidentDate: Date
+    incidentDate: Date,
+    flow?: string
   ): Promise<TemporaryMarkerMatch[]> {
+    const firestoreOps = profileFirestore('findMatchingMarkers', flow)
     // Get all active markers
     const q = query(
       collection(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers),
@@ -136,7 +136,7 @@ export class TemporaryMarkerService {
       where('expiresAt', '>', Timestamp.now())
     )
 
-    const snapshot = await getDocs(q)
+    const snapshot = await firestoreOps.getDocs(q)
     const markers = snapshot.docs.map(doc => ({
       id: doc.id,
       ...doc.data()
@@ -234,8 +234,9 @@ export class TemporaryMarkerService {
    * Update marker when matched with a request
    */
   static async markAsMatched(markerId: string, requestId: string): Promise<void> {
+    const firestoreOps = profileFirestore('markAsMatched')
     const markerRef = doc(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers, markerId)
-    const markerDoc = await getDoc(markerRef)
+    const markerDoc = await firestoreOps.getDoc(markerRef)
     
     if (!markerDoc.exists()) {
       throw new Error('Marker not found')
@@ -244,7 +245,7 @@ export class TemporaryMarkerService {
     const marker = markerDoc.data() as TemporaryEvidenceMarker
     const matchedRequests = marker.matchedRequests || []
 
-    await updateDoc(markerRef, {
+    await firestoreOps.updateDoc(markerRef, {
       matchedRequests: [...matchedRequests, requestId],
       updatedAt: Timestamp.now()
     })
@@ -254,17 +255,18 @@ export class TemporaryMarkerService {
    * Clean up expired markers (run periodically)
    */
   static async cleanupExpiredMarkers(): Promise<number> {
+    const firestoreOps = profileFirestore('cleanupExpiredMarkers')
     const q = query(
       collection(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers),
       where('status', '==', 'active'),
       where('expiresAt', '<', Timestamp.now())
     )
 
-    const snapshot = await getDocs(q)
+    const snapshot = await firestoreOps.getDocs(q)
     let count = 0
 
     for (const docSnap of snapshot.docs) {
-      await updateDoc(docSnap.ref, {
+      await firestoreOps.updateDoc(docSnap.ref, {
         status: 'expired',
         updatedAt: Timestamp.now()
       })
@@ -279,8 +281,9 @@ export class TemporaryMarkerService {
    * Withdraw a temporary marker
    */
   static async withdrawMarker(markerId: string, userId: string): Promise<void> {
+    const firestoreOps = profileFirestore('withdrawMarker')
     const markerRef = doc(db, TEMPORARY_EVIDENCE_COLLECTIONS.temporaryMarkers, markerId)
-    const markerDoc = await getDoc(markerRef)
+    const markerDoc = await firestoreOps.getDoc(markerRef)
     
     if (!markerDoc.exists()) {
       throw new Error('Marker not found')
@@ -293,7 +296,7 @@ export class TemporaryMarkerService {
       throw new Error('Unauthorized')
     }
 
-    await updateDoc(markerRef, {
+    await firestoreOps.updateDoc(markerRef, {
       status: 'withdrawn',
       updatedAt: Timestamp.now()
     })
@@ -308,8 +311,9 @@ export class NotificationPreferenceService {
   /**
    * Get or create notification preferences
    */
-  static async getNotificationPreferences(userId: string): Promise<NotificationPreferences> {
-    const prefDoc = await getDoc(
+  static async getNotificationPreferences(userId: string, flow?: string): Promise<NotificationPreferences> {
+    const firestoreOps = profileFirestore('getNotificationPreferences', flow)
+    const prefDoc = await firestoreOps.getDoc(
       doc(db, TEMPORARY_EVIDENCE_COLLECTIONS.notificationPreferences, userId)
     )
 
@@ -333,7 +337,7 @@ export class NotificationPreferenceService {
       updatedAt: Timestamp.now()
     }
 
-    await updateDoc(
+    await firestoreOps.updateDoc(
       doc(db, TEMPORARY_EVIDENCE_COLLECTIONS.notificationPreferences, userId),
       defaultPrefs as any
     )
@@ -348,7 +352,8 @@ export class NotificationPreferenceService {
     userId: string,
     preferences: Partial<NotificationPreferences>
   ): Promise<void> {
-    await updateDoc(
+    const firestoreOps = profileFirestore('updatePreferences')
+    await firestoreOps.updateDoc(
       doc(db, TEMPORARY_EVIDENCE_COLLECTIONS.notificationPreferences, userId),
       {
         ...preferences,
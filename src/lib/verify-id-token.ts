@@ -0,0 +1,55 @@
+/**
+ * Firebase ID Token Verification (Server-Side)
+ * Resolves the signed-in user behind an API request's
+ * `Authorization: Bearer <Firebase ID token>` header.
+ *
+ * Uses the Identity Toolkit accounts:lookup endpoint, which only answers for
+ * valid, unexpired tokens issued for this project's API key, so no service
+ * account is needed. Set FIREBASE_AUTH_EMULATOR_HOST (e.g. 127.0.0.1:9099)
+ * to verify emulator tokens instead.
+ */
+
+export interface VerifiedUser {
+  uid: string
+  email?: string
+  emailVerified: boolean
+  idToken: string // For reads made on the user's behalf (see firestore-rest.ts)
+}
+
+const IDENTITY_TOOLKIT_URL = 'https://identitytoolkit.googleapis.com'
+
+/**
+ * The verified caller of a request, or null when the token is missing or invalid
+ */
+export async function verifyRequestUser(request: Request): Promise<VerifiedUser | null> {
+  const match = /^Bearer (.+)$/.exec(request.headers.get('authorization') || '')
+  if (!match) return null
+
+  const apiKey = process.env.NEXT_PUBLIC_FIREBASE_API_KEY
+  if (!apiKey) {
+    console.error('❌ NEXT_PUBLIC_FIREBASE_API_KEY not set - cannot verify ID tokens')
+    return null
+  }
+
+  const emulatorHost = process.env.FIREBASE_AUTH_EMULATOR_HOST
+  const baseUrl = emulatorHost ? `http://${emulatorHost}/identitytoolkit.googleapis.com` : IDENTITY_TOOLKIT_URL
+
+  try {
+    const response = await fetch(`${baseUrl}/v1/accounts:lookup?key=${encodeURIComponent(apiKey)}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ idToken: match[1] }),
+      cache: 'no-store'
+    })
+    if (!response.ok) return null
+
+    const result = await response.json()
+    const user = result.users?.[0]
+    if (!user?.localId || user.disabled) return null
+
+    return { uid: user.localId, email: user.email, emailVerified: !!user.emailVerified, idToken: match[1] }
+  } catch (error) {
+    console.error('❌ Failed to verify ID token:', error)
+    return null
+  }
+}
@@ -79,6 +79,7 @@ export interface CommunityIncident {
   // Location and timing
   location: Location // Exact location (hidden from community view)
   displayLocation: Location // Fuzzy location for community display
+  geocells?: Record<string, string> // Geohash prefixes of displayLocation keyed by precision (g2..g7)
   incidentDateTime: Timestamp
   reportedAt: Timestamp
   